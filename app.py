@@ -1,19 +1,190 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_app_context, has_request_context, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event as sa_event, inspect as sa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from flask_cors import CORS
 from flask_socketio import SocketIO
+import bisect
+import functools
+import gzip
 import hashlib
+import os
+from collections import OrderedDict, deque
 import csv
-from io import StringIO
+import io
 import json
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import zlib
+from types import SimpleNamespace
+import click
 from flask_socketio import SocketIO, join_room, leave_room, emit
 import time  # <-- ADD
+from socketio import KafkaManager, KombuManager, PubSubManager, RedisManager, ZmqManager
+
+try:
+    import numpy as np  # optional: vectorized batch scoring
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import fcntl  # snapshot publisher election
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+try:
+    from eventlet import tpool  # native thread pool for blocking DB work
+    from eventlet.semaphore import Semaphore
+except ImportError:  # pragma: no cover
+    tpool = None
 
 # In-memory match timer state (no DB migration required)
-# Structure: { match_id: {'start_ms': int, 'duration': int, 'running': bool} }
+# Structure: { (event_code, match_id): {'start_ms': int, 'duration': int, 'running': bool} }
 MATCH_TIMERS = {}  # <-- ADD
 
 
+# -----------------------------
+# Cross-process Socket.IO (message queue)
+# -----------------------------
+# With NRL_MESSAGE_QUEUE set, each server process publishes its emits and
+# room joins/leaves on a shared pub/sub channel and delivers what the other
+# processes publish to its own clients, so a broadcast reaches every viewer
+# whichever worker they are connected to. Process-local state (response
+# cache versions, rankings, rules, live snapshots) travels on the same
+# channel as 'app_sync' messages (see publish_app_sync).
+# Backends: redis:// | rediss:// | valkey:// (Redis), kafka://, zmq+tcp://,
+# any other Kombu URL (amqp://, ...), and sqlite:///<path>, a broker-less
+# stand-in for several workers on one host (tests, rehearsals).
+class AppSyncMixin:
+    """Adds app_sync messages and receive-side backpressure to a python-socketio PubSubManager."""
+
+    def publish_app_sync(self, kind: str, payload: dict):
+        self._publish({'method': 'app_sync', 'kind': kind, 'payload': payload, 'host_id': self.host_id})
+
+    def _listen(self):
+        for message in super()._listen():
+            data = message
+            if not isinstance(message, dict):
+                try:
+                    data = self.json.loads(message)
+                except (TypeError, ValueError):
+                    yield message
+                    continue
+            if isinstance(data, dict) and data.get('method') == 'app_sync':
+                if data.get('host_id') != self.host_id:
+                    apply_app_sync(data.get('kind'), data.get('payload') or {})
+                continue
+            yield data
+
+    def _handle_emit(self, message):
+        # Local emits were already filtered by install_backpressure's wrapper
+        if message.get('host_id') != self.host_id:
+            ensure_socket_sweep()
+            if (message.get('event') in COALESCED_EVENTS and not message.get('binary')
+                    and len(message.get('data') or ()) == 1):
+                message['skip_sid'] = congested_skip_sids(message['event'], message['data'][0], message.get('room'),
+                                                          message.get('namespace'), message.get('skip_sid'))
+            else:
+                flush_congested(message.get('room'), message.get('namespace'), message.get('skip_sid'))
+        super()._handle_emit(message)
+
+
+class SqliteBrokerManager(PubSubManager):
+    """
+    Pub/sub over a shared WAL-mode SQLite file: publishers append rows, every
+    listening process polls for rows past the last id it has seen. Rows older
+    than retention_ms are trimmed as new ones arrive. sqlite3 calls run on
+    eventlet's native thread pool so a busy or locked file never stalls the
+    hub; an idle listener backs off from poll_interval to max_poll_interval.
+    """
+    name = 'sqlite'
+    poll_interval = 0.01
+    max_poll_interval = 0.1
+    retention_ms = 60000
+
+    def __init__(self, url='sqlite:///socketio_broker.db', channel='socketio', write_only=False, logger=None,
+                 json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.path = url.split(':///', 1)[1]
+        self._conn = None
+        self._pid = None
+        self._published = 0
+        self._lock = threading.Lock()
+
+    def _db(self):
+        # One connection per process (reopened after fork)
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS mq_message ('
+                         'id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, '
+                         'created_ms INTEGER NOT NULL, body TEXT NOT NULL)')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _io(self, fn, *args):
+        return fn(*args) if tpool is None else tpool.execute(fn, *args)
+
+    def _insert(self, body: str):
+        with self._lock:
+            conn = self._db()
+            created_ms = int(time.time() * 1000)
+            conn.execute('INSERT INTO mq_message (channel, created_ms, body) VALUES (?, ?, ?)',
+                         (self.channel, created_ms, body))
+            self._published += 1
+            if self._published % 1000 == 0:
+                conn.execute('DELETE FROM mq_message WHERE created_ms < ?', (created_ms - self.retention_ms,))
+
+    def _fetch(self, last_id: int) -> list:
+        with self._lock:
+            return self._db().execute('SELECT id, body FROM mq_message WHERE id > ? AND channel = ? '
+                                      'ORDER BY id LIMIT 500', (last_id, self.channel)).fetchall()
+
+    def _last_id(self) -> int:
+        with self._lock:
+            return self._db().execute('SELECT COALESCE(MAX(id), 0) FROM mq_message').fetchone()[0]
+
+    def _publish(self, data):
+        self._io(self._insert, self.json.dumps(data))
+
+    def _listen(self):
+        last_id = self._io(self._last_id)
+        idle = self.poll_interval
+        while True:
+            rows = self._io(self._fetch, last_id)
+            for last_id, body in rows:
+                yield body
+            if rows:
+                idle = self.poll_interval
+            else:
+                self.server.sleep(idle)
+                idle = min(idle * 2, self.max_poll_interval)
+
+
+MESSAGE_QUEUE_BACKENDS = (
+    (('sqlite:',), SqliteBrokerManager),
+    (('redis://', 'rediss://', 'valkey://', 'valkeys://', 'redis+sentinel://', 'valkey+sentinel://'), RedisManager),
+    (('kafka://',), KafkaManager),
+    (('zmq',), ZmqManager),
+)
+
+
+def make_client_manager(url: str, channel: str = 'nrl-socketio', write_only: bool = False):
+    """SocketIO client_manager for a message-queue URL; None (no URL) keeps the in-process manager."""
+    if not url:
+        return None
+    base = next((cls for prefixes, cls in MESSAGE_QUEUE_BACKENDS if url.startswith(prefixes)), KombuManager)
+    manager_cls = type(f'AppSync{base.__name__}', (AppSyncMixin, base), {})
+    return manager_cls(url, channel=channel, write_only=write_only)
+
 
 # -----------------------------
 # Flask & extensions
@@ -22,14 +193,64 @@ app = Flask(__name__)
 CORS(app)
 
 # SQLite DB
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///nrl_scoring.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('NRL_DATABASE_URI', 'sqlite:///nrl_scoring.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# SQLite tuning, applied to every new DBAPI connection (see _sqlite_pragmas)
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('NRL_SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('NRL_SQLITE_SYNCHRONOUS', 'FULL')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('NRL_SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+# Score writes: 'direct' commits per request, 'group' batches concurrent
+# submissions into one transaction (see ScoreWriter)
+app.config['SCORE_WRITE_MODE'] = os.environ.get('NRL_SCORE_WRITE_MODE', 'group')
+app.config['SCORE_GROUP_COMMIT_MS'] = float(os.environ.get('NRL_SCORE_GROUP_COMMIT_MS', 0))
+app.config['SCORE_GROUP_MAX_BATCH'] = 64
+
+# Blocking DB work runs on a bounded pool of native threads so the eventlet
+# hub keeps serving sockets during slow commits (see DbPool)
+app.config['DB_OFFLOAD'] = os.environ.get('NRL_DB_OFFLOAD', '1') == '1'
+app.config['DB_POOL_SIZE'] = int(os.environ.get('NRL_DB_POOL_SIZE', 4))
+
+# Multi-process mode: NRL_WORKERS server processes share one port and fan
+# Socket.IO traffic out through NRL_MESSAGE_QUEUE (see make_client_manager)
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('NRL_MESSAGE_QUEUE', '')
+app.config['SOCKETIO_CHANNEL'] = os.environ.get('NRL_MESSAGE_QUEUE_CHANNEL', 'nrl-socketio')
+app.config['WORKERS'] = int(os.environ.get('NRL_WORKERS', 1))
+
+# Events: the default event lives in the main DB above; every event created
+# later gets its own SQLite file in EVENT_DB_DIR (see Events)
+app.config['DEFAULT_EVENT_CODE'] = os.environ.get('NRL_DEFAULT_EVENT', 'default')
+app.config['EVENT_DB_DIR'] = os.environ.get('NRL_EVENT_DB_DIR', '')
+
 # SocketIO for live updates
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet',
+                    client_manager=make_client_manager(app.config['SOCKETIO_MESSAGE_QUEUE'],
+                                                       app.config['SOCKETIO_CHANNEL']))
 
 # ORM
-db = SQLAlchemy(app)
+class EventSession(FlaskSession):
+    """Sends event-scoped tables to the current event's database (see event_bind)."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            engine = event_bind(mapper, clause)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(app, session_options={'class_': EventSession})
+
+@sa_event.listens_for(Engine, 'connect')
+def _sqlite_pragmas(dbapi_conn, _record):
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return
+    cur = dbapi_conn.cursor()
+    cur.execute(f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}")
+    cur.execute(f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}")
+    cur.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    cur.close()
 
 # -----------------------------
 # Helpers
@@ -42,16 +263,151 @@ def get_by_id(model, pk):
     """SQLAlchemy 2.x style Session.get wrapper."""
     return db.session.get(model, pk)
 
+def match_header(match_id: int):
+    """Schedule columns of one match as a plain Row (attribute access like Match), or None."""
+    return db.session.execute(
+        db.select(Match.id, Match.match_number, Match.arena, Match.status, Match.red_teams, Match.blue_teams)
+        .where(Match.id == match_id)
+    ).first()
+
 def now_ms() -> int:
     return int(time.time() * 1000)
 
+def next_change_seq() -> int:
+    """
+    Next Match.updated_seq, drawn from the ChangeCounter row inside the caller's
+    transaction. SQLite holds the write lock from this UPDATE until commit, so
+    stamps become visible in increasing order and updated_since never skips one.
+    """
+    counter = ChangeCounter.__table__
+    bump = (counter.update().where(counter.c.name == 'match')
+            .values(value=counter.c.value + 1).returning(counter.c.value))
+    seq = db.session.scalar(bump)
+    if seq is None:
+        # First change in this database: continue from any stamps already stored
+        seed = db.session.scalar(db.select(db.func.max(Match.updated_seq))) or 0
+        db.session.execute(sqlite_insert(counter).values(name='match', value=seed).on_conflict_do_nothing())
+        seq = db.session.scalar(bump)
+    return seq
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
 def get_timer_state(match_id: int):
-    st = MATCH_TIMERS.get(match_id)
+    st = TIMER_STORE.get(match_id)
     if not st:
         return {'running': False, 'duration': 150, 'start_ms': None}
     return st
 
 
+# -----------------------------
+# Match timer store
+# -----------------------------
+# TIMER_BACKEND = 'memory' keeps timers in MATCH_TIMERS (single process).
+# TIMER_BACKEND = 'sqlite' keeps them in a small WAL-mode SQLite file that
+# every server process behind the same port shares; reads are a single
+# primary-key lookup on a long-lived connection. Timers are kept per event
+# (match ids repeat across event databases), so activating another event
+# leaves the previous event's clocks alone.
+app.config.setdefault('TIMER_BACKEND', os.environ.get('NRL_TIMER_BACKEND', 'memory'))
+app.config.setdefault('TIMER_DB_PATH', os.environ.get('NRL_TIMER_DB_PATH', ''))
+
+
+def timer_scope() -> str:
+    event = current_event()
+    return event.code if event is not None else ''
+
+
+class MemoryTimerStore:
+    def __init__(self, timers: dict):
+        self.timers = timers
+
+    def get(self, match_id: int):
+        return self.timers.get((timer_scope(), match_id))
+
+    def start_if_idle(self, match_id: int, start_ms: int, duration: int):
+        """Start unless already running. Returns (state, started)."""
+        key = (timer_scope(), match_id)
+        st = self.timers.get(key)
+        if st and st.get('running'):
+            return st, False
+        st = self.timers[key] = {'start_ms': start_ms, 'duration': duration, 'running': True}
+        return st, True
+
+    def reset(self, match_id: int):
+        self.timers.pop((timer_scope(), match_id), None)
+
+    def clear(self):
+        self.timers.clear()
+
+
+class SqliteTimerStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._pid = None
+
+    def _db(self):
+        # One connection per process (reopened after fork)
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if 'event' not in {row[1] for row in conn.execute('PRAGMA table_info(match_timer)')}:
+                conn.execute('DROP TABLE IF EXISTS match_timer')  # pre-event layout; timers are transient
+            conn.execute('CREATE TABLE IF NOT EXISTS match_timer ('
+                         "event TEXT NOT NULL DEFAULT '', match_id INTEGER NOT NULL, start_ms INTEGER NOT NULL, "
+                         'duration INTEGER NOT NULL, running INTEGER NOT NULL, PRIMARY KEY (event, match_id))')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, match_id: int):
+        row = self._db().execute(
+            'SELECT start_ms, duration, running FROM match_timer WHERE event = ? AND match_id = ?',
+            (timer_scope(), match_id)
+        ).fetchone()
+        if not row:
+            return None
+        return {'start_ms': row[0], 'duration': row[1], 'running': bool(row[2])}
+
+    def start_if_idle(self, match_id: int, start_ms: int, duration: int):
+        conn = self._db()
+        conn.execute('BEGIN IMMEDIATE')  # serialises concurrent starts across processes
+        try:
+            st = self.get(match_id)
+            if st and st['running']:
+                conn.execute('COMMIT')
+                return st, False
+            conn.execute('INSERT OR REPLACE INTO match_timer (event, match_id, start_ms, duration, running) '
+                         'VALUES (?, ?, ?, ?, 1)', (timer_scope(), match_id, start_ms, duration))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return {'start_ms': start_ms, 'duration': duration, 'running': True}, True
+
+    def reset(self, match_id: int):
+        self._db().execute('DELETE FROM match_timer WHERE event = ? AND match_id = ?', (timer_scope(), match_id))
+
+    def clear(self):
+        self._db().execute('DELETE FROM match_timer')
+
+
+def make_timer_store():
+    backend = app.config['TIMER_BACKEND']
+    if backend == 'memory':
+        return MemoryTimerStore(MATCH_TIMERS)
+    if backend == 'sqlite':
+        path = app.config['TIMER_DB_PATH'] or os.path.join(app.instance_path, 'match_timers.db')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return SqliteTimerStore(path)
+    raise ValueError(f'Unknown TIMER_BACKEND: {backend!r}')
+
+
+TIMER_STORE = make_timer_store()
+
+
 # -----------------------------
 # Models
 # -----------------------------
@@ -78,7 +434,24 @@ class Match(db.Model):
     blue_teams = db.Column(db.String(100))
     status = db.Column(db.String(50), default="pending")  # pending / live / completed
 
+    # Denormalized result (refresh_match_results): totals once an alliance is
+    # scored, winner (red / blue / tie) once both alliances are finalised
+    red_total = db.Column(db.Integer, index=True)
+    blue_total = db.Column(db.Integer, index=True)
+    winner = db.Column(db.String(10), index=True)
+    updated_seq = db.Column(db.BigInteger, nullable=False, default=0, index=True)  # next_change_seq() of last change
+
+class ChangeCounter(db.Model):
+    """
+    Commit-ordered counters, one row per name (see next_change_seq). The 'rules'
+    row holds the rule version this database's totals were computed under.
+    """
+    name = db.Column(db.String(32), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
 class ScoreEntry(db.Model):
+    __table_args__ = (db.Index('ix_score_entry_match_alliance', 'match_id', 'alliance'),)
+
     id = db.Column(db.Integer, primary_key=True)
     match_id = db.Column(db.Integer, db.ForeignKey('match.id'), nullable=False)
     alliance = db.Column(db.String(10), nullable=False)  # 'red' or 'blue'
@@ -87,6 +460,7 @@ class ScoreEntry(db.Model):
     alliance_charge = db.Column(db.Integer, default=0)
     captured_charge = db.Column(db.Integer, default=0)
     golden_charge_stack = db.Column(db.Text, default='')  # your grid encoding (string)
+    golden_heights = db.Column(db.String(128), default='')  # canonical "rows:heights", see encode_golden_heights
     minor_penalties = db.Column(db.Integer, default=0)
     major_penalties = db.Column(db.Integer, default=0)
     full_parking = db.Column(db.Integer, default=0)
@@ -100,6 +474,558 @@ class ScoreEntry(db.Model):
     finalised = db.Column(db.Boolean, default=False)    # final lock by head referee
     confirmed_by = db.Column(db.Integer)                # head referee user id
 
+    # Denormalized under the active rule version (store_score_totals / recompute_score_totals)
+    total_score = db.Column(db.Integer, index=True)
+    golden_points = db.Column(db.Integer)
+
+    # Optimistic concurrency: every ORM update is "... WHERE version = :seen"
+    version = db.Column(db.Integer, nullable=False, default=0)
+    idempotency_key = db.Column(db.String(64), default='')  # key of the last applied submission
+
+    __mapper_args__ = {'version_id_col': version}
+
+class MatchParticipant(db.Model):
+    """Normalized team -> match index, kept in step with Match.red_teams/blue_teams."""
+    __table_args__ = (db.Index('ix_match_participant_team', 'team_number', 'match_id'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), nullable=False, index=True)
+    team_number = db.Column(db.String(100), nullable=False)
+    alliance = db.Column(db.String(10), nullable=False)
+    station = db.Column(db.Integer, nullable=False)     # 1-based position within the alliance
+
+class TeamStats(db.Model):
+    """Per-team performance over decided matches, updated by per-match deltas (see apply_match_deltas)."""
+    id = db.Column(db.Integer, primary_key=True)
+    team_number = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    matches_played = db.Column(db.Integer, default=0, nullable=False)
+    total_contribution = db.Column(db.Integer, default=0, nullable=False)  # sum of alliance totals
+    max_contribution = db.Column(db.Integer, default=0, nullable=False)
+    parked_matches = db.Column(db.Integer, default=0, nullable=False)
+    docked_matches = db.Column(db.Integer, default=0, nullable=False)
+    engaged_matches = db.Column(db.Integer, default=0, nullable=False)
+    penalties_committed = db.Column(db.Integer, default=0, nullable=False)  # penalty points lost
+    golden_points = db.Column(db.Integer, default=0, nullable=False)
+    updated_ms = db.Column(db.BigInteger, default=0, nullable=False)
+
+class ScoreEvent(db.Model):
+    """Append-only score journal; id is the global sequence number."""
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer, nullable=False, index=True)
+    alliance = db.Column(db.String(10), nullable=False)
+    kind = db.Column(db.String(16), nullable=False)    # import / submit / draft / finalise
+    payload = db.Column(db.Text, nullable=False)       # JSON of the fields this event sets
+    actor = db.Column(db.Integer)                      # user id, when known
+    created_ms = db.Column(db.BigInteger, nullable=False)
+
+class ScoreCheckpoint(db.Model):
+    """One match's folded journal state up to and including event seq (see journal_state)."""
+    __table_args__ = (db.Index('ix_score_checkpoint_match_seq', 'match_id', 'seq'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer)
+    seq = db.Column(db.Integer, nullable=False, unique=True, index=True)
+    state = db.Column(db.Text, nullable=False)         # JSON {alliance: fields, alliance + '_draft': breakdown}
+    created_ms = db.Column(db.BigInteger, nullable=False)
+
+class ScoringRuleSet(db.Model):
+    """Versioned point values (see DEFAULT_SCORING_RULES); exactly one is active."""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, unique=True, nullable=False)
+    points = db.Column(db.Text, nullable=False)        # JSON {rule_key: points}
+    note = db.Column(db.String(200), default='')
+    active = db.Column(db.Boolean, default=False, nullable=False)
+    created_ms = db.Column(db.BigInteger, nullable=False)
+
+class Event(db.Model):
+    """Event registry (main DB). Everything else scored at an event lives in its db_file."""
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(40), unique=True, nullable=False)
+    name = db.Column(db.String(120), nullable=False)
+    season = db.Column(db.String(20), default='', index=True)
+    db_file = db.Column(db.String(200), default='')     # in EVENT_DB_DIR; '' = the main DB
+    status = db.Column(db.String(20), default='open', nullable=False)  # open / archived
+    active = db.Column(db.Boolean, default=False, nullable=False)      # exactly one: takes writes + sockets
+    created_ms = db.Column(db.BigInteger, nullable=False)
+    archived_ms = db.Column(db.BigInteger)
+
+class TeamStanding(db.Model):
+    """Per-team standings, updated alongside TeamStats (see apply_match_deltas)."""
+    id = db.Column(db.Integer, primary_key=True)
+    team_number = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    matches_played = db.Column(db.Integer, default=0, nullable=False)
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    ties = db.Column(db.Integer, default=0, nullable=False)
+    total_score = db.Column(db.Integer, default=0, nullable=False)
+    max_score = db.Column(db.Integer, default=0, nullable=False)
+    penalties_drawn = db.Column(db.Integer, default=0, nullable=False)  # opponent penalty points
+    golden_points = db.Column(db.Integer, default=0, nullable=False)
+    endgame_points = db.Column(db.Integer, default=0, nullable=False)
+
+# Columns added after the first release; create_all() won't add them to an existing DB
+SCHEMA_ADDITIONS = {
+    'score_entry': {
+        'golden_heights': "VARCHAR(128) DEFAULT ''",
+        'version': "INTEGER NOT NULL DEFAULT 0",
+        'idempotency_key': "VARCHAR(64) DEFAULT ''",
+        'total_score': "INTEGER",
+        'golden_points': "INTEGER",
+    },
+    'match': {
+        'red_total': "INTEGER",
+        'blue_total': "INTEGER",
+        'winner': "VARCHAR(10)",
+        'updated_seq': "BIGINT NOT NULL DEFAULT 0",
+    },
+    'score_checkpoint': {
+        'match_id': "INTEGER",
+    },
+}
+
+def ensure_schema(engine=None, tables=None):
+    """Add any SCHEMA_ADDITIONS columns and model indexes missing from an existing SQLite DB."""
+    tables = db.metadata.sorted_tables if tables is None else tables
+    with (engine or db.engine).begin() as conn:
+        for table, columns in SCHEMA_ADDITIONS.items():
+            have = {row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info("{table}")')}
+            for name, ddl in columns.items():
+                if name not in have:
+                    conn.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN {name} {ddl}')
+        for table in tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+def init_db():
+    db.create_all()
+    ensure_schema()
+    load_scoring_rules()
+    backfill_golden_heights()
+    backfill_score_totals()
+    backfill_match_status()
+    backfill_score_journal()
+    backfill_team_index()
+    init_events()
+
+# -----------------------------
+# Socket.IO rooms
+# -----------------------------
+# match_<id>    : full payloads for one match (scoring tablets, match summary)
+# match_<id>_patch : live_score_patch deltas, for match_<id> members that joined with patches
+# arena_<name>  : timers + compact results for every match in one arena
+# event         : compact "all arenas" feed for audience displays
+EVENT_ROOM = 'event'
+
+def match_room(match_id) -> str:
+    return f'match_{match_id}'
+
+def patch_room(match_id) -> str:
+    return f'match_{match_id}_patch'
+
+def arena_room(arena: str | None) -> str:
+    return f'arena_{(arena or "").strip().lower()}'
+
+def compact_score(match: Match, alliance: str, total: int, finalised: bool) -> dict:
+    """Small per-alliance payload for arena/event feeds (no breakdown)."""
+    return {
+        'match_id': match.id,
+        'match_number': match.match_number,
+        'arena': match.arena,
+        'alliance': alliance,
+        'total_score': total,
+        'finalised': finalised,
+    }
+
+# -----------------------------
+# Versioned response cache (ETag / If-None-Match)
+# -----------------------------
+# Write paths call bump_version() on the resources they touch; cached read
+# endpoints derive a strong ETag from the versions they depend on, answer
+# If-None-Match with 304 and serve unchanged bodies from a bounded LRU.
+# DATA_EPOCH keeps ETags from a previous process from ever matching; the
+# event code keeps one event's ETags and cached bodies apart from another's.
+app.config.setdefault('RESPONSE_CACHE_SIZE', 1024)
+
+DATA_EPOCH = os.urandom(4).hex()
+DATA_VERSION = {'current': 0}
+RESOURCE_VERSIONS = {}   # { 'schedule' | 'match:<id>' | 'team:<n>': version }
+RESPONSE_CACHE = OrderedDict()  # { cache_key: (etag, body, mimetype) }
+CACHE_STATS = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0}
+
+
+def bump_version(*resources) -> int:
+    publish_app_sync('bump', resources=list(resources))
+    return bump_local_version(*resources)
+
+
+def bump_local_version(*resources) -> int:
+    DATA_VERSION['current'] += 1
+    for resource in resources:
+        RESOURCE_VERSIONS[resource] = DATA_VERSION['current']
+    return DATA_VERSION['current']
+
+
+def resource_etag(resources) -> str:
+    event = current_event()
+    return (DATA_EPOCH + '-' + (event.code if event else '') + '-'
+            + '.'.join(str(RESOURCE_VERSIONS.get(r, 0)) for r in resources))
+
+
+def cached_response(resources_for):
+    """
+    Decorator for GET views. resources_for(**view_kwargs) -> iterable of
+    resource names whose versions determine the response.
+    Only 200 responses are cached.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            etag = resource_etag(resources_for(**kwargs))
+            if request.if_none_match.contains(etag):
+                CACHE_STATS['not_modified'] += 1
+                resp = Response(status=304)
+                resp.set_etag(etag)
+                return resp
+
+            event = current_event()
+            key = (event.code if event else '') + ':' + request.full_path
+            entry = RESPONSE_CACHE.get(key)
+            if entry and entry[0] == etag:
+                CACHE_STATS['hits'] += 1
+                RESPONSE_CACHE.move_to_end(key)
+                resp = Response(entry[1], status=200, mimetype=entry[2])
+                resp.set_etag(etag)
+                return resp
+
+            CACHE_STATS['misses'] += 1
+            resp = app.make_response(view(**kwargs))
+            if resp.status_code == 200 and not resp.is_streamed:
+                RESPONSE_CACHE[key] = (etag, resp.get_data(), resp.mimetype)
+                RESPONSE_CACHE.move_to_end(key)
+                while len(RESPONSE_CACHE) > app.config['RESPONSE_CACHE_SIZE']:
+                    RESPONSE_CACHE.popitem(last=False)
+                    CACHE_STATS['evictions'] += 1
+                resp.set_etag(etag)
+            return resp
+        return wrapper
+    return decorator
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        **CACHE_STATS,
+        'entries': len(RESPONSE_CACHE),
+        'capacity': app.config['RESPONSE_CACHE_SIZE'],
+        'data_version': DATA_VERSION['current'],
+    }), 200
+
+
+# -----------------------------
+# Metrics (Prometheus text format at /metrics)
+# -----------------------------
+# Plain in-process counters/histograms: one bisect + a few dict updates per
+# observation, so they stay on during live matches. DB_POOL threads observe
+# too, so each metric guards its series with a lock.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUEUE_DEPTH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        self.series = {}  # {label_values: [bucket_counts..., sum, count]}
+        self.lock = threading.Lock()
+
+    def observe(self, label_values: tuple, value: float):
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                # per-bucket counts, +Inf overflow, sum, count
+                series = self.series[label_values] = [0] * (len(self.buckets) + 3)
+            series[bucket] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+        with self.lock:
+            snapshot = sorted((k, list(v)) for k, v in self.series.items())
+        for label_values, series in snapshot:
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for le, n in zip(self.buckets, series):
+                cumulative += n
+                yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {series[-1]}'
+            yield f'{self.name}_sum{_braced(labels)} {series[-2]:.6f}'
+            yield f'{self.name}_count{_braced(labels)} {series[-1]}'
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help_text, labels
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def inc(self, label_values: tuple = (), amount: float = 1):
+        with self.lock:
+            self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} counter'
+        with self.lock:
+            snapshot = sorted(self.series.items())
+        for label_values, value in snapshot:
+            yield f'{self.name}{_braced(_labels(self.labels, label_values))} {value}'
+
+
+def _braced(labels: str) -> str:
+    return f'{{{labels}}}' if labels else ''
+
+
+def _labels(names, values) -> str:
+    return ','.join(f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                    for n, v in zip(names, values))
+
+
+HTTP_LATENCY = Histogram('nrl_http_request_duration_seconds', 'Flask route latency.',
+                         ('endpoint', 'method'), LATENCY_BUCKETS)
+HTTP_REQUESTS = Counter('nrl_http_requests_total', 'Flask requests by status.', ('endpoint', 'method', 'status'))
+DB_QUERIES_PER_REQUEST = Histogram('nrl_db_queries_per_request', 'SQL statements executed per HTTP request.',
+                                   ('endpoint',), QUERY_COUNT_BUCKETS)
+DB_QUERIES = Counter('nrl_db_queries_total', 'SQL statements executed (requests and background tasks).')
+SOCKET_HANDLER_LATENCY = Histogram('nrl_socket_handler_duration_seconds', 'Socket.IO handler latency.',
+                                   ('event',), LATENCY_BUCKETS)
+SOCKET_EMITS = Counter('nrl_socket_emits_total', 'Socket.IO emits by event.', ('event',))
+SOCKET_RECIPIENTS = Counter('nrl_socket_emit_recipients_total', 'Clients addressed by emits (room sizes).',
+                            ('event',))
+SOCKET_BYTES = Counter('nrl_socket_emit_bytes_total', 'Approximate payload bytes sent (sampled size x recipients).',
+                       ('event',))
+DB_POOL_WAIT = Histogram('nrl_db_pool_wait_seconds', 'Time DB work waited for a free worker thread.',
+                         ('job',), LATENCY_BUCKETS)
+DB_POOL_RUN = Histogram('nrl_db_pool_run_seconds', 'Time DB work ran on a worker thread.', ('job',), LATENCY_BUCKETS)
+SOCKET_DEFERRED = Counter('nrl_socket_deferred_total', 'Broadcasts parked for a congested client.', ('event',))
+SOCKET_DROPPED = Counter('nrl_socket_dropped_total', 'Parked broadcasts superseded before delivery.', ('event',))
+SOCKET_SLOW_DISCONNECTS = Counter('nrl_socket_slow_disconnects_total', 'Clients disconnected for staying behind.')
+SOCKET_RATE_LIMITED = Counter('nrl_socket_rate_limited_total', 'Inbound events dropped by the per-socket limit.',
+                              ('event',))
+SOCKET_QUEUE_DEPTH = Histogram('nrl_socket_client_queue_depth', 'Queued packets of congested clients, per sweep.',
+                               (), QUEUE_DEPTH_BUCKETS)
+METRICS = (HTTP_LATENCY, HTTP_REQUESTS, DB_QUERIES_PER_REQUEST, DB_QUERIES,
+           SOCKET_HANDLER_LATENCY, SOCKET_EMITS, SOCKET_RECIPIENTS, SOCKET_BYTES, DB_POOL_WAIT, DB_POOL_RUN,
+           SOCKET_DEFERRED, SOCKET_DROPPED, SOCKET_SLOW_DISCONNECTS, SOCKET_RATE_LIMITED, SOCKET_QUEUE_DEPTH)
+
+
+@app.before_request
+def _metrics_start():
+    g.metrics_t0 = time.perf_counter()
+    g.db_queries = 0
+
+
+@app.after_request
+def _metrics_observe(response):
+    t0 = g.get('metrics_t0')
+    if t0 is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_LATENCY.observe((endpoint, request.method), time.perf_counter() - t0)
+        HTTP_REQUESTS.inc((endpoint, request.method, response.status_code))
+        DB_QUERIES_PER_REQUEST.observe((endpoint,), g.get('db_queries', 0))
+    return response
+
+
+@sa_event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(*_args):
+    DB_QUERIES.inc()
+    if has_app_context() and 'db_queries' in g:  # a request, or DB_POOL work done for one
+        g.db_queries += 1
+
+
+# Payload bytes are estimated from one serialization every EMIT_SIZE_SAMPLE_EVERY
+# emits of an event; recipients are read off the room sizes, not walked.
+EMIT_SIZE_SAMPLE_EVERY = 32
+EMIT_SIZES = {}  # { event: [emits seen, last measured size] }
+
+
+def estimate_emit_size(event: str, data) -> int:
+    entry = EMIT_SIZES.get(event)
+    if entry is None:
+        entry = EMIT_SIZES[event] = [0, 0]
+    if entry[0] % EMIT_SIZE_SAMPLE_EVERY == 0:
+        try:
+            entry[1] = len(json.dumps(data, separators=(',', ':'), default=str))
+        except (TypeError, ValueError):
+            entry[1] = 0
+    entry[0] += 1
+    return entry[1]
+
+
+def instrument_socketio():
+    """Time every registered @socketio.on handler and count emits/recipients/bytes."""
+    server = socketio.server
+    for namespace, handlers in server.handlers.items():
+        for event, handler in list(handlers.items()):
+            handlers[event] = _timed_handler(event, handler)
+
+    raw_emit = server.emit
+
+    @functools.wraps(raw_emit)
+    def counted_emit(event, data=None, to=None, room=None, skip_sid=None, namespace=None, **kwargs):
+        target = to or room
+        rooms = server.manager.rooms.get(namespace or '/', {})
+        # Overlapping rooms count a client once per room; close enough for a rate
+        recipients = sum(len(rooms.get(r, ())) for r in (target if isinstance(target, list) else [target]))
+        if skip_sid:
+            recipients = max(0, recipients - (len(skip_sid) if isinstance(skip_sid, list) else 1))
+        size = estimate_emit_size(event, data)
+        SOCKET_EMITS.inc((event,))
+        SOCKET_RECIPIENTS.inc((event,), recipients)
+        SOCKET_BYTES.inc((event,), size * recipients)
+        return raw_emit(event, data=data, to=to, room=room, skip_sid=skip_sid, namespace=namespace, **kwargs)
+
+    server.emit = counted_emit
+
+
+def _timed_handler(event, handler):
+    @functools.wraps(handler)
+    def timed(*args):
+        t0 = time.perf_counter()
+        try:
+            return handler(*args)
+        finally:
+            SOCKET_HANDLER_LATENCY.observe((event,), time.perf_counter() - t0)
+    return timed
+
+
+def socket_gauges():
+    """Connected clients and room membership by room kind, read at scrape time."""
+    rooms = socketio.server.manager.rooms.get('/', {})
+    connected = len(rooms.get(None, ()))
+    members = {}
+    for name, sids in rooms.items():
+        if not isinstance(name, str) or name in sids:  # skip the per-client rooms
+            continue
+        kind = name.split('_', 1)[0]
+        count, total = members.get(kind, (0, 0))
+        members[kind] = (count + 1, total + len(sids))
+    yield '# HELP nrl_socket_connected_clients Connected Socket.IO clients.'
+    yield '# TYPE nrl_socket_connected_clients gauge'
+    yield f'nrl_socket_connected_clients {connected}'
+    yield '# HELP nrl_socket_rooms Rooms with at least one member, by kind (match/arena/event).'
+    yield '# TYPE nrl_socket_rooms gauge'
+    for kind, (count, _) in sorted(members.items()):
+        yield f'nrl_socket_rooms{{kind="{kind}"}} {count}'
+    yield '# HELP nrl_socket_room_members Room memberships, by room kind.'
+    yield '# TYPE nrl_socket_room_members gauge'
+    for kind, (_, total) in sorted(members.items()):
+        yield f'nrl_socket_room_members{{kind="{kind}"}} {total}'
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(socket_gauges())
+    lines.extend(backpressure_gauges())
+    lines.extend(DB_POOL.gauges())
+    for key, value in CACHE_STATS.items():
+        lines.append(f'nrl_response_cache_{key}_total {value}')
+    lines.append(f'nrl_score_writer_batches_total {SCORE_WRITER.batches}')
+    lines.append(f'nrl_score_writer_jobs_total {SCORE_WRITER.jobs}')
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4'), 200
+
+
+# -----------------------------
+# Database worker pool
+# -----------------------------
+class DbPool:
+    """
+    Runs a unit of DB work in its own app context (and session) on eventlet's
+    native thread pool, at most DB_POOL_SIZE at a time, so sqlite3 calls
+    never block the hub. The caller's green thread gets the return value, so
+    work must return plain data rather than ORM objects, and must not emit.
+    Statements the work executes count toward the calling request's
+    nrl_db_queries_per_request. Without eventlet, or with DB_OFFLOAD off, the work runs inline.
+    """
+
+    def __init__(self):
+        self.slots = None
+        self.waiting = 0
+        self.active = 0
+        self.local = threading.local()
+
+    def run(self, job: str, fn, *args):
+        if getattr(self.local, 'worker', False):
+            return fn(*args)  # nested: already inside a unit of work
+        event = g.get('nrl_event') if has_app_context() else None  # requested (non-default) event
+        queries = [0]
+        try:
+            return self._offload(job, fn, args, event, queries)
+        finally:
+            if has_app_context() and 'db_queries' in g:
+                g.db_queries += queries[0]  # the worker's queries count toward the caller's request
+
+    def _offload(self, job: str, fn, args, event, queries):
+        if tpool is None or not app.config['DB_OFFLOAD']:
+            return self._work(job, fn, args, event, queries)
+        if self.slots is None:
+            tpool.set_num_threads(app.config['DB_POOL_SIZE'])
+            self.slots = Semaphore(app.config['DB_POOL_SIZE'])
+
+        t0 = time.perf_counter()
+        self.waiting += 1
+        try:
+            self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        DB_POOL_WAIT.observe((job,), time.perf_counter() - t0)
+        self.active += 1
+        try:
+            return tpool.execute(self._work, job, fn, args, event, queries)
+        finally:
+            self.active -= 1
+            self.slots.release()
+
+    def _work(self, job: str, fn, args, event=None, queries=None):
+        t0 = time.perf_counter()
+        self.local.worker = True
+        try:
+            with app.app_context():
+                if event is not None:
+                    g.nrl_event = event
+                g.db_queries = 0
+                try:
+                    return fn(*args)
+                finally:
+                    db.session.remove()
+                    if queries is not None:
+                        queries[0] = g.db_queries
+        finally:
+            self.local.worker = False
+            DB_POOL_RUN.observe((job,), time.perf_counter() - t0)
+
+    def gauges(self):
+        yield '# HELP nrl_db_pool_size Native threads available for DB work.'
+        yield '# TYPE nrl_db_pool_size gauge'
+        yield f"nrl_db_pool_size {app.config['DB_POOL_SIZE'] if app.config['DB_OFFLOAD'] else 0}"
+        yield '# HELP nrl_db_pool_active DB jobs running on worker threads.'
+        yield '# TYPE nrl_db_pool_active gauge'
+        yield f'nrl_db_pool_active {self.active}'
+        yield '# HELP nrl_db_pool_queue_depth DB jobs waiting for a worker thread.'
+        yield '# TYPE nrl_db_pool_queue_depth gauge'
+        yield f'nrl_db_pool_queue_depth {self.waiting}'
+
+
+DB_POOL = DbPool()
+
+
 # -----------------------------
 # Auth
 # -----------------------------
@@ -107,50 +1033,186 @@ class ScoreEntry(db.Model):
 def register():
     data = request.json or {}
     try:
-        new_user = User(
-            username=data['username'],
-            email=data['email'],
-            password_hash=hash_password(data['password']),
-            role=data['role']
-        )
-        db.session.add(new_user)
-        db.session.commit()
-        return jsonify({'message': 'User registered successfully'}), 201
+        fields = {'username': data['username'], 'email': data['email'],
+                  'password_hash': hash_password(data['password']), 'role': data['role']}
     except KeyError as e:
         return jsonify({'error': f'Missing field: {e.args[0]}'}), 400
+    try:
+        DB_POOL.run('register', add_user, fields)
+        return jsonify({'message': 'User registered successfully'}), 201
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+
+def add_user(fields: dict):
+    """Insert a user (runs on DB_POOL); the session is rolled back on failure."""
+    try:
+        db.session.add(User(**fields))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def user_login(username: str) -> dict | None:
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        return None
+    return {'id': user.id, 'role': user.role, 'username': user.username, 'password_hash': user.password_hash}
+
+
 @app.route('/login', methods=['POST'])
 def login():
     data = request.json or {}
-    user = User.query.filter_by(username=data.get('username', '')).first()
-    if user and user.password_hash == hash_password(data.get('password', '')):
+    user = DB_POOL.run('login', user_login, data.get('username', ''))
+    if user and user['password_hash'] == hash_password(data.get('password', '')):
         return jsonify({
             'message': 'Login successful',
-            'user_id': user.id,
-            'role': user.role,
-            'username': user.username
+            'user_id': user['id'],
+            'role': user['role'],
+            'username': user['username']
         }), 200
     return jsonify({'message': 'Invalid credentials'}), 401
 
 # -----------------------------
 # Schedule upload & retrieval
 # -----------------------------
+# Rows per executemany batch when importing schedules
+UPLOAD_BATCH_SIZE = 500
+
+
+def parse_schedule_rows(csv_input):
+    """
+    Stream-parse schedule rows (header already consumed).
+    Returns (rows, errors): rows maps match_number -> dict, errors is a list of
+    {'line': n, 'error': msg} for rows that failed validation.
+    """
+    rows = {}
+    errors = []
+    for line_no, row in enumerate(csv_input, start=2):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        if len(row) < 5:
+            errors.append({'line': line_no, 'error': 'Expected at least 5 columns'})
+            continue
+        try:
+            match_no = int(row[0])
+        except ValueError:
+            errors.append({'line': line_no, 'error': f'Invalid match number: {row[0]!r}'})
+            continue
+        teams = [cell.strip() for cell in row[1:5]]
+        if not all(teams):
+            errors.append({'line': line_no, 'error': f'Match {match_no}: missing team number'})
+            continue
+        if len(set(teams)) != 4:
+            errors.append({'line': line_no, 'error': f'Match {match_no}: duplicate team in match'})
+            continue
+        if match_no in rows:
+            errors.append({'line': line_no, 'error': f'Match {match_no}: duplicate match number in file'})
+            continue
+        arena = row[5].strip() if len(row) > 5 and row[5].strip() else None
+        rows[match_no] = {
+            'line': line_no,
+            'match_number': match_no,
+            'red_teams': f"{teams[0]},{teams[1]}",
+            'blue_teams': f"{teams[2]},{teams[3]}",
+            'arena': arena,
+        }
+    return rows, errors
+
+
+def store_schedule(rows: dict, errors: list) -> dict:
+    """Upsert parsed schedule rows in one transaction (runs on DB_POOL); appends skipped rows to errors."""
+    # One query each for existing teams and matches
+    existing_teams = set(db.session.scalars(db.select(Team.name)))
+    existing_matches = {
+        m.match_number: m
+        for m in db.session.execute(
+            db.select(Match.id, Match.match_number, Match.arena,
+                      Match.red_teams, Match.blue_teams, Match.status)
+        )
+    }
+
+    new_teams = []
+    for r in rows.values():
+        for team_num in r['red_teams'].split(',') + r['blue_teams'].split(','):
+            if team_num not in existing_teams:
+                existing_teams.add(team_num)
+                new_teams.append(team_num)
+
+    to_insert, to_update, unchanged = [], [], []
+    moved_teams = set()
+    change_seq = next_change_seq()
+    for match_no, r in sorted(rows.items()):
+        current = existing_matches.get(match_no)
+        if current is None:
+            to_insert.append({
+                'match_number': match_no,
+                'arena': r['arena'] or "Alpha",  # default, can be changed later
+                'red_teams': r['red_teams'],
+                'blue_teams': r['blue_teams'],
+                'status': "pending",
+                'updated_seq': change_seq,
+            })
+            continue
+        arena = r['arena'] or current.arena
+        if (current.red_teams, current.blue_teams, current.arena) == (r['red_teams'], r['blue_teams'], arena):
+            unchanged.append(match_no)
+            continue
+        if current.status == 'completed':
+            errors.append({'line': r['line'], 'error': f'Match {match_no} is completed; not updated'})
+            continue
+        moved_teams.update(split_teams(current.red_teams) + split_teams(current.blue_teams)
+                           + split_teams(r['red_teams']) + split_teams(r['blue_teams']))
+        to_update.append({
+            'id': current.id,
+            'arena': arena,
+            'red_teams': r['red_teams'],
+            'blue_teams': r['blue_teams'],
+            'updated_seq': change_seq,
+        })
+
+    for batch in _chunks([{'name': n} for n in new_teams], UPLOAD_BATCH_SIZE):
+        db.session.execute(db.insert(Team), batch)
+    for batch in _chunks(to_insert, UPLOAD_BATCH_SIZE):
+        db.session.execute(db.insert(Match), batch)
+    for batch in _chunks(to_update, UPLOAD_BATCH_SIZE):
+        db.session.execute(db.update(Match), batch)
+    if to_insert or to_update:
+        ids = dict(db.session.execute(db.select(Match.match_number, Match.id)).all())
+        sync_participants([
+            (ids[r['match_number']], r['red_teams'], r['blue_teams']) for r in to_insert
+        ] + [
+            (r['id'], r['red_teams'], r['blue_teams']) for r in to_update
+        ], replace=bool(to_update))
+    # Completed matches are never reassigned, so team stats and standings don't move
+
+    db.session.commit()
+    id_to_number = {m.id: n for n, m in existing_matches.items()}
+    return {
+        'new_teams': new_teams,
+        'added': [r['match_number'] for r in to_insert],
+        'updated': [id_to_number[r['id']] for r in to_update],
+        'unchanged': len(unchanged),
+        'moved_teams': moved_teams,
+    }
+
+
 @app.route('/upload_schedule', methods=['POST'])
 def upload_schedule():
     """
     CSV format (with header):
-    Match No.,Red Team 1,Red Team 2,Blue Team 1,Blue Team 2
+    Match No.,Red Team 1,Red Team 2,Blue Team 1,Blue Team 2[,Arena]
     1,112,245,398,530
     ...
+    Existing matches are updated in place when their teams/arena changed.
     """
     file = request.files.get('file')
     if not file or not file.filename.endswith('.csv'):
         return jsonify({"error": "Invalid file format. Upload a CSV."}), 400
 
-    stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
+    t0 = time.perf_counter()
+    stream = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline='')
     csv_input = csv.reader(stream)
 
     # Skip header
@@ -158,107 +1220,168 @@ def upload_schedule():
         headers = next(csv_input)
     except StopIteration:
         return jsonify({"error": "CSV is empty"}), 400
-
-    inserted_matches = []
-    inserted_teams = set()
+    except UnicodeDecodeError:
+        return jsonify({"error": "CSV must be UTF-8 encoded"}), 400
 
     try:
-        for row in csv_input:
-            if not row or len(row) < 5:
-                continue
-
-            match_no = int(row[0])
-            red1, red2, blue1, blue2 = row[1].strip(), row[2].strip(), row[3].strip(), row[4].strip()
-
-            # Ensure teams exist
-            for team_num in [red1, red2, blue1, blue2]:
-                if not Team.query.filter_by(name=team_num).first():
-                    db.session.add(Team(name=team_num))
-                    inserted_teams.add(team_num)
-
-            # Add match if not existing
-            if not Match.query.filter_by(match_number=match_no).first():
-                new_match = Match(
-                    match_number=match_no,
-                    arena="Alpha",  # default, can be changed later
-                    red_teams=f"{red1},{red2}",
-                    blue_teams=f"{blue1},{blue2}",
-                    status="pending"
-                )
-                db.session.add(new_match)
-                inserted_matches.append(match_no)
+        rows, errors = parse_schedule_rows(csv_input)
+    except UnicodeDecodeError:
+        return jsonify({"error": "CSV must be UTF-8 encoded"}), 400
+    t_parsed = time.perf_counter()
 
-        db.session.commit()
-        return jsonify({
-            "message": "Schedule uploaded successfully",
-            "matches_added": inserted_matches,
-            "teams_added": list(inserted_teams)
-        }), 201
+    try:
+        result = DB_POOL.run('upload_schedule', store_schedule, rows, errors)
     except Exception as e:
-        db.session.rollback()
         return jsonify({"error": str(e)}), 500
+    t_done = time.perf_counter()
+
+    if result['new_teams']:
+        bump_version('teams')
+    if result['moved_teams']:
+        on_team_stats_changed(result['moved_teams'])
+        refresh_rankings()
+    if result['added'] or result['updated']:
+        bump_version('schedule')
+        schedule_snapshot(everything=True)
+        socketio.emit('schedule_updated', {
+            'matches_added': len(result['added']),
+            'matches_updated': len(result['updated']),
+        }, to=EVENT_ROOM)
+    return jsonify({
+        "message": "Schedule uploaded successfully",
+        "matches_added": result['added'],
+        "matches_updated": result['updated'],
+        "matches_unchanged": result['unchanged'],
+        "teams_added": result['new_teams'],
+        "errors": errors,
+        "stats": {
+            "rows": len(rows),
+            "parse_ms": round((t_parsed - t0) * 1000, 2),
+            "db_ms": round((t_done - t_parsed) * 1000, 2),
+            "total_ms": round((t_done - t0) * 1000, 2),
+        }
+    }), 201
+
+MATCH_LIST_COLUMNS = {
+    'match_id': Match.id,
+    'match_number': Match.match_number,
+    'arena': Match.arena,
+    'status': Match.status,
+    'red_teams': Match.red_teams,
+    'blue_teams': Match.blue_teams,
+    'red_total': Match.red_total,
+    'blue_total': Match.blue_total,
+    'winner': Match.winner,
+    'updated_seq': Match.updated_seq,
+}
+MATCH_LIST_DEFAULT_FIELDS = ('match_id', 'match_number', 'arena', 'red_teams', 'blue_teams', 'status')
+app.config.setdefault('MATCHES_PAGE_SIZE', 100)
+app.config.setdefault('MATCHES_PAGE_MAX', 1000)
+
 
 @app.route('/matches', methods=['GET'])
+@cached_response(lambda: ('schedule', 'results'))
 def get_matches():
-    matches = Match.query.filter(Match.status != 'completed').all()
-    return jsonify({
-        'matches': [
-            {
-                'match_id': m.id,
-                'match_number': m.match_number,
-                'arena': m.arena,
-                'red_teams': m.red_teams.split(',') if m.red_teams else [],
-                'blue_teams': m.blue_teams.split(',') if m.blue_teams else [],
-                'status': m.status
-            } for m in matches
-        ]
-    }), 200
+    """
+    Schedule listing ordered by match_number; every match unless a page is asked for:
+      after=<match_number>    resume from the previous page's next_cursor
+      limit=100               page size (MATCHES_PAGE_SIZE when only after= is given, max MATCHES_PAGE_MAX)
+      arena= status= team= range= ids=
+                              filters; status defaults to everything but completed (status=all for every
+                              match), except with updated_since, where changed rows carry their new status
+      fields=match_id,winner  projection over MATCH_LIST_COLUMNS
+      updated_since=<n>       only matches changed after an earlier response's version
+    """
+    args = request.args.to_dict()
+    status = args.pop('status', None)
+    clauses, error = parse_match_filters(args)
+    if error:
+        return jsonify({'error': error}), 400
+    if status is None:
+        if not args.get('updated_since'):
+            clauses.append(Match.status != 'completed')
+    elif status != 'all':
+        clauses.append(Match.status == status)
+
+    fields = [f.strip() for f in args['fields'].split(',') if f.strip()] if args.get('fields') \
+        else list(MATCH_LIST_DEFAULT_FIELDS)
+    unknown = [f for f in fields if f not in MATCH_LIST_COLUMNS]
+    if unknown:
+        return jsonify({'error': f'Unknown fields: {unknown}', 'fields': sorted(MATCH_LIST_COLUMNS)}), 400
+    paged = 'limit' in args or 'after' in args
+    try:
+        limit = min(int(args.get('limit', app.config['MATCHES_PAGE_SIZE'])), app.config['MATCHES_PAGE_MAX'])
+        if args.get('after'):
+            clauses.append(Match.match_number > int(args['after']))
+        if args.get('updated_since'):
+            clauses.append(Match.updated_seq > int(args['updated_since']))
+    except ValueError:
+        return jsonify({'error': 'limit, after and updated_since must be integers'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+
+    return jsonify(DB_POOL.run('matches', list_matches, clauses, fields, limit if paged else None)), 200
+
+
+def list_matches(clauses, fields, limit: int | None) -> dict:
+    """GET /matches body (runs on DB_POOL); limit=None lists every matching row."""
+    stmt = (db.select(Match.match_number, *(MATCH_LIST_COLUMNS[f] for f in fields)).where(*clauses)
+            .order_by(Match.match_number))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    # Read the version first: every stamp up to it has committed, so the rows include them all
+    version = db.session.scalar(db.select(db.func.max(Match.updated_seq))) or 0
+    rows = db.session.execute(stmt).all()
+    more = limit is not None and len(rows) > limit
+    rows = rows[:limit] if limit is not None else rows
+
+    matches = []
+    for row in rows:
+        item = dict(zip(fields, row[1:]))
+        for key in ('red_teams', 'blue_teams'):
+            if key in item:
+                item[key] = split_teams(item[key])
+        matches.append(item)
+    return {
+        'matches': matches,
+        'next_cursor': rows[-1][0] if more else None,
+        'version': version,
+    }
 
 @app.route('/match/<int:match_id>/timer/start', methods=['POST'])
 def start_match_timer(match_id):
     # Optional: check match exists
-    match = get_by_id(Match, match_id)
+    match = DB_POOL.run('match_header', match_header, match_id)
     if not match:
         return jsonify({'error': 'Match not found'}), 404
 
     data = request.json or {}
     duration = int(data.get('duration', 150))  # seconds
     # If already running, just re-broadcast current (idempotent)
-    st = get_timer_state(match_id)
-    if st.get('running'):
-        payload = {
-            'match_id': match_id,
-            'start_ms': st['start_ms'],
-            'duration': st['duration'],
-            'server_now_ms': now_ms(),
-        }
-        socketio.emit('match_timer_started', payload)
-        return jsonify({'message': 'Timer already running', **payload}), 200
-
-    start = now_ms()
-    MATCH_TIMERS[match_id] = {'start_ms': start, 'duration': duration, 'running': True}
+    st, started = TIMER_STORE.start_if_idle(match_id, now_ms(), duration)
 
     payload = {
         'match_id': match_id,
-        'start_ms': start,
-        'duration': duration,
+        'start_ms': st['start_ms'],
+        'duration': st['duration'],
         'server_now_ms': now_ms(),
     }
-    socketio.emit('match_timer_started', payload)
-    return jsonify({'message': 'Timer started', **payload}), 200
+    socketio.emit('match_timer_started', payload, to=[match_room(match_id), arena_room(match.arena)])
+    message = 'Timer started' if started else 'Timer already running'
+    return jsonify({'message': message, **payload}), 200
 
 
 @app.route('/match/<int:match_id>/timer/reset', methods=['POST'])
 def reset_match_timer(match_id):
     # Optional: check match exists
-    match = get_by_id(Match, match_id)
+    match = DB_POOL.run('match_header', match_header, match_id)
     if not match:
         return jsonify({'error': 'Match not found'}), 404
 
     # Clear state (or mark not running)
-    MATCH_TIMERS.pop(match_id, None)
+    TIMER_STORE.reset(match_id)
     payload = {'match_id': match_id, 'server_now_ms': now_ms()}
-    socketio.emit('match_timer_reset', payload)
+    socketio.emit('match_timer_reset', payload, to=[match_room(match_id), arena_room(match.arena)])
     return jsonify({'message': 'Timer reset', **payload}), 200
 
 
@@ -275,24 +1398,194 @@ def timer_state(match_id):
 
 
 # -----------------------------
-# Golden points helpers
+# Scoring rules (versioned point table)
 # -----------------------------
-def golden_points_from_grid(grid):
-    """
+# Counted fields score count * points; alliance charge earns
+# supercharge_bonus extra per charge in supercharge mode; a golden column of
+# height h scores sum_{k<h} (golden_base + golden_step * k). Penalties are
+# negative. New versions are added through /rules; 'flask rescore' previews
+# or applies a version against every stored score.
+SCORED_COUNTS = ('alliance_charge', 'captured_charge', 'full_parking', 'partial_parking',
+                 'docked', 'engaged', 'minor_penalties', 'major_penalties')
+ENDGAME_COUNTS = ('full_parking', 'partial_parking', 'docked', 'engaged')
+PENALTY_COUNTS = ('minor_penalties', 'major_penalties')
+
+DEFAULT_SCORING_RULES = {
+    'alliance_charge': 5,
+    'supercharge_bonus': 1,
+    'captured_charge': 10,
+    'full_parking': 10,
+    'partial_parking': 5,
+    'docked': 15,
+    'engaged': 10,
+    'minor_penalties': -5,
+    'major_penalties': -15,
+    'golden_base': 10,
+    'golden_step': 5,
+}
+
+# Active rule version, cached in-process; load_scoring_rules() refreshes it
+ACTIVE_RULES = {'version': 1, 'points': dict(DEFAULT_SCORING_RULES)}
+
+
+def active_rules() -> dict:
+    return ACTIVE_RULES['points']
+
+
+def load_scoring_rules():
+    """Seed version 1 on a fresh DB and cache the active version."""
+    if not db.session.scalar(db.select(db.func.count(ScoringRuleSet.id))):
+        db.session.add(ScoringRuleSet(version=1, points=json.dumps(DEFAULT_SCORING_RULES),
+                                      note='initial game manual', active=True, created_ms=now_ms()))
+        db.session.commit()
+    rs = ScoringRuleSet.query.filter_by(active=True).order_by(ScoringRuleSet.version.desc()).first()
+    if rs:
+        ACTIVE_RULES['version'] = rs.version
+        ACTIVE_RULES['points'] = {**DEFAULT_SCORING_RULES, **json.loads(rs.points)}
+
+
+def rules_for_version(version: int) -> dict | None:
+    rs = ScoringRuleSet.query.filter_by(version=version).first()
+    return {**DEFAULT_SCORING_RULES, **json.loads(rs.points)} if rs else None
+
+
+def apply_rules(version: int):
+    """
+    Make version the active rule set and re-derive every total, result, team
+    stat and standing from it (runs on DB_POOL).
+    Returns (match_ids, team_numbers), or None when the version doesn't exist.
+    """
+    if not ScoringRuleSet.query.filter_by(version=version).first():
+        return None
+    ScoringRuleSet.query.update({ScoringRuleSet.active: ScoringRuleSet.version == version})
+    db.session.commit()
+    load_scoring_rules()
+    return rescore_event()
+
+
+def rescore_event():
+    """
+    Re-derive the current event's totals, results, team stats and standings under
+    the active rules and stamp its database with that version (caller is on DB_POOL).
+    Returns (match_ids, team_numbers).
+    """
+    recompute_score_totals()
+    refresh_match_results()
+    teams = list(db.session.scalars(db.select(MatchParticipant.team_number).distinct()))
+    rebuild_team_tables()
+    counter = ChangeCounter.__table__
+    db.session.execute(sqlite_insert(counter).values(name='rules', value=ACTIVE_RULES['version'])
+                       .on_conflict_do_update(index_elements=['name'], set_={'value': ACTIVE_RULES['version']}))
+    db.session.commit()
+    return list(db.session.scalars(db.select(Match.id))), teams
+
+
+def rescore_event_if_stale(code: str):
+    """
+    Rescore event `code` when its totals were computed under another rule version
+    (rules were activated while a different event was active). Runs on DB_POOL;
+    returns rescore_event()'s result, or None when the event is current.
+    """
+    g.nrl_event = EVENTS['by_code'][code]
+    scored = db.session.scalar(db.select(ChangeCounter.value).where(ChangeCounter.name == 'rules'))
+    if scored == ACTIVE_RULES['version']:
+        return None
+    return rescore_event()
+
+
+def activate_rules(version: int) -> bool:
+    changed = DB_POOL.run('activate_rules', apply_rules, version)
+    if changed is None:
+        return False
+    match_ids, teams = changed
+    publish_app_sync('rules')
+    bump_version('schedule', 'results', 'teams', 'team_stats',
+                 *(f'match:{m}' for m in match_ids), *(f'team:{t}' for t in teams))
+    refresh_rankings()
+    schedule_snapshot(everything=True)
+    return True
+
+
+@app.route('/rules', methods=['GET'])
+def list_scoring_rules():
+    return jsonify({
+        'active_version': ACTIVE_RULES['version'],
+        'versions': DB_POOL.run('rules', rule_set_list),
+    }), 200
+
+
+def rule_set_list() -> list:
+    """Every rule version, oldest first (runs on DB_POOL)."""
+    return [{
+        'version': rs.version, 'points': {**DEFAULT_SCORING_RULES, **json.loads(rs.points)},
+        'note': rs.note, 'active': rs.active, 'created_ms': rs.created_ms,
+    } for rs in ScoringRuleSet.query.order_by(ScoringRuleSet.version)]
+
+
+def add_rule_set(points: dict, note: str) -> int:
+    """Store an inactive rule version (runs on DB_POOL); returns its number."""
+    version = (db.session.scalar(db.select(db.func.max(ScoringRuleSet.version))) or 0) + 1
+    db.session.add(ScoringRuleSet(version=version, points=json.dumps(points), note=note,
+                                  active=False, created_ms=now_ms()))
+    db.session.commit()
+    return version
+
+
+@app.route('/rules', methods=['POST'])
+def add_scoring_rules():
+    """
+    Body: {"points": {rule_key: int, ...}, "note": "...", "activate": false}
+    Unspecified keys inherit from the currently active version.
+    """
+    data = request.json or {}
+    points = data.get('points') or {}
+    unknown = sorted(set(points) - set(DEFAULT_SCORING_RULES))
+    if unknown:
+        return jsonify({'error': f'Unknown rule keys: {", ".join(unknown)}'}), 400
+    try:
+        points = {**active_rules(), **{k: int(v) for k, v in points.items()}}
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Rule values must be integers'}), 400
+
+    version = DB_POOL.run('rules', add_rule_set, points, str(data.get('note', ''))[:200])
+    if data.get('activate'):
+        activate_rules(version)
+    return jsonify({'message': f'Rule version {version} created', 'version': version,
+                    'active_version': ACTIVE_RULES['version']}), 201
+
+
+@app.route('/rules/<int:version>/activate', methods=['POST'])
+def activate_scoring_rules(version):
+    if not activate_rules(version):
+        return jsonify({'error': 'Rule version not found'}), 404
+    return jsonify({'message': f'Rule version {version} is now active'}), 200
+
+
+# -----------------------------
+# Golden points helpers
+# -----------------------------
+# Canonical storage is one height per column ("rows:heights", each height a
+# single char '0' + h), e.g. a 4x4 grid with columns of 0,2,1,3 -> "4:0213".
+# Only the contiguous stack from the bottom scores, so this is lossless for
+# every grid the scoring tablet can produce.
+GOLDEN_HEIGHT_BASE = ord('0')
+GOLDEN_MAX_ROWS = 78  # keeps every height char printable ASCII
+GOLDEN_MAX_COLS = 125  # "78:" plus one char per column fits ScoreEntry.golden_heights
+
+
+def golden_heights_from_grid(grid):
+    """
     grid: list[list[bool]] top->bottom (row 0 is top, last row is bottom)
-    Rule per column:
-      - You can only stack contiguously from the bottom.
-      - Points for height h in a column: sum_{k=0}^{h-1} (10 + 5*k)
+    Returns the contiguous-from-bottom height of each column.
     """
     if not isinstance(grid, list):
-        return 0
+        return []
 
     rows = len(grid)
-    cols = len(grid[0]) if rows else 0
-    total = 0
+    cols = len(grid[0]) if rows and isinstance(grid[0], list) else 0
+    heights = []
 
     for c in range(cols):
-        # contiguous height from bottom
         h = 0
         for r in range(rows - 1, -1, -1):
             try:
@@ -303,9 +1596,121 @@ def golden_points_from_grid(grid):
                 h += 1
             else:
                 break
-        total += 10 * h + 5 * (h * (h - 1) // 2)
+        heights.append(h)
+
+    return heights
+
+
+def golden_points_from_heights(heights, rules: dict | None = None) -> int:
+    """Points for height h in a column: sum_{k=0}^{h-1} (base + step*k), 10/5 by default."""
+    rules = rules or active_rules()
+    base, step = rules['golden_base'], rules['golden_step']
+    return sum(base * h + step * (h * (h - 1) // 2) for h in heights)
+
+
+def golden_points_from_grid(grid):
+    """
+    grid: list[list[bool]] top->bottom (row 0 is top, last row is bottom)
+    Rule per column:
+      - You can only stack contiguously from the bottom.
+      - Points for height h in a column: sum_{k=0}^{h-1} (10 + 5*k)
+    """
+    return golden_points_from_heights(golden_heights_from_grid(grid))
+
+
+def encode_golden_heights(grid) -> str:
+    """Grid (list or JSON text) -> canonical "rows:heights" string ('' if not a grid)."""
+    if isinstance(grid, str):
+        try:
+            grid = json.loads(grid) if grid else []
+        except ValueError:
+            return ''
+    if not isinstance(grid, list) or not grid or len(grid) > GOLDEN_MAX_ROWS:
+        return ''
+    heights = golden_heights_from_grid(grid)
+    return f"{len(grid)}:" + ''.join(chr(GOLDEN_HEIGHT_BASE + h) for h in heights)
+
+
+def decode_golden_heights(encoded: str | None):
+    """Canonical string -> (rows, [heights]); (0, []) when empty/invalid."""
+    if not encoded:
+        return 0, []
+    rows, _, packed = encoded.partition(':')
+    try:
+        return int(rows), [ord(ch) - GOLDEN_HEIGHT_BASE for ch in packed]
+    except ValueError:
+        return 0, []
+
+
+def golden_points_from_encoded(encoded: str | None) -> int:
+    return golden_points_from_heights(decode_golden_heights(encoded)[1])
+
+
+def validate_golden_grid(grid):
+    """Raise ValueError unless grid is a rectangular list of 0/1/bool rows within GOLDEN_MAX_ROWS x GOLDEN_MAX_COLS."""
+    if not isinstance(grid, list) or not all(isinstance(row, list) for row in grid):
+        raise ValueError('golden_charge_stack must be a grid: a list of rows of cells')
+    if len(grid) > GOLDEN_MAX_ROWS or (grid and len(grid[0]) > GOLDEN_MAX_COLS):
+        raise ValueError(f'golden_charge_stack is limited to {GOLDEN_MAX_ROWS} rows x {GOLDEN_MAX_COLS} columns')
+    if any(len(row) != len(grid[0]) for row in grid):
+        raise ValueError('golden_charge_stack rows must all be the same length')
+    if any(not isinstance(cell, (bool, int)) or cell not in (0, 1) for row in grid for cell in row):
+        raise ValueError('golden_charge_stack cells must be 0/1 or true/false')
+
+
+def normalize_golden_stack(raw):
+    """
+    Incoming golden_charge_stack (grid list or JSON text) -> (grid_text, encoded).
+    The submitted grid is stored as sent (lists as JSON text); encoded holds its
+    canonical heights. Raises ValueError for anything validate_golden_grid rejects.
+    """
+    if raw is None or raw == '':
+        return '', ''
+    grid = raw
+    if isinstance(raw, str):
+        try:
+            grid = json.loads(raw)
+        except ValueError:
+            raise ValueError('golden_charge_stack must be a grid or its JSON text')
+    validate_golden_grid(grid)
+    return (raw if isinstance(raw, str) else json.dumps(raw)), encode_golden_heights(grid)
+
+
+def golden_points_batch(encoded_stacks, rules: dict | None = None):
+    """
+    Golden points for many canonical stacks in one call.
+    Heights are packed into a (n, max_cols) uint8 matrix and scored with NumPy;
+    falls back to a plain loop when NumPy isn't installed. Returns a list of ints.
+    """
+    rules = rules or active_rules()
+    packed = [(e or '').partition(':')[2] for e in encoded_stacks]
+    if np is None:
+        return [golden_points_from_heights((ord(ch) - GOLDEN_HEIGHT_BASE for ch in p), rules) for p in packed]
+    if not packed:
+        return []
+
+    width = max(len(p) for p in packed) or 1
+    pad = chr(GOLDEN_HEIGHT_BASE)
+    buf = ''.join(p.ljust(width, pad) for p in packed).encode('ascii')
+    h = np.frombuffer(buf, dtype=np.uint8).reshape(len(packed), width).astype(np.int64) - GOLDEN_HEIGHT_BASE
+    return (rules['golden_base'] * h + rules['golden_step'] * (h * (h - 1) // 2)).sum(axis=1).tolist()
+
+
+def golden_points_for(score, rules: dict | None = None) -> int:
+    """Golden points of a ScoreEntry, preferring the canonical heights column."""
+    if score.golden_heights:
+        return golden_points_from_heights(decode_golden_heights(score.golden_heights)[1], rules)
+    return golden_points_from_heights(golden_heights_from_text(score.golden_charge_stack), rules)
+
+
+def golden_heights_from_text(grid_text: str | None) -> list:
+    if not grid_text:
+        return []
+    try:
+        return golden_heights_from_grid(json.loads(grid_text))
+    except Exception:
+        return []
 
-    return total
 
 def golden_points_from_text(grid_text: str | None) -> int:
     """Parse stored JSON text and compute golden points safely."""
@@ -318,51 +1723,69 @@ def golden_points_from_text(grid_text: str | None) -> int:
         return 0
 
 
-def calculate_total_from_payload(d: dict) -> int:
+def backfill_golden_heights(batch_size: int = 1000, everything: bool = False) -> int:
+    """
+    Fill golden_heights for rows written before the canonical encoding existed;
+    with everything, re-encode every stored grid and rewrite the ones that differ.
+    Returns the number of rows written.
+    """
+    stmt = (db.select(ScoreEntry.id, ScoreEntry.version, ScoreEntry.golden_charge_stack, ScoreEntry.golden_heights)
+            .where(ScoreEntry.golden_charge_stack.is_not(None), ScoreEntry.golden_charge_stack != ''))
+    if not everything:
+        stmt = stmt.where(db.or_(ScoreEntry.golden_heights.is_(None), ScoreEntry.golden_heights == ''))
+    updates = [{'id': r.id, 'version': r.version, 'golden_heights': encode_golden_heights(r.golden_charge_stack),
+                'was': r.golden_heights or ''} for r in db.session.execute(stmt)]
+    updates = [u for u in updates if u.pop('was') != u['golden_heights'] and (everything or u['golden_heights'])]
+    for batch in _chunks(updates, batch_size):
+        db.session.execute(db.update(ScoreEntry), batch)
+    db.session.commit()
+    return len(updates)
+
+
+def points_from_counts(counts: dict, supercharge: bool, golden_pts: int, rules: dict | None = None) -> int:
+    """Apply the rule table to {field: count} plus precomputed golden points."""
+    rules = rules or active_rules()
+    total = sum(counts[k] * rules[k] for k in SCORED_COUNTS)
+    if supercharge:
+        total += counts['alliance_charge'] * rules['supercharge_bonus']
+    return total + golden_pts
+
+
+def calculate_total_from_payload(d: dict, rules: dict | None = None) -> int:
     """Same scoring as calculate_total_score(), but from a plain dict (live/draft)."""
-    base_points = 5
-    supercharge_bonus = 1 if d.get('supercharge_mode') else 0
-
-    alliance_charge = int(d.get('alliance_charge', 0) or 0)
-    captured_charge = int(d.get('captured_charge', 0) or 0)
-    full_parking    = int(d.get('full_parking', 0) or 0)
-    partial_parking = int(d.get('partial_parking', 0) or 0)
-    docked          = int(d.get('docked', 0) or 0)
-    engaged         = int(d.get('engaged', 0) or 0)
-    minor_pen       = int(d.get('minor_penalties', 0) or 0)
-    major_pen       = int(d.get('major_penalties', 0) or 0)
+    counts = {k: int(d.get(k, 0) or 0) for k in SCORED_COUNTS}
 
     # golden: accept list (grid) or JSON string
     golden_raw = d.get('golden_charge_stack')
     if isinstance(golden_raw, str):
-        golden_pts = golden_points_from_text(golden_raw)
+        heights = golden_heights_from_text(golden_raw)
     else:
         try:
-            golden_pts = golden_points_from_grid(golden_raw or [])
+            heights = golden_heights_from_grid(golden_raw or [])
         except Exception:
-            golden_pts = 0
+            heights = []
 
-    total = 0
-    total += alliance_charge * (base_points + supercharge_bonus)
-    total += captured_charge * 10
-    total += full_parking * 10
-    total += partial_parking * 5
-    total += docked * 15
-    total += engaged * 10
-    total += golden_pts
-    total -= minor_pen * 5
-    total -= major_pen * 15
-    return total
+    return points_from_counts(counts, bool(d.get('supercharge_mode')),
+                              golden_points_from_heights(heights, rules), rules)
 
 
 # -----------------------------
 # Match details
 # -----------------------------
 @app.route('/match/<int:match_id>/details', methods=['GET'])
+@cached_response(lambda match_id: ('schedule', f'match:{match_id}'))
 def get_match_details(match_id):
+    body = DB_POOL.run('match_details', match_details, match_id)
+    if body is None:
+        return jsonify({'error': 'Match not found'}), 404
+    return jsonify(body), 200
+
+
+def match_details(match_id: int) -> dict | None:
+    """GET /match/<id>/details body (runs on DB_POOL), or None for an unknown match."""
     match = get_by_id(Match, match_id)
     if not match:
-        return jsonify({'error': 'Match not found'}), 404
+        return None
 
     red_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='red').first()
     blue_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='blue').first()
@@ -374,7 +1797,7 @@ def get_match_details(match_id):
             "alliance_charge": score.alliance_charge,
             "captured_charge": score.captured_charge,
             "golden_charge_stack": score.golden_charge_stack,
-            "golden_points": golden_points_from_text(score.golden_charge_stack),  # <-- NEW
+            "golden_points": score.golden_points,
             "minor_penalties": score.minor_penalties,
             "major_penalties": score.major_penalties,
             "full_parking": score.full_parking,
@@ -388,7 +1811,7 @@ def get_match_details(match_id):
             "confirmed_by": score.confirmed_by
         }
 
-    return jsonify({
+    return {
         "match_id": match.id,
         "match_number": match.match_number,
         "arena": match.arena,
@@ -397,74 +1820,118 @@ def get_match_details(match_id):
         "blue_teams": match.blue_teams.split(',') if match.blue_teams else [],
         "red_score": serialize_score(red_score),
         "blue_score": serialize_score(blue_score)
-    }), 200
+    }
 
 # -----------------------------
 # Scoring logic
 # -----------------------------
-def calculate_total_score(score):
-    base_points = 5
-    supercharge_bonus = 1 if getattr(score, 'supercharge_mode', False) else 0
+def calculate_total_score(score, rules: dict | None = None):
+    counts = {k: getattr(score, k) or 0 for k in SCORED_COUNTS}
+    return points_from_counts(counts, bool(getattr(score, 'supercharge_mode', False)),
+                              golden_points_for(score, rules), rules)
 
-    total = 0
-    total += (score.alliance_charge or 0) * (base_points + supercharge_bonus)
-    total += (score.captured_charge or 0) * 10
-    total += (score.full_parking or 0) * 10
-    total += (score.partial_parking or 0) * 5
-    total += (score.docked or 0) * 15
-    total += (score.engaged or 0) * 10
 
-    # Golden stack points
-    total += golden_points_from_text(score.golden_charge_stack)
+def store_score_totals(score: ScoreEntry, rules: dict | None = None):
+    """Refresh one entry's denormalized golden_points/total_score (call after every field change)."""
+    score.golden_points = golden_points_for(score, rules)
+    counts = {k: getattr(score, k) or 0 for k in SCORED_COUNTS}
+    score.total_score = points_from_counts(counts, bool(score.supercharge_mode), score.golden_points, rules)
 
-    total -= (score.minor_penalties or 0) * 5
-    total -= (score.major_penalties or 0) * 15
-    return total
 
-@app.route('/score/<int:match_id>/<alliance>', methods=['POST'])
-def submit_score(match_id, alliance):
-    if alliance not in ['red', 'blue']:
-        return jsonify({'error': 'Alliance must be red or blue'}), 400
+def result_winner(red_total: int, blue_total: int) -> str:
+    return 'red' if red_total > blue_total else 'blue' if blue_total > red_total else 'tie'
 
-    match = get_by_id(Match, match_id)
-    if not match:
-        return jsonify({'error': 'Match not found'}), 404
 
-    data = request.json or {}
+def refresh_match_results(match_ids=None):
+    """Copy stored alliance totals onto Match.red_total/blue_total/winner (all matches by default; caller commits)."""
+    stmt = db.select(ScoreEntry.match_id, ScoreEntry.alliance, ScoreEntry.total_score, ScoreEntry.finalised)
+    if match_ids is not None:
+        stmt = stmt.where(ScoreEntry.match_id.in_(match_ids))
+    sides = {}
+    for match_id, alliance, total, finalised in db.session.execute(stmt):
+        sides.setdefault(match_id, {})[alliance] = (total, bool(finalised))
+    updates, completed = [], []
+    change_seq = next_change_seq()
+    for match_id, side in sides.items():
+        red, blue = side.get('red'), side.get('blue')
+        decided = red and blue and red[1] and blue[1]
+        updates.append({'id': match_id, 'red_total': red and red[0], 'blue_total': blue and blue[0],
+                        'winner': result_winner(red[0], blue[0]) if decided else None,
+                        'updated_seq': change_seq})
+        if decided:
+            completed.append(match_id)
+    for batch in _chunks(updates, UPLOAD_BATCH_SIZE):
+        db.session.execute(db.update(Match), batch)
+    # A match is completed once both alliances are finalised
+    for batch in _chunks(completed, UPLOAD_BATCH_SIZE):
+        db.session.execute(db.update(Match).where(Match.id.in_(batch)).values(status='completed'))
 
-    score = ScoreEntry.query.filter_by(match_id=match_id, alliance=alliance).first()
-    if not score:
-        score = ScoreEntry(match_id=match_id, alliance=alliance)
 
-    # Assign with defaults
-    score.alliance_charge      = int(data.get('alliance_charge', score.alliance_charge or 0))
-    score.captured_charge      = int(data.get('captured_charge', score.captured_charge or 0))
-    score.golden_charge_stack  = data.get('golden_charge_stack', score.golden_charge_stack or '')
-    score.minor_penalties      = int(data.get('minor_penalties', score.minor_penalties or 0))
-    score.major_penalties      = int(data.get('major_penalties', score.major_penalties or 0))
-    score.full_parking         = int(data.get('full_parking', score.full_parking or 0))
-    score.partial_parking      = int(data.get('partial_parking', score.partial_parking or 0))
-    score.docked               = int(data.get('docked', score.docked or 0))
-    score.engaged              = int(data.get('engaged', score.engaged or 0))
-    score.supercharge_mode     = bool(data.get('supercharge_mode', score.supercharge_mode or False))
-    score.supercharge_end_time = data.get('supercharge_end_time', score.supercharge_end_time or '')
-    score.submitted_by         = data.get('submitted_by', score.submitted_by)
+def recompute_score_totals(rules: dict | None = None) -> int:
+    """Re-derive every stored total in one vectorized pass (backfill, rule activation; caller commits)."""
+    rules = rules or active_rules()
+    columns = load_score_columns()
+    totals = score_totals_batch(columns, rules)
+    golden = golden_points_batch(columns['golden_heights'], rules)
+    # Core UPDATE: derived columns, so the entry's optimistic version is left alone
+    table = ScoreEntry.__table__
+    stmt = (table.update()
+            .where(table.c.match_id == db.bindparam('b_match_id'), table.c.alliance == db.bindparam('b_alliance'))
+            .values(total_score=db.bindparam('b_total'), golden_points=db.bindparam('b_golden')))
+    rows = [{'b_match_id': m, 'b_alliance': a, 'b_total': int(t), 'b_golden': int(g)}
+            for m, a, t, g in zip(columns['match_id'], columns['alliance'], totals, golden)]
+    for batch in _chunks(rows, UPLOAD_BATCH_SIZE):
+        db.session.execute(stmt, batch)
+    return len(rows)
 
-    db.session.add(score)
+
+def backfill_score_totals():
+    """Fill the denormalized totals for databases created before they existed."""
+    if db.session.scalar(db.select(ScoreEntry.id).where(ScoreEntry.total_score.is_(None)).limit(1)) is None:
+        return
+    recompute_score_totals()
+    refresh_match_results()
     db.session.commit()
 
-    total_score = calculate_total_score(score)
-    golden_pts = golden_points_from_text(score.golden_charge_stack)  # <-- NEW
 
-    # Live emit (include golden_points)
-    socketio.emit('score_update', {
-        'match_id': match_id,
-        'alliance': alliance,
+def backfill_match_status():
+    """Mark decided matches completed in databases from before finalising set the status."""
+    db.session.execute(db.update(Match).where(Match.winner.is_not(None), Match.status != 'completed')
+                       .values(status='completed'))
+    db.session.commit()
+
+SCORE_INT_FIELDS = ('alliance_charge', 'captured_charge', 'minor_penalties', 'major_penalties',
+                    'full_parking', 'partial_parking', 'docked', 'engaged')
+
+
+def parse_score_payload(data: dict) -> dict:
+    """Coerce the fields present in a /score body; raises ValueError on bad input."""
+    fields = {}
+    for key in SCORE_INT_FIELDS:
+        if key in data:
+            try:
+                fields[key] = int(data[key])
+            except (TypeError, ValueError):
+                raise ValueError(f'Invalid value for {key}: {data[key]!r}')
+    if 'golden_charge_stack' in data:
+        fields['golden_charge_stack'], fields['golden_heights'] = normalize_golden_stack(data['golden_charge_stack'])
+    if 'supercharge_mode' in data:
+        fields['supercharge_mode'] = bool(data['supercharge_mode'])
+    if 'supercharge_end_time' in data:
+        fields['supercharge_end_time'] = data['supercharge_end_time']
+    if 'submitted_by' in data:
+        fields['submitted_by'] = data['submitted_by']
+    return fields
+
+
+def score_snapshot(score: ScoreEntry) -> dict:
+    """Broadcast/response view of a ScoreEntry, taken before commit expires it."""
+    return {
         'score_breakdown': {
             'alliance_charge': score.alliance_charge,
             'captured_charge': score.captured_charge,
             'golden_charge_stack': score.golden_charge_stack,
-            'golden_points': golden_pts,  # <-- NEW
+            'golden_points': score.golden_points,
             'minor_penalties': score.minor_penalties,
             'major_penalties': score.major_penalties,
             'full_parking': score.full_parking,
@@ -473,92 +1940,416 @@ def submit_score(match_id, alliance):
             'engaged': score.engaged,
             'supercharge_mode': score.supercharge_mode
         },
-        'total_score': total_score,
-        'finalised': score.finalised
-    })
+        'total_score': score.total_score,
+        'finalised': bool(score.finalised),
+        'version': score.version,
+    }
+
+
+def empty_score_snapshot() -> dict:
+    """Snapshot of an alliance nobody has scored yet (version 0)."""
+    return score_snapshot(ScoreEntry(**empty_score_state(), version=0, total_score=0, golden_points=0))
+
+
+def current_score_snapshot(match_id: int, alliance: str) -> dict:
+    score = ScoreEntry.query.filter_by(match_id=match_id, alliance=alliance).first()
+    return score_snapshot(score) if score else empty_score_snapshot()
+
+
+def current_match_snapshots(match_id: int) -> dict:
+    return {alliance: current_score_snapshot(match_id, alliance) for alliance in ('red', 'blue')}
+
+
+class ScoreConflict(Exception):
+    """A submission was based on an older version of the ScoreEntry; carries the current snapshot."""
+
+    def __init__(self, current: dict):
+        super().__init__('Score was changed by another submission')
+        self.current = current
+
+
+def parse_score_preconditions(data: dict, headers) -> tuple:
+    """(expected_version, idempotency_key) from the body or If-Match / Idempotency-Key headers."""
+    version = data.get('version', headers.get('If-Match'))
+    if version is not None:
+        try:
+            version = int(str(version).strip('"'))
+        except ValueError:
+            raise ValueError(f'Invalid version: {version!r}')
+    key = data.get('idempotency_key') or headers.get('Idempotency-Key') or None
+    if key is not None and len(str(key)) > 64:
+        raise ValueError('idempotency_key must be at most 64 characters')
+    return version, key and str(key)
+
+
+def score_changes(score: ScoreEntry, fields: dict) -> dict:
+    """The subset of fields that would change the stored entry."""
+    current = {
+        **{k: getattr(score, k) or 0 for k in SCORE_INT_FIELDS},
+        'golden_charge_stack': score.golden_charge_stack or '',
+        'golden_heights': score.golden_heights or '',
+        'supercharge_mode': bool(score.supercharge_mode),
+        'supercharge_end_time': score.supercharge_end_time or '',
+        'submitted_by': score.submitted_by,
+    }
+    return {k: v for k, v in fields.items() if current[k] != v}
+
+
+def apply_score_payload(match_id: int, alliance: str, fields: dict,
+                        expected_version: int | None = None, idempotency_key: str | None = None) -> tuple:
+    """
+    Upsert one alliance's ScoreEntry in the current session (no commit).
+    Returns (snapshot, changed). Replays of the last idempotency key and
+    payloads identical to the stored entry write nothing; a stale
+    expected_version raises ScoreConflict.
+    """
+    score = ScoreEntry.query.filter_by(match_id=match_id, alliance=alliance).first()
+    if score:
+        if idempotency_key and score.idempotency_key == idempotency_key:
+            return score_snapshot(score), False
+        if not score_changes(score, fields):
+            return score_snapshot(score), False
+        if expected_version is not None and expected_version != score.version:
+            raise ScoreConflict(score_snapshot(score))
+        # Editing a decided match: take its old contribution back before the change
+        decided = score.finalised and bool(apply_match_deltas(match_id, -1))
+    else:
+        decided = False
+        if expected_version:
+            raise ScoreConflict(empty_score_snapshot())
+        score = ScoreEntry(match_id=match_id, alliance=alliance)
+
+    # Assign with defaults
+    for key in SCORE_INT_FIELDS:
+        setattr(score, key, fields.get(key, getattr(score, key) or 0))
+    if 'golden_charge_stack' in fields:
+        score.golden_charge_stack = fields['golden_charge_stack']
+        score.golden_heights = fields['golden_heights']
+    score.supercharge_mode     = fields.get('supercharge_mode', score.supercharge_mode or False)
+    score.supercharge_end_time = fields.get('supercharge_end_time', score.supercharge_end_time or '')
+    score.submitted_by         = fields.get('submitted_by', score.submitted_by)
+    score.idempotency_key      = idempotency_key or ''
+    store_score_totals(score)
+
+    db.session.add(score)
+    journal_event(match_id, alliance, 'submit', fields, actor=fields.get('submitted_by'))
+    db.session.flush()  # conditional UPDATE on version; raises StaleDataError if we lost a race
+    if decided:
+        apply_match_deltas(match_id, 1)
+    refresh_match_results([match_id])
+    if score.version % app.config['JOURNAL_CHECKPOINT_EVERY'] == 0:
+        write_journal_checkpoint(match_id)
+    return score_snapshot(score), True
+
+
+class ScoreWriter:
+    """
+    Group commit for score submissions. Request handlers enqueue a job and
+    wait; one background task drains everything queued (optionally waiting
+    SCORE_GROUP_COMMIT_MS for stragglers) into a single transaction and wakes
+    each waiter only after that commit returns. If a batch fails to commit, its jobs are
+    retried one by one so a single bad write can't fail its neighbours. Each
+    job keeps the event it was queued for, so a batch never spans event
+    databases and an activation in between doesn't redirect queued writes.
+    """
+
+    def __init__(self):
+        self.queue = None
+        self.batches = 0
+        self.jobs = 0
+
+    def submit(self, fn):
+        eio = socketio.server.eio
+        if self.queue is None:
+            self.queue = eio.create_queue()
+            socketio.start_background_task(self._run)
+        job = {'fn': fn, 'event': current_event(), 'done': eio.create_event(), 'result': None, 'error': None}
+        self.queue.put(job)
+        job['done'].wait()
+        if job['error'] is not None:
+            raise job['error']
+        return job['result']
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        empty = socketio.server.eio.get_queue_empty_exception()
+        deadline = time.monotonic() + app.config['SCORE_GROUP_COMMIT_MS'] / 1000.0
+        while len(batch) < app.config['SCORE_GROUP_MAX_BATCH']:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            by_event = {}
+            for job in batch:
+                by_event.setdefault(job['event'] and job['event'].code, []).append(job)
+            for jobs in by_event.values():
+                try:
+                    with app.app_context():
+                        g.nrl_event = jobs[0]['event']
+                        DB_POOL.run('score_batch', self._write, jobs)
+                except Exception as e:
+                    for job in jobs:
+                        job['error'] = job['error'] or e
+            for job in batch:
+                job['done'].set()
+
+    def _write(self, batch):
+        try:
+            self._commit(batch)
+        except Exception:
+            db.session.rollback()
+            for job in batch:
+                try:
+                    self._commit([job])
+                except Exception as e:
+                    db.session.rollback()
+                    job['error'] = e
+
+    def _commit(self, batch):
+        results = [job['fn']() for job in batch]
+        db.session.commit()
+        for job, result in zip(batch, results):
+            job['result'] = result
+        self.batches += 1
+        self.jobs += len(batch)
+
+
+SCORE_WRITER = ScoreWriter()
+
+
+def write_score(match_id: int, alliance: str, fields: dict, *preconditions) -> tuple:
+    """Persist a score submission; returns (snapshot, changed) once durable."""
+    if app.config['SCORE_WRITE_MODE'] == 'group':
+        # Hand our pooled connection back before waiting, or enough waiting
+        # requests can starve the writer of connections. Loaded objects stay usable.
+        db.session.close()
+        return SCORE_WRITER.submit(lambda: apply_score_payload(match_id, alliance, fields, *preconditions))
+    return DB_POOL.run('score_direct', apply_score_and_commit, match_id, alliance, fields, *preconditions)
+
+
+def apply_score_and_commit(match_id: int, alliance: str, fields: dict, *preconditions) -> tuple:
+    result = apply_score_payload(match_id, alliance, fields, *preconditions)
+    db.session.commit()
+    return result
+
+
+@app.route('/score/<int:match_id>/<alliance>', methods=['POST'])
+def submit_score(match_id, alliance):
+    if alliance not in ['red', 'blue']:
+        return jsonify({'error': 'Alliance must be red or blue'}), 400
+
+    match = DB_POOL.run('match_header', match_header, match_id)
+    if not match:
+        return jsonify({'error': 'Match not found'}), 404
+
+    data = request.json or {}
+    try:
+        fields = parse_score_payload(data)
+        preconditions = parse_score_preconditions(data, request.headers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        snapshot, changed = write_score(match_id, alliance, fields, *preconditions)
+    except ScoreConflict as e:
+        return jsonify({'error': str(e), 'current': e.current}), 409
+    except StaleDataError:
+        current = DB_POOL.run('score_current', current_score_snapshot, match_id, alliance)
+        return jsonify({'error': 'Score was changed by another submission', 'current': current}), 409
+
+    total_score = snapshot['total_score']
+    if not changed:
+        # Retry or identical resubmission: nothing written, nothing broadcast
+        return jsonify({
+            'message': f'{alliance.title()} alliance score unchanged.',
+            'total_score': total_score,
+            'version': snapshot['version'],
+            'unchanged': True,
+        }), 200
+    bump_version(f'match:{match_id}', 'results')
+    schedule_snapshot(match_id)
+
+    if snapshot['finalised']:
+        # Edit of a finalised score: apply_score_payload already moved team stats and standings
+        on_team_stats_changed(match_team_numbers(match))
+        refresh_rankings()
+
+    if not snapshot['finalised']:
+        record_live_alliance(match_id, alliance, snapshot['score_breakdown'], total_score, 'submit')
+
+    # Live emit (include golden_points)
+    socketio.emit('score_update', {
+        'match_id': match_id,
+        'alliance': alliance,
+        **snapshot,
+    }, to=match_room(match_id))
+    socketio.emit('scoreboard_update', compact_score(match, alliance, total_score, snapshot['finalised']),
+                  to=[arena_room(match.arena), EVENT_ROOM])
 
     return jsonify({
         'message': f'{alliance.title()} alliance score submitted successfully.',
-        'total_score': total_score
+        'total_score': total_score,
+        'version': snapshot['version'],
     }), 200
 
-@app.route('/finalise_score', methods=['POST'])
-def finalise_score():
-    data = request.json or {}
-    match_id = data.get('match_id')
-    confirmed_by = data.get('confirmed_by')
+def parse_finalise_preconditions(data: dict, headers) -> tuple:
+    """
+    ({alliance: expected_version}, idempotency_key) for /finalise_score.
+    Versions come from "versions": {"red": n, "blue": m} or If-Match: "<red>", "<blue>";
+    each is checked like /score's, and the idempotency key is read the same way.
+    """
+    versions = data.get('versions')
+    if versions is None and headers.get('If-Match'):
+        tags = [tag.strip() for tag in headers['If-Match'].split(',')]
+        if len(tags) != 2:
+            raise ValueError('If-Match must list the red and blue versions')
+        versions = dict(zip(('red', 'blue'), tags))
+    if versions is not None and not isinstance(versions, dict):
+        raise ValueError('versions must be an object like {"red": 3, "blue": 2}')
+    expected = {
+        alliance: parse_score_preconditions({'version': versions[alliance]}, {})[0]
+        for alliance in ('red', 'blue') if versions and versions.get(alliance) is not None
+    }
+    _, key = parse_score_preconditions({'idempotency_key': data.get('idempotency_key')},
+                                       {'Idempotency-Key': headers.get('Idempotency-Key')})
+    return expected, key
 
-    if not match_id or not confirmed_by:
-        return jsonify({'error': 'match_id and confirmed_by are required'}), 400
 
+def finalise_match(match_id: int, confirmed_by, expected: dict | None = None,
+                   idempotency_key: str | None = None) -> tuple:
+    """
+    Finalise both alliances in one transaction (runs on DB_POOL). Returns (result, (error, status)).
+    A stale expected version raises ScoreConflict; a replay of the finalising idempotency key
+    returns the result again with 'unchanged' set.
+    """
     match = get_by_id(Match, match_id)
     if not match:
-        return jsonify({'error': 'Match not found'}), 404
+        return None, ('Match not found', 404)
 
     red_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='red').first()
     blue_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='blue').first()
 
     if not red_score or not blue_score:
-        return jsonify({'error': 'Scores for both alliances must be submitted before finalisation'}), 400
+        return None, ('Scores for both alliances must be submitted before finalisation', 400)
 
     if red_score.finalised or blue_score.finalised:
-        return jsonify({'error': 'Score already finalised'}), 400
+        if (idempotency_key and red_score.finalised and blue_score.finalised
+                and red_score.idempotency_key == blue_score.idempotency_key == idempotency_key):
+            return {'match_number': match.match_number, 'arena': match.arena, 'unchanged': True,
+                    'red_total': red_score.total_score, 'blue_total': blue_score.total_score,
+                    'teams': match_team_numbers(match)}, None
+        return None, ('Score already finalised', 400)
+
+    for score in (red_score, blue_score):
+        if (expected or {}).get(score.alliance, score.version) != score.version:
+            raise ScoreConflict(current_match_snapshots(match_id))
 
     red_score.finalised = True
     blue_score.finalised = True
     red_score.confirmed_by = confirmed_by
     blue_score.confirmed_by = confirmed_by
-
+    red_score.idempotency_key = blue_score.idempotency_key = idempotency_key or ''
+    for alliance in ('red', 'blue'):
+        journal_event(match.id, alliance, 'finalise', {'finalised': True, 'confirmed_by': confirmed_by},
+                      actor=confirmed_by)
+    db.session.flush()
+    teams = match_team_numbers(match)
+    apply_match_deltas(match_id, 1)
+    result = {
+        'match_number': match.match_number,
+        'arena': match.arena,
+        'red_total': red_score.total_score,
+        'blue_total': blue_score.total_score,
+        'teams': teams,
+    }
+    refresh_match_results([match_id])
+    write_journal_checkpoint(match_id)
     db.session.commit()
+    return result, None
+
+
+@app.route('/finalise_score', methods=['POST'])
+def finalise_score():
+    data = request.json or {}
+    match_id = data.get('match_id')
+    confirmed_by = data.get('confirmed_by')
+
+    if not match_id or not confirmed_by:
+        return jsonify({'error': 'match_id and confirmed_by are required'}), 400
+    try:
+        expected, idempotency_key = parse_finalise_preconditions(data, request.headers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        result, error = DB_POOL.run('finalise_score', finalise_match, match_id, confirmed_by,
+                                    expected, idempotency_key)
+    except ScoreConflict as e:
+        return jsonify({'error': str(e), 'current': e.current}), 409
+    except StaleDataError:
+        # A submission landed between our read and the finalising UPDATE
+        current = DB_POOL.run('score_current', current_match_snapshots, match_id)
+        return jsonify({'error': 'Score was changed by another submission', 'current': current}), 409
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+    if result.get('unchanged'):
+        # Retry of a finalise that already went through: nothing written, nothing broadcast
+        return jsonify({'message': f'Match {match_id} scores already finalised.', 'unchanged': True}), 200
+
+    bump_version(f'match:{match_id}', 'results')
+    schedule_snapshot(match_id)
+    on_team_stats_changed(result['teams'])
 
-    # Optional: broadcast a "final" event
+    # Final result goes to the match, its arena and the event-wide feed
     socketio.emit('match_finalised', {
         'match_id': match_id,
-        'red_total': calculate_total_score(red_score),
-        'blue_total': calculate_total_score(blue_score),
+        'match_number': result['match_number'],
+        'arena': result['arena'],
+        'red_total': result['red_total'],
+        'blue_total': result['blue_total'],
         'confirmed_by': confirmed_by
-    })
+    }, to=[match_room(match_id), arena_room(result['arena']), EVENT_ROOM])
+    drop_live_channels(match_id)
+    refresh_rankings()
 
     return jsonify({'message': f'Match {match_id} scores finalised by Head Referee ID {confirmed_by}.'}), 200
 
-@app.route('/match/<int:match_id>/summary', methods=['GET'])
-def match_summary(match_id):
-    match = get_by_id(Match, match_id)
-    if not match:
-        return jsonify({'error': 'Match not found'}), 404
-
-    red_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='red').first()
-    blue_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='blue').first()
-
-    def serialize(score: ScoreEntry | None):
-        if not score:
-            return {
-                "score_breakdown": {},
-                "total_score": 0,
-                "finalised": False
-            }
-        golden_pts = golden_points_from_text(score.golden_charge_stack)  # <-- NEW
+def serialize_summary_score(score: ScoreEntry | None) -> dict:
+    if not score:
         return {
-            "score_breakdown": {
-                "alliance_charge": score.alliance_charge,
-                "captured_charge": score.captured_charge,
-                "golden_charge_stack": score.golden_charge_stack,
-                "golden_points": golden_pts,  # <-- NEW
-                "minor_penalties": score.minor_penalties,
-                "major_penalties": score.major_penalties,
-                "full_parking": score.full_parking,
-                "partial_parking": score.partial_parking,
-                "docked": score.docked,
-                "engaged": score.engaged,
-                "supercharge_mode": score.supercharge_mode
-            },
-            "total_score": calculate_total_score(score),
-            "finalised": score.finalised,
-            "confirmed_by": score.confirmed_by
+            "score_breakdown": {},
+            "total_score": 0,
+            "finalised": False
         }
-
-    return jsonify({
-        "match_id": match.id,
+    golden_pts = score.golden_points
+    return {
+        "score_breakdown": {
+            "alliance_charge": score.alliance_charge,
+            "captured_charge": score.captured_charge,
+            "golden_charge_stack": score.golden_charge_stack,
+            "golden_points": golden_pts,  # <-- NEW
+            "minor_penalties": score.minor_penalties,
+            "major_penalties": score.major_penalties,
+            "full_parking": score.full_parking,
+            "partial_parking": score.partial_parking,
+            "docked": score.docked,
+            "engaged": score.engaged,
+            "supercharge_mode": score.supercharge_mode
+        },
+        "total_score": score.total_score,
+        "finalised": score.finalised,
+        "confirmed_by": score.confirmed_by
+    }
+
+def match_summary_dict(match: Match, red_score: ScoreEntry | None, blue_score: ScoreEntry | None) -> dict:
+    return {
+        "match_id": match.id,
         "match_number": match.match_number,
         "arena": match.arena,
         "status": match.status,
@@ -567,10 +2358,562 @@ def match_summary(match_id):
             "blue": match.blue_teams.split(',') if match.blue_teams else []
         },
         "score": {
-            "red": serialize(red_score),
-            "blue": serialize(blue_score)
+            "red": serialize_summary_score(red_score),
+            "blue": serialize_summary_score(blue_score)
         }
-    }), 200
+    }
+
+@app.route('/match/<int:match_id>/summary', methods=['GET'])
+@cached_response(lambda match_id: ('schedule', f'match:{match_id}'))
+def match_summary(match_id):
+    body = DB_POOL.run('match_summary', match_summary_payload, match_id)
+    if body is None:
+        return jsonify({'error': 'Match not found'}), 404
+    return jsonify(body), 200
+
+
+def match_summary_payload(match_id: int) -> dict | None:
+    """One match's summary (runs on DB_POOL), or None for an unknown match."""
+    match = get_by_id(Match, match_id)
+    if not match:
+        return None
+
+    red_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='red').first()
+    blue_score = ScoreEntry.query.filter_by(match_id=match_id, alliance='blue').first()
+    return match_summary_dict(match, red_score, blue_score)
+
+# Rows fetched per DB_POOL job when streaming /matches/summary
+SUMMARY_YIELD_PER = 200
+
+def match_with_scores_query():
+    """SELECT match, red ScoreEntry, blue ScoreEntry (outer joined) in one statement."""
+    red = db.aliased(ScoreEntry)
+    blue = db.aliased(ScoreEntry)
+    return (
+        db.select(Match, red, blue)
+        .outerjoin(red, db.and_(red.match_id == Match.id, red.alliance == 'red'))
+        .outerjoin(blue, db.and_(blue.match_id == Match.id, blue.alliance == 'blue'))
+    )
+
+def parse_match_filters(args):
+    """
+    Shared query-string filters for multi-match reads:
+      ids=1,2,3        match ids
+      range=10-40      match_number range (inclusive)
+      arena=Alpha      arena name (case-insensitive)
+      status=pending   match status
+      team=1234        matches a team plays in
+    Returns (where_clauses, error).
+    """
+    clauses = []
+    try:
+        if args.get('ids'):
+            clauses.append(Match.id.in_([int(x) for x in args['ids'].split(',') if x.strip()]))
+        if args.get('range'):
+            lo, _, hi = args['range'].partition('-')
+            if lo.strip():
+                clauses.append(Match.match_number >= int(lo))
+            if hi.strip():
+                clauses.append(Match.match_number <= int(hi))
+    except ValueError:
+        return None, 'ids and range must be integers (ids=1,2,3 range=10-40)'
+    if args.get('arena'):
+        clauses.append(db.func.lower(Match.arena) == args['arena'].strip().lower())
+    if args.get('status'):
+        clauses.append(Match.status == args['status'])
+    if args.get('team'):
+        clauses.append(Match.id.in_(
+            db.select(MatchParticipant.match_id).where(MatchParticipant.team_number == args['team'].strip())
+        ))
+    return clauses, None
+
+@app.route('/matches/summary', methods=['GET'])
+def matches_summary():
+    """Summaries for many matches, same per-match shape as /match/<id>/summary, streamed."""
+    clauses, error = parse_match_filters(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    def generate():
+        yield '{"matches":['
+        seen = set()
+        after = None
+        while True:
+            chunk = DB_POOL.run('matches_summary', summary_chunk, clauses, after)
+            for summary in chunk:
+                if summary['match_id'] in seen:
+                    continue
+                yield (',' if seen else '') + json.dumps(summary)
+                seen.add(summary['match_id'])
+            if len(chunk) < SUMMARY_YIELD_PER:
+                break
+            after = chunk[-1]['match_number']
+        yield '],"count":%d}' % len(seen)
+
+    return Response(stream_with_context(generate()), mimetype='application/json'), 200
+
+
+def summary_chunk(clauses, after: int | None) -> list:
+    """Next SUMMARY_YIELD_PER summaries after match_number `after` (runs on DB_POOL)."""
+    stmt = match_with_scores_query().where(*clauses).order_by(Match.match_number).limit(SUMMARY_YIELD_PER)
+    if after is not None:
+        stmt = stmt.where(Match.match_number > after)
+    return [match_summary_dict(match, red_score, blue_score)
+            for match, red_score, blue_score in db.session.execute(stmt)]
+
+# -----------------------------
+# Score journal (append-only events, checkpoints, replay)
+# -----------------------------
+# Every submit, finalisation and periodic live draft is appended to
+# ScoreEvent inside the same transaction as the ScoreEntry update, so
+# ScoreEntry is a projection of the journal that can be rebuilt at any time
+# ('flask rebuild-scores'). ScoreEntry stays the write path: it carries the
+# optimistic version, idempotency key and totals every submit checks.
+# Checkpoints are per match, written when the match is finalised and every
+# JOURNAL_CHECKPOINT_EVERY submissions to one alliance, so a replay only
+# folds each match's tail.
+app.config.setdefault('JOURNAL_CHECKPOINT_EVERY', 50)
+app.config.setdefault('LIVE_DRAFT_JOURNAL_SECONDS', 5)
+
+SCORE_ENTRY_FIELDS = SCORE_INT_FIELDS + ('golden_charge_stack', 'golden_heights', 'supercharge_mode',
+                                         'supercharge_end_time', 'submitted_by', 'finalised', 'confirmed_by')
+
+
+def empty_score_state() -> dict:
+    return {**dict.fromkeys(SCORE_INT_FIELDS, 0), 'golden_charge_stack': '', 'golden_heights': '',
+            'supercharge_mode': False, 'supercharge_end_time': '', 'submitted_by': None,
+            'finalised': False, 'confirmed_by': None}
+
+
+def journal_event(match_id: int, alliance: str, kind: str, payload: dict, actor=None):
+    """Append one event to the current session (caller commits)."""
+    db.session.add(ScoreEvent(match_id=match_id, alliance=alliance, kind=kind,
+                              payload=json.dumps(payload, separators=(',', ':')),
+                              actor=actor if isinstance(actor, int) else None, created_ms=now_ms()))
+
+
+def fold_score_event(state: dict, match_id: int, alliance: str, kind: str, payload: dict):
+    """Apply one event to {match_id: {alliance: fields, alliance + '_draft': breakdown}}."""
+    match_state = state.setdefault(match_id, {})
+    if kind == 'draft':
+        match_state[f'{alliance}_draft'] = payload
+        return
+    entry = match_state.get(alliance)
+    if entry is None:
+        entry = match_state[alliance] = empty_score_state()
+    entry.update(payload)
+
+
+def _load_checkpoints(as_of_seq: int | None, match_id: int | None):
+    """Latest checkpoint per match at or before as_of_seq: {match_id: (seq, state)}."""
+    latest = (db.select(ScoreCheckpoint.match_id, db.func.max(ScoreCheckpoint.seq).label('seq'))
+              .where(ScoreCheckpoint.match_id.is_not(None)).group_by(ScoreCheckpoint.match_id))
+    if as_of_seq is not None:
+        latest = latest.where(ScoreCheckpoint.seq <= as_of_seq)
+    if match_id is not None:
+        latest = latest.where(ScoreCheckpoint.match_id == match_id)
+    latest = latest.subquery()
+    rows = db.session.execute(
+        db.select(ScoreCheckpoint.match_id, ScoreCheckpoint.seq, ScoreCheckpoint.state)
+        .join(latest, db.and_(ScoreCheckpoint.match_id == latest.c.match_id, ScoreCheckpoint.seq == latest.c.seq))
+    )
+    return {m_id: (seq, json.loads(state)) for m_id, seq, state in rows}
+
+
+def fold_journal(as_of_seq: int | None = None, match_id: int | None = None):
+    """
+    Folded journal state as of a sequence number (latest when None),
+    optionally for one match only. Returns (state, {match_id: last seq}).
+    """
+    checkpoints = _load_checkpoints(as_of_seq, match_id)
+    state = {m_id: cp_state for m_id, (_, cp_state) in checkpoints.items()}
+    seqs = {m_id: seq for m_id, (seq, _) in checkpoints.items()}
+
+    # Each match folds only the events after its own latest checkpoint
+    cp = db.aliased(ScoreCheckpoint)
+    covered = db.select(db.func.coalesce(db.func.max(cp.seq), 0)).where(cp.match_id == ScoreEvent.match_id)
+    if as_of_seq is not None:
+        covered = covered.where(cp.seq <= as_of_seq)
+    stmt = (db.select(ScoreEvent.id, ScoreEvent.match_id, ScoreEvent.alliance, ScoreEvent.kind, ScoreEvent.payload)
+            .where(ScoreEvent.id > covered.scalar_subquery()).order_by(ScoreEvent.id))
+    if as_of_seq is not None:
+        stmt = stmt.where(ScoreEvent.id <= as_of_seq)
+    if match_id is not None:
+        stmt = stmt.where(ScoreEvent.match_id == match_id)
+
+    loads = json.loads
+    for seq, m_id, alliance, kind, payload in db.session.execute(stmt):
+        fold_score_event(state, m_id, alliance, kind, loads(payload))
+        seqs[m_id] = seq
+    return state, seqs
+
+
+def journal_state(as_of_seq: int | None = None, match_id: int | None = None):
+    """fold_journal() with the highest folded sequence number: (state, last_seq)."""
+    state, seqs = fold_journal(as_of_seq, match_id)
+    return state, max(seqs.values(), default=0)
+
+
+def write_journal_checkpoint(match_id: int | None = None) -> int:
+    """Checkpoint one match (every match when None) at its latest event (caller commits); returns that seq."""
+    state, seqs = fold_journal(match_id=match_id)
+    have = set()
+    for batch in _chunks(list(seqs.values()), UPLOAD_BATCH_SIZE):
+        have.update(db.session.scalars(db.select(ScoreCheckpoint.seq).where(ScoreCheckpoint.seq.in_(batch))))
+    created = now_ms()
+    db.session.add_all(
+        ScoreCheckpoint(match_id=m_id, seq=seq, created_ms=created,
+                        state=json.dumps(state[m_id], separators=(',', ':')))
+        for m_id, seq in seqs.items() if seq not in have
+    )
+    return max(seqs.values(), default=0)
+
+
+def journal_draft(match_id: int, alliance: str, breakdown: dict):
+    """Record a live draft checkpoint (called from the live ticker via DB_POOL)."""
+    journal_event(match_id, alliance, 'draft', breakdown)
+    db.session.commit()
+
+
+def backfill_score_journal() -> int:
+    """Seed 'import' events for ScoreEntry rows written before the journal existed."""
+    journaled = db.select(ScoreEvent.id).where(ScoreEvent.match_id == ScoreEntry.match_id,
+                                               ScoreEvent.alliance == ScoreEntry.alliance)
+    # Whole-event checkpoints from before they were per match
+    db.session.execute(db.delete(ScoreCheckpoint).where(ScoreCheckpoint.match_id.is_(None)))
+    legacy = ScoreEntry.query.filter(~journaled.exists()).order_by(ScoreEntry.id).all()
+    for score in legacy:
+        journal_event(score.match_id, score.alliance, 'import',
+                      {k: getattr(score, k) for k in SCORE_ENTRY_FIELDS})
+    db.session.commit()
+    return len(legacy)
+
+
+@app.route('/match/<int:match_id>/state', methods=['GET'])
+def match_state_as_of(match_id):
+    """
+    Score state of a match rebuilt from the journal.
+    ?seq=<n> replays up to and including event n; ?events=1 also lists the events.
+    """
+    seq = request.args.get('seq', type=int)
+    return jsonify(DB_POOL.run('match_state', replay_match_state, match_id, seq,
+                               bool(request.args.get('events')))), 200
+
+
+def replay_match_state(match_id: int, seq: int | None, with_events: bool) -> dict:
+    """GET /match/<id>/state body (runs on DB_POOL)."""
+    state, last_seq = journal_state(seq, match_id=match_id)
+    match_state = state.get(match_id, {})
+
+    def view(alliance):
+        fields = match_state.get(alliance)
+        if fields is None:
+            return None
+        return {**fields, 'golden_points': golden_points_from_encoded(fields.get('golden_heights')),
+                'total_score': calculate_total_score(SimpleNamespace(**fields))}
+
+    body = {
+        'match_id': match_id,
+        'as_of_seq': seq if seq is not None else last_seq,
+        'red': view('red'),
+        'blue': view('blue'),
+        'red_draft': match_state.get('red_draft'),
+        'blue_draft': match_state.get('blue_draft'),
+    }
+    if with_events:
+        stmt = db.select(ScoreEvent).where(ScoreEvent.match_id == match_id).order_by(ScoreEvent.id)
+        if seq is not None:
+            stmt = stmt.where(ScoreEvent.id <= seq)
+        body['events'] = [{
+            'seq': e.id, 'alliance': e.alliance, 'kind': e.kind, 'actor': e.actor,
+            'created_ms': e.created_ms, 'payload': json.loads(e.payload),
+        } for e in db.session.scalars(stmt)]
+    return body
+
+
+@app.cli.command('journal-checkpoint')
+def journal_checkpoint_command():
+    """Checkpoint every match's folded journal state."""
+    init_db()
+    last_seq = write_journal_checkpoint()
+    db.session.commit()
+    print(f'checkpoint at seq {last_seq}')
+
+
+@app.cli.command('rebuild-scores')
+@click.option('--write', is_flag=True, help='Overwrite ScoreEntry rows with the replayed state.')
+def rebuild_scores_command(write):
+    """Replay the journal and compare (or overwrite) the ScoreEntry projection."""
+    init_db()
+    t0 = time.perf_counter()
+    state, last_seq = journal_state()
+    replay_ms = (time.perf_counter() - t0) * 1000
+
+    current = {(s.match_id, s.alliance): s for s in ScoreEntry.query.all()}
+    drift = 0
+    for match_id, match_state in state.items():
+        for alliance in ('red', 'blue'):
+            fields = match_state.get(alliance)
+            if fields is None:
+                continue
+            score = current.get((match_id, alliance))
+            if score is None or any(getattr(score, k) != v for k, v in fields.items()):
+                drift += 1
+                if write:
+                    if score is None:
+                        score = ScoreEntry(match_id=match_id, alliance=alliance)
+                        db.session.add(score)
+                    for key, value in fields.items():
+                        setattr(score, key, value)
+                    store_score_totals(score)
+    if write:
+        db.session.flush()
+        refresh_match_results()
+        rebuild_team_tables()
+        db.session.commit()
+        bump_version('schedule', 'results', 'teams', 'team_stats')
+        publish_app_sync('rankings')
+        schedule_snapshot(everything=True)
+        flush_snapshots()
+    print(f'replayed to seq {last_seq} in {replay_ms:.1f} ms; {drift} score entries differ'
+          + (' (rewritten)' if write and drift else ''))
+
+
+# -----------------------------
+# Event-wide rescoring
+# -----------------------------
+def load_score_columns() -> dict:
+    """Every ScoreEntry as columns: {'match_id': [...], 'alliance': [...], field: [...]}."""
+    names = ('match_id', 'alliance') + SCORED_COUNTS + ('supercharge_mode', 'golden_heights')
+    rows = db.session.execute(
+        db.select(*(getattr(ScoreEntry, n) for n in names)).order_by(ScoreEntry.match_id, ScoreEntry.alliance)
+    ).all()
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return dict(zip(names, columns))
+
+
+def score_totals_batch(columns: dict, rules: dict):
+    """Totals for every row of load_score_columns() under one rule version."""
+    golden = golden_points_batch(columns['golden_heights'], rules)
+    if np is None:
+        return [
+            points_from_counts({k: columns[k][i] or 0 for k in SCORED_COUNTS},
+                               bool(columns['supercharge_mode'][i]), golden[i], rules)
+            for i in range(len(columns['match_id']))
+        ]
+    total = np.asarray(golden, dtype=np.int64).copy()
+    for k in SCORED_COUNTS:
+        total += np.asarray([v or 0 for v in columns[k]], dtype=np.int64) * rules[k]
+    supercharge = np.asarray([bool(v) for v in columns['supercharge_mode']], dtype=bool)
+    total += np.where(supercharge, np.asarray([v or 0 for v in columns['alliance_charge']], dtype=np.int64)
+                      * rules['supercharge_bonus'], 0)
+    return total.tolist()
+
+
+def rescore_report(columns: dict, old_totals, new_totals) -> list:
+    """Per-match diff: [{'match_id', 'red': [old, new], 'blue': [old, new], 'winner': [old, new]}]."""
+    matches = {}
+    for i, match_id in enumerate(columns['match_id']):
+        matches.setdefault(match_id, {})[columns['alliance'][i]] = (int(old_totals[i]), int(new_totals[i]))
+
+    report = []
+    for match_id, sides in sorted(matches.items()):
+        red, blue = sides.get('red', (0, 0)), sides.get('blue', (0, 0))
+        if red[0] == red[1] and blue[0] == blue[1]:
+            continue
+        report.append({'match_id': match_id, 'red': list(red), 'blue': list(blue),
+                       'winner': [result_winner(red[0], blue[0]), result_winner(red[1], blue[1])]})
+    return report
+
+
+@app.cli.command('rescore')
+@click.option('--version', 'version', type=int, required=True, help='Rule version to score with.')
+@click.option('--apply', 'apply_', is_flag=True, help='Activate the version and rebuild standings.')
+@click.option('--report', type=click.Path(dir_okay=False), help='Write the per-match diff as JSON.')
+def rescore_command(version, apply_, report):
+    """Recompute every stored score under a rule version and diff against the active one."""
+    init_db()
+    rules = rules_for_version(version)
+    if rules is None:
+        raise click.ClickException(f'Rule version {version} not found')
+
+    t0 = time.perf_counter()
+    columns = load_score_columns()
+    t_loaded = time.perf_counter()
+    old_totals = score_totals_batch(columns, active_rules())
+    new_totals = score_totals_batch(columns, rules)
+    diff = rescore_report(columns, old_totals, new_totals)
+    t_done = time.perf_counter()
+
+    flips = sum(1 for d in diff if d['winner'][0] != d['winner'][1])
+    print(f"{len(columns['match_id'])} score entries: load {(t_loaded - t0) * 1000:.1f} ms, "
+          f"rescore {(t_done - t_loaded) * 1000:.1f} ms")
+    print(f"v{ACTIVE_RULES['version']} -> v{version}: {len(diff)} matches change, {flips} winners change")
+    for d in diff[:20]:
+        print(f"  match {d['match_id']}: red {d['red'][0]}->{d['red'][1]}, blue {d['blue'][0]}->{d['blue'][1]}"
+              + (f", winner {d['winner'][0]}->{d['winner'][1]}" if d['winner'][0] != d['winner'][1] else ''))
+    if report:
+        with open(report, 'w') as f:
+            json.dump({'from_version': ACTIVE_RULES['version'], 'to_version': version, 'matches': diff}, f, indent=2)
+    if apply_:
+        activate_rules(version)  # schedules a full snapshot publish
+        flush_snapshots()
+        print(f'rule version {version} active; totals, team stats and standings rebuilt')
+
+
+# -----------------------------
+# Rankings / standings
+# -----------------------------
+# Ranking points per result; ties broken by average, penalties drawn,
+# golden points, then endgame points (all descending).
+RANKING_POINTS = {'win': 2, 'tie': 1, 'loss': 0}
+STANDING_COUNTERS = ('matches_played', 'wins', 'losses', 'ties', 'total_score',
+                     'penalties_drawn', 'golden_points', 'endgame_points')
+
+# Serialized /rankings payload; rebuilt after each finalise so reads are O(1)
+RANKINGS_CACHE = {'payload': None}
+
+
+def endgame_points(score) -> int:
+    rules = active_rules()
+    return sum((getattr(score, k) or 0) * rules[k] for k in ENDGAME_COUNTS)
+
+
+def penalty_points(score) -> int:
+    """Points lost to penalties, as a positive number."""
+    rules = active_rules()
+    return -sum((getattr(score, k) or 0) * rules[k] for k in PENALTY_COUNTS)
+
+
+def split_teams(teams: str | None) -> list:
+    return [t for t in (teams or '').split(',') if t]
+
+
+def match_team_deltas(match: Match, red_score: ScoreEntry, blue_score: ScoreEntry):
+    """Yield (team_number, stats, standing, own_total): what one decided match adds to each of its teams."""
+    totals = {'red': red_score.total_score, 'blue': blue_score.total_score}
+    scores = {'red': red_score, 'blue': blue_score}
+    for alliance, other, teams in (('red', 'blue', match.red_teams), ('blue', 'red', match.blue_teams)):
+        own, opp, score = totals[alliance], totals[other], scores[alliance]
+        result = 'win' if own > opp else 'loss' if own < opp else 'tie'
+        stats = {
+            'matches_played': 1,
+            'total_contribution': own,
+            'parked_matches': int(bool(score.full_parking or score.partial_parking)),
+            'docked_matches': int(bool(score.docked)),
+            'engaged_matches': int(bool(score.engaged)),
+            'penalties_committed': penalty_points(score),
+            'golden_points': score.golden_points,
+        }
+        standing = {
+            'matches_played': 1,
+            'wins': int(result == 'win'),
+            'losses': int(result == 'loss'),
+            'ties': int(result == 'tie'),
+            'total_score': own,
+            'penalties_drawn': penalty_points(scores[other]),
+            'golden_points': score.golden_points,
+            'endgame_points': endgame_points(score),
+        }
+        for team_number in split_teams(teams):
+            yield team_number, stats, standing, own
+
+
+def decided_matches_query():
+    red = db.aliased(ScoreEntry)
+    blue = db.aliased(ScoreEntry)
+    return (
+        db.select(Match, red, blue)
+        .join(red, db.and_(red.match_id == Match.id, red.alliance == 'red'))
+        .join(blue, db.and_(blue.match_id == Match.id, blue.alliance == 'blue'))
+        .where(red.finalised.is_(True), blue.finalised.is_(True))
+        .order_by(Match.match_number)
+    )
+
+
+def compute_team_tables() -> tuple:
+    """From-scratch TeamStats and TeamStanding values over every decided match: ({team: {...}}, {team: {...}})."""
+    stats, standings = {}, {}
+    for match, red_score, blue_score in db.session.execute(decided_matches_query()):
+        for team_number, stat_counts, standing_counts, own in match_team_deltas(match, red_score, blue_score):
+            for table, counts, max_field in ((stats, stat_counts, 'max_contribution'),
+                                             (standings, standing_counts, 'max_score')):
+                row = table.get(team_number)
+                if row is None:
+                    row = table[team_number] = {**dict.fromkeys(counts, 0), max_field: own}
+                for key, value in counts.items():
+                    row[key] += value
+                row[max_field] = max(row[max_field], own)
+    return stats, standings
+
+
+def standing_as_dict(st) -> dict:
+    row = st if isinstance(st, dict) else {k: getattr(st, k) for k in STANDING_COUNTERS + ('max_score',)}
+    played = row['matches_played']
+    return {
+        **{k: row[k] for k in STANDING_COUNTERS + ('max_score',)},
+        'ranking_points': (row['wins'] * RANKING_POINTS['win'] + row['ties'] * RANKING_POINTS['tie']
+                           + row['losses'] * RANKING_POINTS['loss']),
+        'average_score': round(row['total_score'] / played, 2) if played else 0.0,
+    }
+
+
+def rankings_payload() -> dict:
+    teams = []
+    for st in TeamStanding.query.all():
+        teams.append({'team_number': st.team_number, **standing_as_dict(st)})
+    teams.sort(key=lambda t: (-t['ranking_points'], -t['average_score'], -t['penalties_drawn'],
+                              -t['golden_points'], -t['endgame_points'], t['team_number']))
+    for i, t in enumerate(teams, start=1):
+        t['rank'] = i
+    return {'rankings': teams, 'generated_ms': now_ms()}
+
+
+def refresh_rankings(broadcast: bool = True) -> dict:
+    payload = RANKINGS_CACHE['payload'] = DB_POOL.run('rankings', rankings_payload)
+    publish_app_sync('rankings')
+    if broadcast:
+        socketio.emit('rankings_update', payload, to=EVENT_ROOM)
+    return payload
+
+
+@app.route('/rankings', methods=['GET'])
+@cached_response(lambda: ('results', 'teams', 'team_stats'))
+def get_rankings():
+    if not current_event_is_active():
+        return jsonify(DB_POOL.run('rankings', rankings_payload)), 200  # archives: not kept in memory
+    payload = RANKINGS_CACHE['payload'] or refresh_rankings(broadcast=False)
+    return jsonify(payload), 200
+
+
+def team_table_diffs(before: tuple, after: tuple) -> list:
+    """[(table, team_number, before_row, after_row)] for every row that differs."""
+    diffs = []
+    for table, old, new in (('team_stats', before[0], after[0]), ('team_standing', before[1], after[1])):
+        for team_number in sorted(set(old) | set(new)):
+            if old.get(team_number) != new.get(team_number):
+                diffs.append((table, team_number, old.get(team_number), new.get(team_number)))
+    return diffs
+
+
+@app.cli.command('rebuild-rankings')
+def rebuild_rankings_command():
+    """Recount team stats and standings from scratch; exits 1 if the incremental tables differed (audit)."""
+    init_db()
+    before = read_team_tables()
+    after = rebuild_team_tables()
+    db.session.commit()
+    diffs = team_table_diffs(before, after)
+    print(f'{len(after[1])} teams ranked from scratch; {len(diffs)} rows differed from the incremental tables')
+    for table, team_number, old, new in diffs[:20]:
+        print(f'  {table} {team_number}: {old} -> {new}')
+    if diffs:
+        publish_app_sync('rankings')
+        bump_version('teams', 'team_stats', *sorted({f'team:{d[1]}' for d in diffs}))
+        schedule_snapshot(everything=True)
+        flush_snapshots()
+        raise click.ClickException('incremental standings differed from the rebuild (now rewritten)')
+
 
 # -----------------------------
 # Misc: broadcast & inspection & team profile
@@ -589,7 +2932,7 @@ def broadcast_score():
         'match_id': match_id,
         'alliance': alliance,
         'score': score
-    })
+    }, to=match_room(match_id))
     return jsonify({'message': 'Score update broadcasted'}), 200
 
 @app.route('/inspection/team_number/<string:team_number>', methods=['POST'])
@@ -600,27 +2943,566 @@ def update_inspection_by_team_number(team_number):
     if status not in ['passed', 'failed', 'pending']:
         return jsonify({'error': 'Invalid inspection status'}), 400
 
-    team = Team.query.filter_by(name=team_number).first()
-    if not team:
+    if not DB_POOL.run('inspection', set_inspection_status, team_number, status):
         return jsonify({'error': 'Team not found'}), 404
+    bump_version('teams', f'team:{team_number}')
+
+    return jsonify({'message': f'Inspection status for team {team_number} updated to {status}'}), 200
+
 
+def set_inspection_status(team_number: str, status: str) -> bool:
+    """Record a team's inspection result (runs on DB_POOL); False for an unknown team."""
+    team = Team.query.filter_by(name=team_number).first()
+    if not team:
+        return False
     team.inspection_status = status
     db.session.commit()
+    return True
+
+
+# -----------------------------
+# Team index & per-team stats
+# -----------------------------
+TEAM_STAT_COUNTERS = ('matches_played', 'total_contribution', 'parked_matches', 'docked_matches',
+                      'engaged_matches', 'penalties_committed', 'golden_points')
+
+
+def sync_participants(matches, replace: bool = False):
+    """matches: [(match_id, red_teams, blue_teams)]; rewrites their MatchParticipant rows (caller commits)."""
+    if replace:
+        for batch in _chunks([m[0] for m in matches], UPLOAD_BATCH_SIZE):
+            db.session.execute(db.delete(MatchParticipant).where(MatchParticipant.match_id.in_(batch)))
+    rows = [
+        {'match_id': match_id, 'team_number': team, 'alliance': alliance, 'station': station}
+        for match_id, red_teams, blue_teams in matches
+        for alliance, teams in (('red', red_teams), ('blue', blue_teams))
+        for station, team in enumerate(split_teams(teams), start=1)
+    ]
+    for batch in _chunks(rows, UPLOAD_BATCH_SIZE):
+        db.session.execute(db.insert(MatchParticipant), batch)
+
+
+def bump_team_row(model, team_number: str, counts: dict, max_field: str, own: int, sign: int, **extra):
+    """Add sign * counts to one team's row in a single upsert; a positive sign also raises the max (caller commits)."""
+    table = model.__table__
+    stmt = sqlite_insert(model).values(team_number=team_number, **{k: sign * v for k, v in counts.items()},
+                                       **{max_field: own if sign > 0 else 0}, **extra)
+    update = {k: table.c[k] + stmt.excluded[k] for k in counts}
+    if sign > 0:
+        update[max_field] = db.func.max(table.c[max_field], own)
+    update.update({k: stmt.excluded[k] for k in extra})
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['team_number'], set_=update))
+
+
+def team_max_total(team_number: str, exclude_match_id: int) -> int:
+    """Best alliance total of a team over its decided matches other than exclude_match_id."""
+    other = db.aliased(ScoreEntry)
+    return db.session.scalar(
+        db.select(db.func.max(ScoreEntry.total_score))
+        .join(MatchParticipant, db.and_(MatchParticipant.match_id == ScoreEntry.match_id,
+                                        MatchParticipant.alliance == ScoreEntry.alliance))
+        .join(other, db.and_(other.match_id == ScoreEntry.match_id, other.alliance != ScoreEntry.alliance))
+        .where(MatchParticipant.team_number == team_number, ScoreEntry.match_id != exclude_match_id,
+               ScoreEntry.finalised.is_(True), other.finalised.is_(True))
+    ) or 0
+
+
+def apply_match_deltas(match_id: int, sign: int) -> list:
+    """
+    Add (sign=1) or take back (sign=-1) one decided match's contribution to
+    TeamStats and TeamStanding, touching only that match's teams (caller
+    commits). Undecided matches contribute nothing. Returns the teams touched.
+    """
+    scores = {s.alliance: s for s in ScoreEntry.query.filter_by(match_id=match_id)}
+    red_score, blue_score = scores.get('red'), scores.get('blue')
+    if not (red_score and blue_score and red_score.finalised and blue_score.finalised):
+        return []
+    match = db.session.get(Match, match_id)
+    teams = []
+    for team_number, stats, standing, own in match_team_deltas(match, red_score, blue_score):
+        bump_team_row(TeamStats, team_number, stats, 'max_contribution', own, sign, updated_ms=now_ms())
+        bump_team_row(TeamStanding, team_number, standing, 'max_score', own, sign)
+        teams.append(team_number)
+    if sign < 0:
+        # A max can't be taken back by subtraction: re-read it from the team's other decided matches
+        for team_number in teams:
+            best = team_max_total(team_number, match_id)
+            db.session.execute(db.update(TeamStats).where(TeamStats.team_number == team_number)
+                               .values(max_contribution=best))
+            db.session.execute(db.update(TeamStanding).where(TeamStanding.team_number == team_number)
+                               .values(max_score=best))
+        for model in (TeamStats, TeamStanding):
+            db.session.execute(db.delete(model).where(model.team_number.in_(teams), model.matches_played <= 0))
+    return teams
+
+
+def read_team_tables() -> tuple:
+    """Current TeamStats and TeamStanding rows, shaped like compute_team_tables()."""
+    stats = {st.team_number: {k: getattr(st, k) for k in TEAM_STAT_COUNTERS + ('max_contribution',)}
+             for st in TeamStats.query.filter(TeamStats.matches_played > 0)}
+    standings = {st.team_number: {k: getattr(st, k) for k in STANDING_COUNTERS + ('max_score',)}
+                 for st in TeamStanding.query.filter(TeamStanding.matches_played > 0)}
+    return stats, standings
+
+
+def rebuild_team_tables() -> tuple:
+    """Replace TeamStats and TeamStanding with a from-scratch recount (caller commits); returns the new values."""
+    stats, standings = compute_team_tables()
+    db.session.execute(db.delete(TeamStats))
+    db.session.execute(db.delete(TeamStanding))
+    stamp = now_ms()
+    for batch in _chunks([{'team_number': t, **row, 'updated_ms': stamp} for t, row in stats.items()],
+                         UPLOAD_BATCH_SIZE):
+        db.session.execute(db.insert(TeamStats), batch)
+    for batch in _chunks([{'team_number': t, **row} for t, row in standings.items()], UPLOAD_BATCH_SIZE):
+        db.session.execute(db.insert(TeamStanding), batch)
+    return stats, standings
+
+
+def match_team_numbers(match: Match) -> list:
+    return split_teams(match.red_teams) + split_teams(match.blue_teams)
+
+
+def on_team_stats_changed(team_numbers):
+    bump_version('team_stats', *(f'team:{t}' for t in team_numbers))
+
+
+def backfill_team_index():
+    """Build MatchParticipant/TeamStats for databases created before they existed."""
+    if db.session.scalar(db.select(MatchParticipant.id).limit(1)) is None:
+        matches = db.session.execute(db.select(Match.id, Match.red_teams, Match.blue_teams)).all()
+        if matches:
+            sync_participants([tuple(m) for m in matches])
+            db.session.commit()
+    if db.session.scalar(db.select(TeamStats.id).limit(1)) is None:
+        stats, _ = rebuild_team_tables()
+        if stats:
+            db.session.commit()
+
+
+def team_stats_dict(st: TeamStats | None) -> dict:
+    if st is None:
+        return {**dict.fromkeys(TEAM_STAT_COUNTERS, 0), 'max_contribution': 0, 'average_contribution': 0.0,
+                'park_rate': 0.0, 'dock_rate': 0.0, 'engage_rate': 0.0}
+    played = st.matches_played
+    rate = (lambda n: round(n / played, 3)) if played else (lambda n: 0.0)
+    return {
+        **{k: getattr(st, k) for k in TEAM_STAT_COUNTERS},
+        'max_contribution': st.max_contribution,
+        'average_contribution': round(st.total_contribution / played, 2) if played else 0.0,
+        'park_rate': rate(st.parked_matches),
+        'dock_rate': rate(st.docked_matches),
+        'engage_rate': rate(st.engaged_matches),
+    }
 
-    return jsonify({'message': f'Inspection status for team {team_number} updated to {status}'}), 200
 
 @app.route('/team/profile/<string:team_number>', methods=['GET'])
+@cached_response(lambda team_number: ('teams', 'schedule', f'team:{team_number}'))
 def view_team_profile_by_number(team_number):
+    body = DB_POOL.run('team_profile', team_profile, team_number)
+    if body is None:
+        return jsonify({'error': 'Team not found'}), 404
+    return jsonify(body), 200
+
+
+def team_profile(team_number: str) -> dict | None:
+    """GET /team/profile body (runs on DB_POOL), or None for an unknown team."""
     team = Team.query.filter_by(name=team_number).first()
     if not team:
-        return jsonify({'error': 'Team not found'}), 404
+        return None
 
-    return jsonify({
+    stats = TeamStats.query.filter_by(team_number=team_number).first()
+    matches = db.session.execute(
+        db.select(Match.id, Match.match_number, Match.arena, Match.status, MatchParticipant.alliance)
+        .join(MatchParticipant, MatchParticipant.match_id == Match.id)
+        .where(MatchParticipant.team_number == team_number)
+        .order_by(Match.match_number)
+    ).all()
+
+    return {
         'team_number': team.name,
         'inspection_status': team.inspection_status,
         'red_cards': team.red_cards,
-        'yellow_cards': team.yellow_cards
-    }), 200
+        'yellow_cards': team.yellow_cards,
+        'stats': team_stats_dict(stats),
+        'matches': [{'match_id': m.id, 'match_number': m.match_number, 'arena': m.arena,
+                     'status': m.status, 'alliance': m.alliance} for m in matches],
+    }
+
+
+@app.route('/teams', methods=['GET'])
+@cached_response(lambda: ('teams', 'team_stats'))
+def list_teams():
+    return jsonify({'teams': DB_POOL.run('teams', team_list)}), 200
+
+
+def team_list() -> list:
+    """Every team with its stats, in team-number order (runs on DB_POOL)."""
+    rows = db.session.execute(
+        db.select(Team, TeamStats).outerjoin(TeamStats, TeamStats.team_number == Team.name)
+    ).all()
+    teams = [{
+        'team_number': team.name,
+        'inspection_status': team.inspection_status,
+        'red_cards': team.red_cards,
+        'yellow_cards': team.yellow_cards,
+        'stats': team_stats_dict(stats),
+    } for team, stats in rows]
+    teams.sort(key=lambda t: (not t['team_number'].isdigit(), int(t['team_number']) if t['team_number'].isdigit() else 0,
+                              t['team_number']))
+    return teams
+
+# -----------------------------
+# Bulk export (CSV / NDJSON, streamed)
+# -----------------------------
+# Rows are read EXPORT_CHUNK at a time with their stored totals, each page a
+# keyset query on DB_POOL, so memory stays flat regardless of event size and
+# the hub never waits on SQLite. Output is ordered by a stable key; pass the
+# last key received as ?after= to resume a broken pull (match_number for
+# results, team_number for teams).
+EXPORT_CHUNK = 500
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_SCORE_COLUMNS = ('total_score', 'golden_points', 'finalised') + SCORED_COUNTS
+EXPORT_MATCH_COLUMNS = ('match_id', 'match_number', 'arena', 'status', 'red_teams', 'blue_teams')
+EXPORT_RESULT_FIELDS = EXPORT_MATCH_COLUMNS + ('winner',) + tuple(
+    f'{alliance}_{k}' for alliance in ('red', 'blue')
+    for k in ('total', 'golden_points', 'finalised') + SCORED_COUNTS
+)
+EXPORT_TEAM_FIELDS = ('team_number', 'inspection_status', 'red_cards', 'yellow_cards') + TEAM_STAT_COUNTERS + (
+    'max_contribution', 'wins', 'losses', 'ties')
+
+
+def export_result_page(clauses, after: int | None = None) -> tuple:
+    """
+    One EXPORT_CHUNK of flat result rows after match_number `after` (runs on DB_POOL).
+    Returns (rows, cursor); cursor is None once the last page has been read.
+    """
+    red = db.aliased(ScoreEntry)
+    blue = db.aliased(ScoreEntry)
+    stmt = (
+        db.select(Match.id, Match.match_number, Match.arena, Match.status, Match.red_teams, Match.blue_teams,
+                  Match.winner,
+                  *(getattr(red, c) for c in EXPORT_SCORE_COLUMNS),
+                  *(getattr(blue, c) for c in EXPORT_SCORE_COLUMNS))
+        .outerjoin(red, db.and_(red.match_id == Match.id, red.alliance == 'red'))
+        .outerjoin(blue, db.and_(blue.match_id == Match.id, blue.alliance == 'blue'))
+        .where(*clauses)
+        .order_by(Match.match_number)
+        .limit(EXPORT_CHUNK)
+    )
+    if after is not None:
+        stmt = stmt.where(Match.match_number > after)
+
+    base, width = len(EXPORT_MATCH_COLUMNS) + 1, len(EXPORT_SCORE_COLUMNS)
+    chunk = db.session.execute(stmt).all()
+    rows = []
+    last = None
+    for r in chunk:
+        if r[1] == last:   # duplicate score rows for one match: keep the first
+            continue
+        last = r[1]
+        row = dict(zip(EXPORT_MATCH_COLUMNS + ('winner',), r[:base]))
+        for i, alliance in enumerate(('red', 'blue')):
+            values = dict(zip(EXPORT_SCORE_COLUMNS, r[base + i * width:base + (i + 1) * width]))
+            row[f'{alliance}_total'] = values.pop('total_score') or 0
+            row[f'{alliance}_finalised'] = bool(values.pop('finalised'))
+            row.update({f'{alliance}_{k}': v or 0 for k, v in values.items()})
+        rows.append(row)
+    return rows, (last if len(chunk) == EXPORT_CHUNK else None)
+
+
+def export_team_page(clauses, after: str | None = None) -> tuple:
+    """
+    One EXPORT_CHUNK of flat team rows after team_number `after` (runs on DB_POOL);
+    match filters narrow to teams playing in those matches. Returns (rows, cursor) like export_result_page.
+    """
+    stat_columns = TEAM_STAT_COUNTERS + ('max_contribution',)
+    stmt = (
+        db.select(Team.name, Team.inspection_status, Team.red_cards, Team.yellow_cards,
+                  *(getattr(TeamStats, c) for c in stat_columns),
+                  TeamStanding.wins, TeamStanding.losses, TeamStanding.ties)
+        .outerjoin(TeamStats, TeamStats.team_number == Team.name)
+        .outerjoin(TeamStanding, TeamStanding.team_number == Team.name)
+        .order_by(Team.name)
+        .limit(EXPORT_CHUNK)
+    )
+    if clauses:
+        stmt = stmt.where(Team.name.in_(
+            db.select(MatchParticipant.team_number).join(Match, Match.id == MatchParticipant.match_id).where(*clauses)
+        ))
+    if after is not None:
+        stmt = stmt.where(Team.name > after)
+    rows = [{k: (v or 0) if k not in ('team_number', 'inspection_status') else v
+             for k, v in zip(EXPORT_TEAM_FIELDS, r)} for r in db.session.execute(stmt)]
+    return rows, (rows[-1]['team_number'] if len(rows) == EXPORT_CHUNK else None)
+
+
+def export_chunks(name: str, page, clauses, after):
+    """Yield row lists, fetching each page on DB_POOL so the stream never reads SQLite on the hub."""
+    while True:
+        rows, after = DB_POOL.run(f'export_{name}', page, clauses, after)
+        if rows:
+            yield rows
+        if after is None:
+            return
+
+
+def encode_export(chunks, fmt: str, fields):
+    """Serialize row chunks to text, one string per chunk."""
+    if fmt == 'csv':
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        for rows in chunks:
+            writer.writerows(rows)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    else:
+        for rows in chunks:
+            yield ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows)
+
+
+def gzip_stream(texts):
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31: gzip container
+    for text in texts:
+        data = z.compress(text.encode('utf-8'))
+        if data:
+            yield data
+    yield z.flush()
+
+
+def export_response(name: str, page, after):
+    """Shared handling of format=, gzip and match filters for /export/*."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of {sorted(EXPORT_FORMATS)}'}), 400
+    clauses, error = parse_match_filters(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    fields = EXPORT_RESULT_FIELDS if name == 'results' else EXPORT_TEAM_FIELDS
+    body = encode_export(export_chunks(name, page, clauses, after), fmt, fields)
+    headers = {'Content-Disposition': f'attachment; filename={name}.{fmt}', 'Vary': 'Accept-Encoding'}
+    if request.args.get('gzip') == '1' or request.accept_encodings['gzip']:
+        body = gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt], headers=headers), 200
+
+
+@app.route('/export/results', methods=['GET'])
+def export_results():
+    """?format=csv|ndjson &arena= &status= &range=10-40 &ids= &after=<match_number> &gzip=1"""
+    after = request.args.get('after')
+    if after is not None:
+        try:
+            after = int(after)
+        except ValueError:
+            return jsonify({'error': 'after must be a match number'}), 400
+    return export_response('results', export_result_page, after)
+
+
+@app.route('/export/teams', methods=['GET'])
+def export_teams():
+    """?format=csv|ndjson &arena= &status= &range= (teams playing in those matches) &after=<team_number> &gzip=1"""
+    return export_response('teams', export_team_page, request.args.get('after'))
+
+
+# -----------------------------
+# Live scoring coalescer
+# -----------------------------
+# Referee drafts are buffered per (match, alliance) and flushed by one
+# background ticker, so fan-out is bounded by LIVE_TICK_HZ no matter how
+# fast tablets emit. Clients that join with {'patches': True} receive
+# 'live_score_patch' (changed fields only, with periodic keyframes);
+# everyone else keeps getting a full 'score_update' per tick.
+app.config.setdefault('LIVE_TICK_HZ', 10)
+app.config.setdefault('LIVE_KEYFRAME_INTERVAL', 50)  # full breakdown every N seqs
+app.config.setdefault('LIVE_SYNC_INTERVAL', 1.0)     # seconds between batched draft live_set publishes
+
+# { (match_id, alliance): {'pending': dict|None, 'sent': dict, 'total': int, 'seq': int, 'keyframe_seq': int} }
+LIVE_CHANNELS = {}
+# { match_id: set(sid) } sockets that asked for delta patches, across every worker; they are
+# skipped by the per-tick score_update and get one live_score_patch emit to patch_room instead
+LIVE_PATCH_SIDS = {}
+_live_ticker = {'running': False}
+# Latest known state per match, served to late joiners without touching the DB:
+# { match_id: {'seq': int, 'red': dict|None, 'blue': dict|None} }
+# Alliance entries come from the last flushed draft or committed submission;
+# evicted on finalise. The timer is read from TIMER_STORE when a snapshot is sent.
+LIVE_MATCHES = {}
+# Finalised matches: late drafts and score edits no longer create live state
+LIVE_CLOSED = set()
+# Matches the first draft found in the schedule and not completed. A draft for any other
+# match reads its status once, so a restart or another worker's finalise can't reopen it.
+LIVE_OPEN = set()
+# { (match_id, alliance): entry } drafts not yet sent to the other workers; the ticker batches them
+LIVE_SYNC_PENDING = {}
+
+
+def _match_key(match_id):
+    try:
+        return int(match_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def match_status(match_id: int) -> str | None:
+    return db.session.scalar(db.select(Match.status).where(Match.id == match_id))
+
+
+def queue_live_update(match_id: int, alliance: str, breakdown: dict):
+    """
+    Record the latest draft; the ticker sends it on its next pass.
+    Drafts for unknown or completed matches are dropped.
+    """
+    if match_id in LIVE_CLOSED:
+        return
+    if match_id not in LIVE_OPEN:
+        status = DB_POOL.run('live_status', match_status, match_id)
+        if status is None:
+            return
+        if status == 'completed':
+            LIVE_CLOSED.add(match_id)
+            return
+        LIVE_OPEN.add(match_id)
+    ch = LIVE_CHANNELS.get((match_id, alliance))
+    if ch is None:
+        ch = LIVE_CHANNELS[(match_id, alliance)] = {
+            'pending': None, 'sent': {}, 'total': 0, 'seq': 0, 'keyframe_seq': 0,
+        }
+    ch['pending'] = breakdown
+    if not _live_ticker['running']:
+        _live_ticker['running'] = True
+        socketio.start_background_task(_live_ticker_loop)
+
+
+def close_live_match(match_id: int):
+    for alliance in ('red', 'blue'):
+        LIVE_CHANNELS.pop((match_id, alliance), None)
+        LIVE_SYNC_PENDING.pop((match_id, alliance), None)
+    LIVE_MATCHES.pop(match_id, None)
+    LIVE_CLOSED.add(match_id)
+    schedule_live_snapshot(match_id)
+
+
+def drop_live_channels(match_id: int):
+    close_live_match(match_id)
+    publish_app_sync('live_drop', match_id=match_id)
+
+
+def _live_match(match_id: int) -> dict:
+    state = LIVE_MATCHES.get(match_id)
+    if state is None:
+        state = LIVE_MATCHES[match_id] = {'seq': 0, 'red': None, 'blue': None}
+    state['seq'] += 1
+    return state
+
+
+def record_live_alliance(match_id: int, alliance: str, breakdown: dict, total: int, source: str, seq: int = 0):
+    """source is 'draft' (flushed referee draft) or 'submit' (committed ScoreEntry)."""
+    if match_id in LIVE_CLOSED:
+        return
+    entry = _live_match(match_id)[alliance] = {
+        'score_breakdown': breakdown, 'total_score': total, 'source': source, 'seq': seq, 'updated_ms': now_ms(),
+    }
+    schedule_live_snapshot(match_id)
+    if source == 'draft':
+        LIVE_SYNC_PENDING[(match_id, alliance)] = entry
+    else:
+        LIVE_SYNC_PENDING.pop((match_id, alliance), None)
+        publish_app_sync('live_set', entries=[[match_id, alliance, entry]])
+
+
+def publish_live_sync():
+    """Send the drafts flushed since the last call to the other workers as one live_set."""
+    if LIVE_SYNC_PENDING:
+        entries = [[match_id, alliance, entry] for (match_id, alliance), entry in LIVE_SYNC_PENDING.items()]
+        LIVE_SYNC_PENDING.clear()
+        publish_app_sync('live_set', entries=entries)
+
+
+def live_snapshot(match_id: int) -> dict:
+    state = LIVE_MATCHES.get(match_id) or {'seq': 0, 'red': None, 'blue': None}
+    return {'match_id': match_id, **state, 'timer': TIMER_STORE.get(match_id), 'server_now_ms': now_ms()}
+
+
+def live_keyframe(match_id: int, alliance: str, ch: dict) -> dict:
+    return {
+        'match_id': match_id,
+        'alliance': alliance,
+        'seq': ch['seq'],
+        'keyframe': True,
+        'score_breakdown': ch['sent'],
+        'total_score': ch['total'],
+        'finalised': False,
+        'live': True,
+    }
+
+
+def _flush_live_channel(match_id: int, alliance: str, ch: dict):
+    breakdown, ch['pending'] = ch['pending'], None
+    sent = ch['sent']
+    changes = {k: v for k, v in breakdown.items() if k not in sent or sent[k] != v}
+    removed = [k for k in sent if k not in breakdown]
+    if not changes and not removed:
+        return
+
+    total = calculate_total_from_payload(breakdown)
+    ch['seq'] += 1
+    ch['sent'] = dict(breakdown)
+    ch['total'] = total
+    record_live_alliance(match_id, alliance, ch['sent'], total, 'draft', ch['seq'])
+    if time.monotonic() - ch.get('journaled', 0) >= app.config['LIVE_DRAFT_JOURNAL_SECONDS']:
+        ch['journaled'] = time.monotonic()
+        socketio.start_background_task(DB_POOL.run, 'journal_draft', journal_draft, match_id, alliance, breakdown)
+    room = match_room(match_id)
+    patch_sids = list(LIVE_PATCH_SIDS.get(match_id, ()))
+
+    # Legacy subscribers: full breakdown, at most once per tick
+    socketio.emit('score_update', {
+        'match_id': match_id,
+        'alliance': alliance,
+        'score_breakdown': breakdown,
+        'total_score': total,
+        'finalised': False,
+        'live': True,
+        'seq': ch['seq'],
+    }, to=room, skip_sid=patch_sids)
+
+    if not patch_sids:
+        return
+    if ch['seq'] - ch['keyframe_seq'] >= app.config['LIVE_KEYFRAME_INTERVAL'] or ch['seq'] == 1:
+        ch['keyframe_seq'] = ch['seq']
+        payload = live_keyframe(match_id, alliance, ch)
+    else:
+        payload = {
+            'match_id': match_id,
+            'alliance': alliance,
+            'seq': ch['seq'],
+            'keyframe': False,
+            'changes': changes,
+            'removed': removed,
+            'total_score': total,
+            'live': True,
+        }
+    socketio.emit('live_score_patch', payload, to=patch_room(match_id))
+
+
+def _live_ticker_loop():
+    synced = time.monotonic()
+    while True:
+        socketio.sleep(1.0 / app.config['LIVE_TICK_HZ'])
+        for (match_id, alliance), ch in list(LIVE_CHANNELS.items()):
+            if ch['pending'] is not None:
+                try:
+                    _flush_live_channel(match_id, alliance, ch)
+                except Exception:
+                    app.logger.exception('live flush failed for match %s %s', match_id, alliance)
+        if time.monotonic() - synced >= app.config['LIVE_SYNC_INTERVAL']:
+            synced = time.monotonic()
+            publish_live_sync()
+
 
 # -----------------------------
 # Live scoring sockets (draft)
@@ -630,17 +3512,76 @@ def on_join_match(data):
     match_id = data.get('match_id')
     if not match_id:
         return
-    room = f'match_{match_id}'
+    room = match_room(match_id)
     join_room(room)
+    key = _match_key(match_id)
+    if data.get('patches') and key is not None:
+        join_room(patch_room(key))
+        LIVE_PATCH_SIDS.setdefault(key, set()).add(request.sid)
+        publish_app_sync('patch_sid', match_id=key, sid=request.sid, subscribed=True)
+        on_live_resync({'match_id': match_id})
     emit('joined', {'room': room})
+    if key is not None:
+        # Late joiners get the current drafts and timer at once, from memory
+        emit('live_snapshot', live_snapshot(key))
 
 @socketio.on('leave_match')
 def on_leave_match(data):
     match_id = data.get('match_id')
     if not match_id:
         return
-    room = f'match_{match_id}'
+    room = match_room(match_id)
     leave_room(room)
+    leave_room(patch_room(_match_key(match_id)))
+    LIVE_PATCH_SIDS.get(_match_key(match_id), set()).discard(request.sid)
+    publish_app_sync('patch_sid', match_id=_match_key(match_id), sid=request.sid, subscribed=False)
+
+@socketio.on('disconnect')
+def on_disconnect(*args):
+    for sids in LIVE_PATCH_SIDS.values():
+        sids.discard(request.sid)
+    publish_app_sync('patch_sid', match_id=None, sid=request.sid, subscribed=False)
+    CLOCK_SYNC_STATS.pop(request.sid, None)
+    SOCKET_BACKLOG.pop(request.sid, None)
+    INBOUND_BUCKETS.pop(request.sid, None)
+
+@socketio.on('live_resync')
+def on_live_resync(data):
+    """Client saw a seq gap: send it keyframes for the requested alliance(s)."""
+    match_id = _match_key((data or {}).get('match_id'))
+    if match_id is None:
+        return
+    alliances = [data['alliance']] if data.get('alliance') in ('red', 'blue') else ['red', 'blue']
+    for alliance in alliances:
+        ch = LIVE_CHANNELS.get((match_id, alliance))
+        if ch and ch['seq']:
+            emit('live_score_patch', live_keyframe(match_id, alliance, ch))
+
+@socketio.on('join_arena')
+def on_join_arena(data):
+    arena = (data or {}).get('arena')
+    if not arena:
+        return
+    room = arena_room(arena)
+    join_room(room)
+    emit('joined', {'room': room})
+
+@socketio.on('leave_arena')
+def on_leave_arena(data):
+    arena = (data or {}).get('arena')
+    if not arena:
+        return
+    leave_room(arena_room(arena))
+
+@socketio.on('join_event')
+def on_join_event(data=None):
+    """Compact all-arenas feed (scoreboard_update / match_finalised / schedule_updated)."""
+    join_room(EVENT_ROOM)
+    emit('joined', {'room': EVENT_ROOM})
+
+@socketio.on('leave_event')
+def on_leave_event(data=None):
+    leave_room(EVENT_ROOM)
 
 @socketio.on('live_score_update')
 def on_live_score_update(data):
@@ -652,33 +3593,915 @@ def on_live_score_update(data):
       'score_breakdown': {... same keys as /score ... }
     }
     """
-    match_id = data.get('match_id')
+    match_id = _match_key(data.get('match_id'))
     alliance = data.get('alliance')
     breakdown = data.get('score_breakdown') or {}
 
-    if not match_id or alliance not in ['red', 'blue']:
+    if not match_id or alliance not in ['red', 'blue'] or not isinstance(breakdown, dict):
+        return
+    if not allow_inbound(request.sid):
+        SOCKET_RATE_LIMITED.inc(('live_score_update',))
         return
 
-    total = calculate_total_from_payload(breakdown)
+    # Coalesced: the ticker broadcasts to everyone viewing this match (including sender)
+    queue_live_update(match_id, alliance, breakdown)
 
-    payload = {
-        'match_id': match_id,
-        'alliance': alliance,
-        'score_breakdown': breakdown,
-        'total_score': total,
-        'finalised': False,
-        'live': True
+
+
+# -----------------------------
+# Clock sync (NTP-style over Socket.IO)
+# -----------------------------
+# Client:  emit('clock_sync', {'t0': <client ms>, 'last_offset_ms': .., 'last_rtt_ms': ..})
+# Server:  emit('clock_sync_reply', {'t0': t0, 't1': <recv ms>, 't2': <send ms>})
+# Client, on receipt at t3:
+#   rtt    = (t3 - t0) - (t2 - t1)
+#   offset = ((t1 - t0) + (t2 - t3)) / 2      # server_now ~= client_now + offset
+# Clients send a burst of ~5 pings on connect, keep the offset from the
+# lowest-RTT sample and repeat every 30-60 s. Each ping reports the client's
+# previous sample so the server can show per-client sync quality.
+CLOCK_SYNC_WINDOW = 8  # reported samples kept per client
+
+# { sid: {'samples': deque[(offset_ms, rtt_ms)], 'pings': int, 'label': str, 'updated_ms': int} }
+CLOCK_SYNC_STATS = {}
+
+
+@socketio.on('clock_sync')
+def on_clock_sync(data):
+    t1 = time.time() * 1000
+    data = data or {}
+    stats = CLOCK_SYNC_STATS.get(request.sid)
+    if stats is None:
+        stats = CLOCK_SYNC_STATS[request.sid] = {
+            'samples': deque(maxlen=CLOCK_SYNC_WINDOW), 'pings': 0, 'label': '', 'updated_ms': 0,
+        }
+    stats['pings'] += 1
+    stats['updated_ms'] = int(t1)
+    if data.get('label'):
+        stats['label'] = str(data['label'])[:64]
+    try:
+        if data.get('last_rtt_ms') is not None:
+            stats['samples'].append((float(data['last_offset_ms']), float(data['last_rtt_ms'])))
+    except (TypeError, ValueError, KeyError):
+        pass
+
+    emit('clock_sync_reply', {'t0': data.get('t0'), 't1': t1, 't2': time.time() * 1000})
+
+
+def clock_sync_summary(sid: str, stats: dict) -> dict:
+    samples = list(stats['samples'])
+    best = min(samples, key=lambda s: s[1]) if samples else None
+    return {
+        'sid': sid,
+        'label': stats['label'],
+        'pings': stats['pings'],
+        'samples': len(samples),
+        'offset_ms': round(best[0], 1) if best else None,   # from the lowest-RTT sample
+        'rtt_ms': round(best[1], 1) if best else None,
+        'rtt_max_ms': round(max(s[1] for s in samples), 1) if samples else None,
+        'offset_spread_ms': round(max(s[0] for s in samples) - min(s[0] for s in samples), 1) if samples else None,
+        'last_seen_ms': stats['updated_ms'],
     }
-    # Broadcast to everyone viewing this match (including sender)
-    emit('score_update', payload, to=f'match_{match_id}', include_self=True)
 
 
+@app.route('/admin/clock_sync', methods=['GET'])
+def clock_sync_stats():
+    clients = [clock_sync_summary(sid, st) for sid, st in list(CLOCK_SYNC_STATS.items())]
+    clients.sort(key=lambda c: -(c['rtt_ms'] or 0))
+    return jsonify({'server_now_ms': now_ms(), 'clients': clients}), 200
+
+
+# -----------------------------
+# Socket backpressure
+# -----------------------------
+# A sweep every SOCKET_DRAIN_INTERVAL reads each local client's Engine.IO
+# queue once and marks those with SOCKET_QUEUE_SOFT_LIMIT or more packets
+# waiting as congested (SOCKET_BACKLOG). State-style broadcasts
+# (COALESCED_EVENTS) skip congested clients and park the newest payload per
+# (event, match, alliance) for them, delivered once their queue drains: a slow
+# screen gets fewer, fresher updates instead of an ever-growing backlog, and an
+# emit only looks at the congested clients, not every viewer. Finalisation,
+# timer and other one-shot events are never parked or dropped; a congested
+# recipient gets its parked updates first so nothing stale lands after them.
+# Any client past SOCKET_QUEUE_HARD_LIMIT, congested for longer than
+# SOCKET_SLOW_DISCONNECT_SECONDS or with more than SOCKET_PARKED_LIMIT parked
+# payloads is disconnected; on reconnect join_match's live_snapshot catches it up.
+app.config.setdefault('SOCKET_QUEUE_SOFT_LIMIT', 32)
+app.config.setdefault('SOCKET_QUEUE_HARD_LIMIT', 512)
+app.config.setdefault('SOCKET_PARKED_LIMIT', 256)
+app.config.setdefault('SOCKET_SLOW_DISCONNECT_SECONDS', 20)
+app.config.setdefault('SOCKET_DRAIN_INTERVAL', 0.2)
+app.config.setdefault('LIVE_UPDATE_RATE_HZ', 20)   # inbound live_score_update per socket, sustained
+app.config.setdefault('LIVE_UPDATE_BURST', 40)
+
+# event -> payload fields that identify "the same state"; newest payload per key wins
+COALESCED_EVENTS = {
+    'score_update': ('match_id', 'alliance'),
+    'scoreboard_update': ('match_id', 'alliance'),
+    'live_score_patch': ('match_id', 'alliance'),
+    'rankings_update': (),
+}
+# Congested clients as of the last sweep:
+# { sid: {'eio_sid': str, 'since': monotonic, 'pending': {key: (event, data)}, 'deferred': int, 'dropped': int} }
+SOCKET_BACKLOG = {}
+# { sid: [tokens, last_refill_monotonic] }
+INBOUND_BUCKETS = {}
+_socket_drainer = {'running': False, 'emit': None}
+
+
+def client_queue_depth(eio_sid) -> int:
+    """Packets waiting in a client's Engine.IO queue (0 for unknown or test clients)."""
+    sock = socketio.server.eio.sockets.get(eio_sid)
+    return sock.queue.qsize() if sock is not None else 0
+
+
+def ensure_socket_sweep():
+    if not _socket_drainer['running']:
+        _socket_drainer['running'] = True
+        socketio.start_background_task(_socket_sweep_loop)
+
+
+def targets_sid(sid: str, target) -> bool:
+    """Whether an emit to `target` (room, list of rooms or None for everyone) reaches local client `sid`."""
+    rooms = socketio.server.manager.rooms.get('/', {})
+    if target is None:
+        return sid in rooms.get(None, ())
+    return any(sid in rooms.get(room, ()) for room in (target if isinstance(target, list) else [target]))
+
+
+def congested_recipients(target, namespace, skip_sid) -> list:
+    if not SOCKET_BACKLOG or (namespace or '/') != '/':
+        return []
+    skip = skip_sid if isinstance(skip_sid, list) else [skip_sid]
+    return [sid for sid in list(SOCKET_BACKLOG) if sid not in skip and targets_sid(sid, target)]
+
+
+def park_for_client(sid: str, event: str, data):
+    entry = SOCKET_BACKLOG[sid]
+    key = (event,) + tuple(data.get(f) for f in COALESCED_EVENTS[event]) if isinstance(data, dict) else (event,)
+    if key in entry['pending']:
+        entry['dropped'] += 1
+        SOCKET_DROPPED.inc((event,))
+    entry['pending'][key] = (event, data)
+    entry['deferred'] += 1
+    SOCKET_DEFERRED.inc((event,))
+
+
+def congested_skip_sids(event: str, data, target, namespace, skip_sid):
+    """Park `data` for this process's congested clients in `target`; returns skip_sid extended with them."""
+    parked = congested_recipients(target, namespace, skip_sid)
+    for sid in parked:
+        park_for_client(sid, event, data)
+    if not parked:
+        return skip_sid
+    return [s for s in (skip_sid if isinstance(skip_sid, list) else [skip_sid]) if s is not None] + parked
+
+
+def flush_congested(target, namespace, skip_sid):
+    """Deliver parked payloads to congested clients in `target` ahead of a one-shot event."""
+    for sid in congested_recipients(target, namespace, skip_sid):
+        entry = SOCKET_BACKLOG[sid]
+        pending, entry['pending'] = entry['pending'], {}
+        deliver_backlog(sid, pending)
+
+
+def install_backpressure():
+    """Wrap server.emit so coalesced broadcasts skip congested clients (keep after instrument_socketio)."""
+    server = socketio.server
+    raw_emit = _socket_drainer['emit'] = server.emit
+
+    @functools.wraps(raw_emit)
+    def bounded_emit(event, data=None, to=None, room=None, skip_sid=None, namespace=None, **kwargs):
+        ensure_socket_sweep()
+        if event in COALESCED_EVENTS and not kwargs.get('callback'):
+            skip_sid = congested_skip_sids(event, data, to or room, namespace, skip_sid)
+        else:
+            flush_congested(to or room, namespace, skip_sid)
+        return raw_emit(event, data=data, to=to, room=room, skip_sid=skip_sid, namespace=namespace, **kwargs)
+
+    server.emit = bounded_emit
+
+
+def deliver_backlog(sid: str, pending: dict):
+    emit_now = _socket_drainer['emit']
+    for event, data in pending.values():
+        if event == 'live_score_patch':
+            # Deltas in between were skipped: send a keyframe of the channel as it is now
+            ch = LIVE_CHANNELS.get((data['match_id'], data['alliance']))
+            if ch is None:
+                continue
+            data = live_keyframe(data['match_id'], data['alliance'], ch)
+        emit_now(event, data, to=sid, namespace='/', ignore_queue=True)  # sid is local to this process
+
+
+def disconnect_slow_socket(sid: str, depth: int):
+    SOCKET_BACKLOG.pop(sid, None)
+    SOCKET_SLOW_DISCONNECTS.inc()
+    app.logger.warning('disconnecting slow socket %s (%d packets queued)', sid, depth)
+    socketio.server.disconnect(sid, namespace='/')
+
+
+def sweep_sockets():
+    """One pass over this process's clients: mark congestion, deliver drained backlogs, drop slow clients."""
+    soft, hard = app.config['SOCKET_QUEUE_SOFT_LIMIT'], app.config['SOCKET_QUEUE_HARD_LIMIT']
+    now = time.monotonic()
+    connected = set()
+    for sid, eio_sid in list(socketio.server.manager.get_participants('/', None)):
+        connected.add(sid)
+        depth = client_queue_depth(eio_sid)
+        entry = SOCKET_BACKLOG.get(sid)
+        if depth < soft:
+            if entry is not None:
+                deliver_backlog(sid, SOCKET_BACKLOG.pop(sid)['pending'])
+            continue
+        SOCKET_QUEUE_DEPTH.observe((), depth)
+        if entry is None:
+            entry = SOCKET_BACKLOG[sid] = {'eio_sid': eio_sid, 'since': now, 'pending': {},
+                                           'deferred': 0, 'dropped': 0}
+        if (depth >= hard or len(entry['pending']) > app.config['SOCKET_PARKED_LIMIT']
+                or now - entry['since'] >= app.config['SOCKET_SLOW_DISCONNECT_SECONDS']):
+            disconnect_slow_socket(sid, depth)
+    for sid in [s for s in SOCKET_BACKLOG if s not in connected]:
+        SOCKET_BACKLOG.pop(sid, None)
+
+
+def _socket_sweep_loop():
+    while socketio.server.manager.rooms.get('/', {}).get(None):
+        socketio.sleep(app.config['SOCKET_DRAIN_INTERVAL'])
+        sweep_sockets()
+    SOCKET_BACKLOG.clear()
+    _socket_drainer['running'] = False
+
+
+def allow_inbound(sid: str) -> bool:
+    """Token bucket per socket: LIVE_UPDATE_RATE_HZ sustained, LIVE_UPDATE_BURST at once."""
+    rate, burst = app.config['LIVE_UPDATE_RATE_HZ'], app.config['LIVE_UPDATE_BURST']
+    now = time.monotonic()
+    bucket = INBOUND_BUCKETS.get(sid)
+    if bucket is None:
+        bucket = INBOUND_BUCKETS[sid] = [burst, now]
+    tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+    bucket[1] = now
+    if tokens < 1:
+        bucket[0] = tokens
+        return False
+    bucket[0] = tokens - 1
+    return True
+
+
+def socket_client_lag(sid: str, eio_sid: str) -> dict:
+    entry = SOCKET_BACKLOG.get(sid)
+    return {
+        'sid': sid,
+        'queue_depth': client_queue_depth(eio_sid),
+        'congested_ms': round((time.monotonic() - entry['since']) * 1000) if entry else 0,
+        'parked': len(entry['pending']) if entry else 0,
+        'deferred': entry['deferred'] if entry else 0,
+        'dropped': entry['dropped'] if entry else 0,
+    }
+
+
+def backpressure_gauges():
+    depths = [client_queue_depth(eio_sid) for _, eio_sid in socketio.server.manager.get_participants('/', None)]
+    yield '# HELP nrl_socket_max_queue_depth Deepest outbound Engine.IO queue across clients.'
+    yield '# TYPE nrl_socket_max_queue_depth gauge'
+    yield f'nrl_socket_max_queue_depth {max(depths, default=0)}'
+    yield '# HELP nrl_socket_congested_clients Clients currently skipped by coalesced broadcasts.'
+    yield '# TYPE nrl_socket_congested_clients gauge'
+    yield f'nrl_socket_congested_clients {len(SOCKET_BACKLOG)}'
+    yield '# HELP nrl_socket_parked_messages Newest-state payloads waiting for congested clients.'
+    yield '# TYPE nrl_socket_parked_messages gauge'
+    yield f"nrl_socket_parked_messages {sum(len(e['pending']) for e in SOCKET_BACKLOG.values())}"
+
+
+@app.route('/admin/socket_clients', methods=['GET'])
+def socket_clients():
+    clients = [socket_client_lag(sid, eio_sid) for sid, eio_sid in socketio.server.manager.get_participants('/', None)]
+    clients.sort(key=lambda c: (-c['queue_depth'], -c['congested_ms']))
+    return jsonify({'soft_limit': app.config['SOCKET_QUEUE_SOFT_LIMIT'],
+                    'hard_limit': app.config['SOCKET_QUEUE_HARD_LIMIT'], 'clients': clients}), 200
+
+
+# -----------------------------
+# Static snapshots (pre-rendered JSON for read-only displays)
+# -----------------------------
+# With SNAPSHOT_DIR set, score submits, finalisations, schedule uploads and
+# rule or event changes re-render the public views of the active event as
+# plain files under SNAPSHOT_DIR/<event code>/, so audience displays and
+# overlays can be served by any static file server or CDN:
+#   matches.json                 every match with teams, status and totals
+#   match/<id>/summary.json      same body as GET /match/<id>/summary
+#   results.json                 decided matches (both alliances final) and the current rankings
+#   match/<id>/live.json         referee drafts and timer of a match in play (live_snapshot)
+#   manifest.json                generated_ms and schedule version, written last and
+#                                only when another file changed
+# Each file also gets a .gz twin (gzip_static / Content-Encoding: gzip).
+# Files are written to a temp name and renamed into place, so readers never
+# see a partial file; bodies identical to the last write are skipped.
+# Live drafts only rewrite their match's live.json; every other trigger also
+# re-renders matches.json, results.json (with rankings) and the manifest.
+# Triggers within SNAPSHOT_DEBOUNCE_SECONDS are folded into one publish; a
+# failed publish keeps its work pending and retries after SNAPSHOT_RETRY_SECONDS.
+# One process publishes: whichever holds SNAPSHOT_DIR/.publisher.lock. Other
+# workers forward their triggers over app_sync (live state already reaches it
+# through live_set), and CLI commands publish directly when no server holds it.
+app.config.setdefault('SNAPSHOT_DIR', os.environ.get('NRL_SNAPSHOT_DIR', ''))
+app.config.setdefault('SNAPSHOT_DEBOUNCE_SECONDS', 0.5)
+app.config.setdefault('SNAPSHOT_RETRY_SECONDS', 5.0)
+
+SNAPSHOT_MATCH_FIELDS = MATCH_LIST_DEFAULT_FIELDS + ('red_total', 'blue_total', 'winner')
+# pending work: 'all' re-renders every match summary; 'matches' only the listed ones; 'schedule'
+# matches.json, results.json and the manifest; 'live' live.json files (live drafts mark nothing else)
+SNAPSHOT_DIRTY = {'all': False, 'schedule': False, 'matches': set(), 'live': set()}
+SNAPSHOT_STATS = {'publishes': 0, 'files_written': 0, 'files_unchanged': 0, 'last_ms': 0}
+SNAPSHOT_DIGESTS = {}  # { path: sha256 of the body last written there }
+# lock: (snapshot dir, pid, open lock file) while this process is the publisher
+_snapshot_task = {'running': False, 'lock': None, 'retry_at': 0.0}
+
+
+def snapshot_publisher() -> bool:
+    """Whether this process publishes snapshots; the first to lock SNAPSHOT_DIR/.publisher.lock keeps the job."""
+    root = app.config['SNAPSHOT_DIR']
+    held = _snapshot_task['lock']
+    if held is not None:
+        if held[:2] == (root, os.getpid()):
+            return True
+        held[2].close()  # SNAPSHOT_DIR changed, or a forked child
+        _snapshot_task['lock'] = None
+    if fcntl is None:
+        return True
+    if time.monotonic() < _snapshot_task['retry_at']:
+        return False
+    os.makedirs(root, exist_ok=True)
+    f = open(os.path.join(root, '.publisher.lock'), 'a')
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        _snapshot_task['retry_at'] = time.monotonic() + app.config['SNAPSHOT_RETRY_SECONDS']
+        return False
+    _snapshot_task['lock'] = (root, os.getpid(), f)
+    SNAPSHOT_DIGESTS.clear()
+    SNAPSHOT_DIRTY['all'] = True  # triggers seen by the previous publisher may not have been published
+    return True
+
+
+def mark_snapshot(match_ids=(), everything: bool = False, live_ids=(), schedule: bool = True):
+    SNAPSHOT_DIRTY['all'] = SNAPSHOT_DIRTY['all'] or everything
+    SNAPSHOT_DIRTY['schedule'] = SNAPSHOT_DIRTY['schedule'] or schedule or everything
+    SNAPSHOT_DIRTY['matches'].update(match_ids)
+    SNAPSHOT_DIRTY['live'].update(live_ids)
+    if not _snapshot_task['running']:
+        _snapshot_task['running'] = True
+        socketio.start_background_task(_snapshot_loop)
+
+
+def schedule_snapshot(*match_ids, everything: bool = False):
+    """Mark the schedule/results (and these match summaries, or all of them) for the next publish."""
+    if not app.config['SNAPSHOT_DIR']:
+        return
+    if snapshot_publisher():
+        mark_snapshot(match_ids, everything)
+    else:
+        publish_app_sync('snapshot', match_ids=list(match_ids), everything=everything)
+
+
+def schedule_live_snapshot(match_id: int):
+    """Mark a match's live.json; only the publisher acts, since live state reaches it through live_set."""
+    if app.config['SNAPSHOT_DIR'] and snapshot_publisher():
+        mark_snapshot(live_ids=(match_id,), schedule=False)
+
+
+def snapshot_pending() -> bool:
+    return bool(SNAPSHOT_DIRTY['all'] or SNAPSHOT_DIRTY['schedule'] or SNAPSHOT_DIRTY['matches']
+                or SNAPSHOT_DIRTY['live'])
+
+
+def take_snapshot_work() -> tuple:
+    """(match_ids or None for all, live_ids, schedule) for publish_snapshots; clears SNAPSHOT_DIRTY."""
+    work = (None if SNAPSHOT_DIRTY['all'] else sorted(SNAPSHOT_DIRTY['matches']), sorted(SNAPSHOT_DIRTY['live']),
+            SNAPSHOT_DIRTY['all'] or SNAPSHOT_DIRTY['schedule'])
+    SNAPSHOT_DIRTY.update({'all': False, 'schedule': False, 'matches': set(), 'live': set()})
+    return work
+
+
+def restore_snapshot_work(match_ids, live_ids, schedule):
+    mark_snapshot(match_ids or (), match_ids is None, live_ids, schedule)
+
+
+def _snapshot_loop():
+    try:
+        while snapshot_pending():
+            socketio.sleep(app.config['SNAPSHOT_DEBOUNCE_SECONDS'])
+            work = take_snapshot_work()
+            try:
+                DB_POOL.run('snapshot', publish_snapshots, *work)
+            except Exception:
+                app.logger.exception('snapshot publish failed; retrying')
+                restore_snapshot_work(*work)
+                socketio.sleep(app.config['SNAPSHOT_RETRY_SECONDS'])
+    finally:
+        _snapshot_task['running'] = False
+
+
+def flush_snapshots() -> dict | None:
+    """Publish pending work now, for CLI commands that exit before the debounce task runs."""
+    if not app.config['SNAPSHOT_DIR'] or not snapshot_publisher():
+        return None
+    if not snapshot_pending():
+        return None
+    return publish_snapshots(*take_snapshot_work())
+
+
+def write_snapshot_file(path: str, payload) -> bool:
+    """Atomically replace path (and path.gz) with payload as JSON; False when the body is unchanged."""
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    digest = hashlib.sha256(body).hexdigest()
+    if SNAPSHOT_DIGESTS.get(path) == digest and os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for target, data in ((path + '.gz', gzip.compress(body, mtime=0)), (path, body)):
+        tmp = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, target)
+    SNAPSHOT_DIGESTS[path] = digest
+    return True
+
+
+def publish_snapshots(match_ids=None, live_ids=(), schedule: bool = True) -> dict:
+    """
+    Render the active event's snapshot files: the match summaries in match_ids (all when None),
+    live.json for live_ids, and with schedule the match list, results and manifest.
+    """
+    event = current_event()
+    root = os.path.join(app.config['SNAPSHOT_DIR'], event.code if event else app.config['DEFAULT_EVENT_CODE'])
+    written = unchanged = 0
+
+    def write(relpath, payload):
+        nonlocal written, unchanged
+        if write_snapshot_file(os.path.join(root, relpath), payload):
+            written += 1
+        else:
+            unchanged += 1
+
+    if schedule:
+        version = db.session.scalar(db.select(db.func.max(Match.updated_seq))) or 0  # before the rows, as in /matches
+        rows = db.session.execute(db.select(*(MATCH_LIST_COLUMNS[f] for f in SNAPSHOT_MATCH_FIELDS))
+                                  .order_by(Match.match_number)).all()
+        matches = []
+        for row in rows:
+            item = dict(zip(SNAPSHOT_MATCH_FIELDS, row))
+            item['red_teams'], item['blue_teams'] = split_teams(item['red_teams']), split_teams(item['blue_teams'])
+            matches.append(item)
+        write('matches.json', {'matches': matches, 'version': version})
+
+    if match_ids is None or match_ids:
+        stmt = match_with_scores_query().order_by(Match.match_number)
+        if match_ids is not None:
+            stmt = stmt.where(Match.id.in_(match_ids))
+        for match, red_score, blue_score in db.session.execute(stmt.execution_options(yield_per=SUMMARY_YIELD_PER)):
+            write(f'match/{match.id}/summary.json', match_summary_dict(match, red_score, blue_score))
+    for match_id in live_ids:
+        live = live_snapshot(match_id)
+        live.pop('server_now_ms')
+        write(f'match/{match_id}/live.json', live)
+
+    SNAPSHOT_STATS['publishes'] += 1
+    if schedule:
+        write('results.json', {
+            'matches': [m for m in matches if m['winner'] is not None],
+            'rankings': rankings_payload()['rankings'],
+            'version': version,
+        })
+        if written or not os.path.exists(os.path.join(root, 'manifest.json')):
+            SNAPSHOT_STATS['last_ms'] = now_ms()
+            write('manifest.json', {'event': event.code if event else None,
+                                    'generated_ms': SNAPSHOT_STATS['last_ms'], 'version': version,
+                                    'matches': len(matches)})
+    SNAPSHOT_STATS['files_written'] += written
+    SNAPSHOT_STATS['files_unchanged'] += unchanged
+    return {'written': written, 'unchanged': unchanged}
+
+
+@app.cli.command('publish-snapshots')
+def publish_snapshots_command():
+    """Re-render every static snapshot file of the active event now."""
+    if not app.config['SNAPSHOT_DIR']:
+        raise click.ClickException('Set NRL_SNAPSHOT_DIR first')
+    init_db()
+    if not snapshot_publisher():
+        raise click.ClickException('A running server is publishing snapshots for this SNAPSHOT_DIR')
+    result = publish_snapshots()
+    print(f"{result['written']} files written, {result['unchanged']} unchanged "
+          f"in {os.path.join(app.config['SNAPSHOT_DIR'], current_event().code)}")
+
+
+# -----------------------------
+# Events (one SQLite file per event)
+# -----------------------------
+# The Event registry, users and scoring rules stay in the main DB; every
+# other table is per event. The default event (DEFAULT_EVENT_CODE) keeps
+# using the main DB, so existing installs carry on unchanged; events created
+# through POST /events get <code>.db in EVENT_DB_DIR. Requests pick an event
+# with the X-NRL-Event header or ?event=<code>, otherwise they get the active
+# event, which is also the only one that accepts writes, live sockets and
+# the in-memory caches (rankings, live state, timers). Archived events are
+# compacted once and then opened read-only (immutable), off the hot path.
+GLOBAL_TABLES = {'user', 'event', 'scoring_rule_set'}
+EVENT_CODE_MAX = 40
+EVENTS = {'by_code': {}, 'active': None}   # plain snapshots of the Event rows
+EVENT_ENGINES = {}                         # { code: Engine } for file-backed events
+EVENT_ENGINES_LOCK = threading.Lock()
+EVENT_ADMIN_ENDPOINTS = {'create_event', 'activate_event', 'archive_event'}
+
+
+def event_tables():
+    return [t for t in db.metadata.sorted_tables if t.name not in GLOBAL_TABLES]
+
+
+def event_db_dir() -> str:
+    return app.config['EVENT_DB_DIR'] or os.path.join(app.instance_path, 'events')
+
+
+def current_event():
+    """The event this request (or DB_POOL job) asked for, else the active event."""
+    if has_app_context() and 'nrl_event' in g:
+        return g.nrl_event
+    return EVENTS['active']
+
+
+def current_event_is_active() -> bool:
+    event = current_event()
+    return event is None or event.active
+
+
+def event_engine(event):
+    if not event.db_file:
+        return db.engine
+    engine = EVENT_ENGINES.get(event.code)
+    if engine is None:
+        with EVENT_ENGINES_LOCK:
+            engine = EVENT_ENGINES.get(event.code)
+            if engine is None:
+                path = os.path.join(event_db_dir(), event.db_file)
+                url = (f'sqlite:///file:{path}?mode=ro&immutable=1&uri=true' if event.status == 'archived'
+                       else f'sqlite:///{path}')
+                engine = EVENT_ENGINES[event.code] = create_engine(url)
+    return engine
+
+
+def event_bind(mapper, clause):
+    """EventSession hook: engine of the current event for event-scoped statements, else None (main DB)."""
+    event = current_event()
+    if event is None or not event.db_file:
+        return None
+    if mapper is not None:
+        tables = [sa_inspect(mapper).local_table]
+    elif clause is not None:
+        tables = find_tables(clause, include_crud=True)
+    else:
+        tables = []
+    if tables and all(t.name in GLOBAL_TABLES for t in tables):
+        return None
+    return event_engine(event)
+
+
+def event_ref(ev: Event) -> SimpleNamespace:
+    return SimpleNamespace(id=ev.id, code=ev.code, name=ev.name, season=ev.season or '', db_file=ev.db_file or '',
+                           status=ev.status, active=ev.active, created_ms=ev.created_ms, archived_ms=ev.archived_ms)
+
+
+def event_refs() -> dict:
+    return {ev.code: event_ref(ev) for ev in Event.query.order_by(Event.id)}
+
+
+def load_events():
+    refs = DB_POOL.run('events', event_refs)
+    with EVENT_ENGINES_LOCK:
+        for code in list(EVENT_ENGINES):
+            ref = refs.get(code)
+            if ref is None or ref.status == 'archived':
+                EVENT_ENGINES.pop(code).dispose()  # reopened read-only on next use
+    EVENTS['by_code'] = refs
+    EVENTS['active'] = next((ref for ref in refs.values() if ref.active), None)
+
+
+def init_events():
+    """Register the main DB as the default event on first run; bring open event files up to date."""
+    if not db.session.scalar(db.select(Event.id).limit(1)):
+        db.session.add(Event(code=app.config['DEFAULT_EVENT_CODE'], name='Default event', db_file='',
+                             status='open', active=True, created_ms=now_ms()))
+        db.session.commit()
+    load_events()
+    for ref in EVENTS['by_code'].values():
+        if ref.db_file and ref.status != 'archived':
+            db.metadata.create_all(event_engine(ref), tables=event_tables())
+            ensure_schema(event_engine(ref), event_tables())
+
+
+def reset_event_state():
+    """
+    Drop the in-memory state that belonged to the previously active event.
+    Per-socket state (room membership, LIVE_PATCH_SIDS) stays with its socket,
+    and timers are kept per event (see timer_scope).
+    """
+    LIVE_CHANNELS.clear()
+    LIVE_MATCHES.clear()
+    LIVE_CLOSED.clear()
+    LIVE_OPEN.clear()
+    LIVE_SYNC_PENDING.clear()
+    RANKINGS_CACHE['payload'] = None
+
+
+def event_dict(ref) -> dict:
+    return {k: getattr(ref, k) for k in ('code', 'name', 'season', 'status', 'active', 'created_ms', 'archived_ms')}
+
+
+@app.before_request
+def resolve_request_event():
+    code = request.headers.get('X-NRL-Event') or request.args.get('event')
+    if not code:
+        g.pop('nrl_event', None)
+        return None
+    event = EVENTS['by_code'].get(code)
+    if event is None:
+        return jsonify({'error': f'Unknown event: {code}'}), 404
+    g.nrl_event = event
+    if (request.method not in ('GET', 'HEAD', 'OPTIONS') and not event.active
+            and request.endpoint not in EVENT_ADMIN_ENDPOINTS):
+        state = 'archived' if event.status == 'archived' else 'not the active event'
+        return jsonify({'error': f'Event {code} is {state}; it is read-only'}), 409
+    return None
+
+
+@app.route('/events', methods=['GET'])
+def list_events():
+    return jsonify({'active': EVENTS['active'].code if EVENTS['active'] else None,
+                    'events': [event_dict(ref) for ref in EVENTS['by_code'].values()]}), 200
+
+
+@app.route('/events', methods=['POST'])
+def create_event():
+    """Body: {"code": "spring-open", "name": "...", "season": "2026", "activate": false}"""
+    data = request.json or {}
+    code = str(data.get('code') or '').strip().lower()
+    if not code or len(code) > EVENT_CODE_MAX or not all(c.isalnum() or c in '-_' for c in code):
+        return jsonify({'error': f'code must be 1-{EVENT_CODE_MAX} letters, digits, - or _'}), 400
+    if code in EVENTS['by_code']:
+        return jsonify({'error': f'Event {code} already exists'}), 409
+
+    DB_POOL.run('create_event', add_event, code, str(data.get('name') or code)[:120],
+                str(data.get('season') or '')[:20])
+    load_events()
+    publish_app_sync('events')
+    bump_version('events')
+    if data.get('activate'):
+        activate_event(code)
+    return jsonify({'message': f'Event {code} created', 'event': event_dict(EVENTS['by_code'][code])}), 201
+
+
+def add_event(code: str, name: str, season: str):
+    """Create the event's database file and register it (runs on DB_POOL)."""
+    os.makedirs(event_db_dir(), exist_ok=True)
+    ev = Event(code=code, name=name, season=season, db_file=f'{code}.db', status='open', active=False,
+               created_ms=now_ms())
+    engine = create_engine(f"sqlite:///{os.path.join(event_db_dir(), ev.db_file)}")
+    db.metadata.create_all(engine, tables=event_tables())
+    engine.dispose()
+    db.session.add(ev)
+    db.session.commit()
+
+
+def mark_event_active(code: str):
+    Event.query.update({Event.active: Event.code == code})
+    db.session.commit()
+
+
+@app.route('/events/<code>/activate', methods=['POST'])
+def activate_event(code):
+    ref = EVENTS['by_code'].get(code)
+    if ref is None:
+        return jsonify({'error': 'Event not found'}), 404
+    if ref.status == 'archived':
+        return jsonify({'error': f'Event {code} is archived'}), 409
+    if not ref.active:
+        DB_POOL.run('activate_event', mark_event_active, code)
+        load_events()
+        reset_event_state()
+        rescored = DB_POOL.run('activate_event', rescore_event_if_stale, code)
+        publish_app_sync('events')
+        bump_version('events', 'schedule', 'results', 'teams', 'team_stats')
+        if rescored is not None:
+            match_ids, teams = rescored
+            bump_version(*(f'match:{m}' for m in match_ids), *(f'team:{t}' for t in teams))
+        schedule_snapshot(everything=True)
+        socketio.emit('event_activated', {'code': code, 'name': ref.name}, to=EVENT_ROOM)
+    return jsonify({'message': f'Event {code} is active', 'event': event_dict(EVENTS['by_code'][code])}), 200
+
+
+def compact_event_db(path: str):
+    """Fold the WAL back in, drop free pages and refresh planner stats, then make the file read-only."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA optimize')
+    finally:
+        conn.close()
+    os.chmod(path, 0o444)
+
+
+def archive_event_db(code: str, db_file: str):
+    """Compact the event's file, if it has one, and mark the event archived (runs on DB_POOL)."""
+    if db_file:
+        compact_event_db(os.path.join(event_db_dir(), db_file))
+    Event.query.filter_by(code=code).update({Event.status: 'archived', Event.archived_ms: now_ms()})
+    db.session.commit()
+
+
+@app.route('/events/<code>/archive', methods=['POST'])
+def archive_event(code):
+    ref = EVENTS['by_code'].get(code)
+    if ref is None:
+        return jsonify({'error': 'Event not found'}), 404
+    if ref.active:
+        return jsonify({'error': 'Activate another event before archiving this one'}), 409
+    if ref.status != 'archived':
+        if ref.db_file:
+            with EVENT_ENGINES_LOCK:
+                engine = EVENT_ENGINES.pop(code, None)
+            if engine is not None:
+                engine.dispose()
+        DB_POOL.run('archive_event', archive_event_db, code, ref.db_file)
+        load_events()
+        publish_app_sync('events')
+        bump_version('events')
+    return jsonify({'message': f'Event {code} archived', 'event': event_dict(EVENTS['by_code'][code])}), 200
+
+
+def season_team_stats(events) -> list:
+    """Sum TeamStats across the given events' databases, one read per event file."""
+    teams = {}
+    for ref in events:
+        with event_engine(ref).connect() as conn:
+            for row in conn.execute(db.select(TeamStats.__table__)).mappings():
+                t = teams.get(row['team_number'])
+                if t is None:
+                    t = teams[row['team_number']] = {'team_number': row['team_number'], 'events': [],
+                                                     'max_contribution': 0, **dict.fromkeys(TEAM_STAT_COUNTERS, 0)}
+                t['events'].append(ref.code)
+                for counter in TEAM_STAT_COUNTERS:
+                    t[counter] += row[counter] or 0
+                t['max_contribution'] = max(t['max_contribution'], row['max_contribution'] or 0)
+    for t in teams.values():
+        played = t['matches_played']
+        t['average_contribution'] = round(t['total_contribution'] / played, 2) if played else 0.0
+    return sorted(teams.values(), key=lambda t: (-t['average_contribution'], t['team_number']))
+
+
+@app.route('/season/stats', methods=['GET'])
+@cached_response(lambda: ('events', 'team_stats'))
+def season_stats():
+    """Cross-event team totals: ?season=2026 and/or ?events=code1,code2 (default: every event)."""
+    season = request.args.get('season')
+    codes = [c for c in (request.args.get('events') or '').split(',') if c]
+    events = [ref for ref in EVENTS['by_code'].values()
+              if (season is None or ref.season == season) and (not codes or ref.code in codes)]
+    teams = DB_POOL.run('season_stats', season_team_stats, events)
+    return jsonify({'season': season, 'events': [ref.code for ref in events], 'teams': teams}), 200
+
+
+# -----------------------------
+# Multi-process state sync (app_sync)
+# -----------------------------
+# Socket.IO traffic is shared by the client manager; these notices keep the
+# per-process caches and live state of the other workers in step. Handlers
+# apply the change locally and never publish again.
+def publish_app_sync(kind: str, **payload):
+    """Tell the other worker processes about a local state change; no-op without a message queue."""
+    manager = socketio.server.manager
+    if isinstance(manager, AppSyncMixin):
+        manager.publish_app_sync(kind, payload)
+
+
+def _sync_live_set(entries):
+    for match_id, field, value in entries:
+        if match_id not in LIVE_CLOSED:
+            _live_match(match_id)[field] = value
+            schedule_live_snapshot(match_id)
+
+
+def _sync_patch_sid(match_id, sid, subscribed):
+    if subscribed:
+        LIVE_PATCH_SIDS.setdefault(match_id, set()).add(sid)
+    elif match_id is not None:
+        LIVE_PATCH_SIDS.get(match_id, set()).discard(sid)
+    else:
+        for sids in LIVE_PATCH_SIDS.values():
+            sids.discard(sid)
+
+
+def _sync_snapshot(match_ids, everything):
+    if app.config['SNAPSHOT_DIR'] and snapshot_publisher():
+        mark_snapshot(match_ids, everything)
+
+
+def _sync_events():
+    before = EVENTS['active'] and EVENTS['active'].code
+    load_events()
+    if (EVENTS['active'] and EVENTS['active'].code) != before:
+        reset_event_state()
+
+
+APP_SYNC_HANDLERS = {
+    'bump': lambda resources: bump_local_version(*resources),
+    'rankings': lambda: RANKINGS_CACHE.update(payload=None),   # recomputed on the next /rankings
+    'rules': load_scoring_rules,
+    'live_set': _sync_live_set,
+    'live_drop': close_live_match,
+    'patch_sid': _sync_patch_sid,
+    'events': _sync_events,
+    'snapshot': _sync_snapshot,
+}
+
+
+def apply_app_sync(kind: str, payload: dict):
+    handler = APP_SYNC_HANDLERS.get(kind)
+    if handler is None:
+        return
+    try:
+        with app.app_context():
+            handler(**payload)
+    except Exception:
+        app.logger.exception('app_sync %s from another worker failed', kind)
+
+
+def start_message_queue():
+    """Start listening now rather than on first socket use, so HTTP-only workers still get app_sync."""
+    server = socketio.server
+    if isinstance(server.manager, AppSyncMixin) and not server.manager_initialized:
+        server.manager_initialized = True
+        server.manager.initialize()
+
+
+def run_workers(count: int):
+    """
+    Run `count` copies of this server on one port (SO_REUSEPORT spreads new
+    connections across them). Each WebSocket stays on the worker that
+    accepted it; long-polling clients need a sticky proxy in front instead.
+    """
+    if not app.config['SOCKETIO_MESSAGE_QUEUE']:
+        raise SystemExit('NRL_WORKERS > 1 needs NRL_MESSAGE_QUEUE (e.g. redis://localhost:6379/0 '
+                         'or sqlite:///instance/socketio_broker.db)')
+    with app.app_context():
+        init_db()  # once, before the workers start
+    env = dict(os.environ, NRL_WORKERS='1')
+    env.setdefault('NRL_TIMER_BACKEND', 'sqlite')  # timers must be shared too
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env) for _ in range(count)]
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for proc in procs:
+            proc.wait()
+    finally:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in procs:
+            proc.wait()
+
 
 # -----------------------------
 # Bootstrap & run
 # -----------------------------
+instrument_socketio()  # keep after every @socketio.on handler
+install_backpressure()
+
+
+@app.cli.command('backfill-golden')
+def backfill_golden_command():
+    """Re-encode every stored golden_charge_stack into golden_heights and rescore the entries that changed."""
+    init_db()
+    written = backfill_golden_heights(everything=True)
+    if written:
+        recompute_score_totals()
+        refresh_match_results()
+        rebuild_team_tables()
+        db.session.commit()
+        bump_version('schedule', 'results', 'teams', 'team_stats')
+        publish_app_sync('rankings')
+        schedule_snapshot(everything=True)
+        flush_snapshots()
+    points = db.session.scalar(db.select(db.func.coalesce(db.func.sum(ScoreEntry.golden_points), 0)))
+    print(f'{written} score entries re-encoded; {points} golden points in total')
+
+
 if __name__ == '__main__':
+    if app.config['WORKERS'] > 1:
+        run_workers(app.config['WORKERS'])
+        sys.exit(0)
     with app.app_context():
-        db.create_all()
+        init_db()
+    start_message_queue()
     # Use socketio.run to serve both HTTP + websockets
-    socketio.run(app, host='0.0.0.0', port=5000)
+    socketio.run(app, host=os.environ.get('NRL_HOST', '0.0.0.0'), port=int(os.environ.get('NRL_PORT', 5000)))
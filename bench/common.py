@@ -0,0 +1,97 @@
+"""Shared helpers for the bench/ scripts: run app.py on a temp DB and time HTTP calls."""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def post(url, body=None, data=None, headers=None):
+    req = urllib.request.Request(url, data=data if data is not None else json.dumps(body).encode(),
+                                 headers=headers or {'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.status, resp.read()
+
+
+def get(url, headers=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.status, resp.read()
+
+
+def start_server(tmpdir, mode='group', extra_env=None, port=None):
+    """Start app.py against <tmpdir>/bench.db; returns (process, base_url)."""
+    port = port or free_port()
+    env = dict(os.environ,
+               NRL_DATABASE_URI=f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+               NRL_HOST='127.0.0.1', NRL_PORT=str(port), NRL_SCORE_WRITE_MODE=mode,
+               **(extra_env or {}))
+    proc = subprocess.Popen([sys.executable, APP], env=env, cwd=tmpdir,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(200):
+        try:
+            urllib.request.urlopen(base + '/matches', timeout=1).read()
+            return proc, base
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError('server did not start')
+
+
+def schedule_csv(n_matches: int) -> bytes:
+    rows = '\n'.join(f'{i},{i % 40},{i % 40 + 100},{i % 40 + 200},{i % 40 + 300}' for i in range(1, n_matches + 1))
+    return ('Match No.,Red Team 1,Red Team 2,Blue Team 1,Blue Team 2\n' + rows).encode()
+
+
+def upload_schedule(base, n_matches):
+    boundary = 'benchboundary'
+    data = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="s.csv"\r\n'
+            f'Content-Type: text/csv\r\n\r\n').encode() + schedule_csv(n_matches) + f'\r\n--{boundary}--\r\n'.encode()
+    return post(base + '/upload_schedule', data=data,
+                headers={'Content-Type': f'multipart/form-data; boundary={boundary}'})
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def latency_stats(latencies_ms, elapsed_s=None) -> dict:
+    stats = {
+        'count': len(latencies_ms),
+        'p50_ms': round(percentile(latencies_ms, 50), 2) if latencies_ms else None,
+        'p95_ms': round(percentile(latencies_ms, 95), 2) if latencies_ms else None,
+        'p99_ms': round(percentile(latencies_ms, 99), 2) if latencies_ms else None,
+        'max_ms': round(max(latencies_ms), 2) if latencies_ms else None,
+    }
+    if elapsed_s:
+        stats['throughput_per_s'] = round(len(latencies_ms) / elapsed_s, 1)
+    return stats
+
+
+class Timer:
+    """Collects per-call latencies: with timer: ... ; timer.samples in ms."""
+
+    def __init__(self):
+        self.samples = []
+
+    def __enter__(self):
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append((time.perf_counter() - self._t) * 1000)
@@ -0,0 +1,208 @@
+"""
+Event-day load test for app.py: HTTP and Socket.IO paths under one run.
+
+Starts app.py on a fresh temp SQLite DB, then:
+  1. uploads a schedule (--schedule-matches rows) --uploads times
+  2. connects --viewers Socket.IO clients spread across --live-matches
+     match rooms
+  3. runs --referees clients emitting live_score_update at --rate Hz each
+     for --duration seconds; every draft carries its send time so viewers
+     measure emit -> receipt fan-out latency
+  4. fires a burst of --burst concurrent POST /score calls, then
+     POST /finalise_score for every live match
+
+Reports count, throughput and p50/p95/p99 per endpoint and per socket
+event, and writes the JSON to --out (stdout otherwise) so runs can be
+compared over time.
+
+Requires the Socket.IO client: pip install "python-socketio[client]"
+
+    python bench/load_test.py --referees 4 --viewers 60 --duration 10 --out run.json
+"""
+import argparse
+import json
+import platform
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+
+from common import Timer, get, latency_stats, post, start_server, upload_schedule
+
+BENCH_TS = '_bench_sent_ms'   # extra breakdown key the server passes through untouched
+
+
+def wall_ms() -> float:
+    return time.time() * 1000
+
+
+def connect_client(base, match_id, on_score=None):
+    client = socketio.Client(reconnection=False)
+    if on_score:
+        client.on('score_update', on_score)
+    client.connect(base, transports=['websocket'])
+    client.emit('join_match', {'match_id': match_id})
+    return client
+
+
+def run_uploads(base, n_matches, times):
+    timer = Timer()
+    t0 = time.perf_counter()
+    for _ in range(times):
+        with timer:
+            upload_schedule(base, n_matches)
+    return latency_stats(timer.samples, time.perf_counter() - t0)
+
+
+def run_live(base, args):
+    live_matches = list(range(1, args.live_matches + 1))
+    fanout = []
+    received = {'count': 0}
+    lock = threading.Lock()
+
+    def on_score(data):
+        sent = (data.get('score_breakdown') or {}).get(BENCH_TS)
+        if sent is None:
+            return
+        lag = wall_ms() - sent
+        with lock:
+            fanout.append(lag)
+            received['count'] += 1
+
+    viewers = [connect_client(base, live_matches[i % len(live_matches)], on_score) for i in range(args.viewers)]
+    referees = [connect_client(base, live_matches[i % len(live_matches)]) for i in range(args.referees)]
+    time.sleep(0.5)  # let joins land
+
+    emitted = {'count': 0}
+    emit_timer = Timer()
+    stop = time.perf_counter() + args.duration
+
+    def referee_loop(i, client):
+        match_id = live_matches[i % len(live_matches)]
+        alliance = 'red' if (i // len(live_matches)) % 2 == 0 else 'blue'
+        interval = 1.0 / args.rate
+        charge = 0
+        rng = random.Random(i)
+        while time.perf_counter() < stop:
+            charge += 1
+            breakdown = {
+                'alliance_charge': charge, 'captured_charge': rng.randint(0, 4), 'docked': rng.randint(0, 2),
+                'golden_charge_stack': [[False] * 4, [False] * 4, [True, False, False, False], [True] * 4],
+                BENCH_TS: wall_ms(),
+            }
+            with emit_timer:
+                client.emit('live_score_update', {'match_id': match_id, 'alliance': alliance,
+                                                  'score_breakdown': breakdown})
+            with lock:
+                emitted['count'] += 1
+            time.sleep(interval * rng.uniform(0.5, 1.5))
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=referee_loop, args=(i, c)) for i, c in enumerate(referees)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    time.sleep(1.0)  # drain the last ticks
+    elapsed = time.perf_counter() - t0
+
+    for c in viewers + referees:
+        c.disconnect()
+    return {
+        'live_score_update': {
+            'emitted': emitted['count'],
+            'emit_rate_per_s': round(emitted['count'] / elapsed, 1),
+            'client_emit': latency_stats(emit_timer.samples),
+        },
+        'score_update_fanout': {
+            'viewers': args.viewers,
+            'received': received['count'],
+            'received_per_s': round(received['count'] / elapsed, 1),
+            **latency_stats(fanout),
+        },
+    }
+
+
+def run_burst(base, args):
+    live_matches = list(range(1, args.live_matches + 1))
+
+    def submit(i):
+        match_id = live_matches[i % len(live_matches)]
+        alliance = 'red' if (i // len(live_matches)) % 2 == 0 else 'blue'
+        t = time.perf_counter()
+        post(f'{base}/score/{match_id}/{alliance}', {'alliance_charge': i % 9, 'docked': 1, 'submitted_by': 1})
+        return (time.perf_counter() - t) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.burst) as pool:
+        score_lat = list(pool.map(submit, range(args.burst * 4)))
+    score_elapsed = time.perf_counter() - t0
+
+    def finalise(match_id):
+        t = time.perf_counter()
+        post(f'{base}/finalise_score', {'match_id': match_id, 'confirmed_by': 2})
+        return (time.perf_counter() - t) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(8, len(live_matches))) as pool:
+        final_lat = list(pool.map(finalise, live_matches))
+    final_elapsed = time.perf_counter() - t0
+
+    read_timer = Timer()
+    t0 = time.perf_counter()
+    for match_id in live_matches * 5:
+        with read_timer:
+            get(f'{base}/match/{match_id}/summary')
+    read_elapsed = time.perf_counter() - t0
+
+    return {
+        'POST /score': latency_stats(score_lat, score_elapsed),
+        'POST /finalise_score': latency_stats(final_lat, final_elapsed),
+        'GET /match/<id>/summary': latency_stats(read_timer.samples, read_elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--referees', type=int, default=4)
+    parser.add_argument('--viewers', type=int, default=40)
+    parser.add_argument('--live-matches', type=int, default=2)
+    parser.add_argument('--rate', type=float, default=5.0, help='live_score_update per referee per second')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--schedule-matches', type=int, default=2000)
+    parser.add_argument('--uploads', type=int, default=3)
+    parser.add_argument('--burst', type=int, default=16, help='concurrent /score submitters')
+    parser.add_argument('--mode', default='group', help='SCORE_WRITE_MODE for the server')
+    parser.add_argument('--out', help='write results JSON here')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        proc, base = start_server(tmpdir, args.mode)
+        try:
+            http = {'POST /upload_schedule': run_uploads(base, args.schedule_matches, args.uploads)}
+            sockets = run_live(base, args)
+            http.update(run_burst(base, args))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    result = {
+        'benchmark': 'load_test',
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'params': vars(args),
+        'http': http,
+        'socket': sockets,
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+p50/p99 latency of POST /score/<match_id>/<alliance> with 1, 8 and 32
+concurrent submitters, for each score write mode ('direct' vs 'group').
+
+Each run starts app.py in a subprocess against a fresh temp SQLite DB.
+
+    python bench/score_submit_latency.py [--requests 400] [--out results.json]
+"""
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import percentile, post, start_server, upload_schedule
+
+
+def run_submitters(base, concurrency, n_requests):
+    def one(i):
+        match_id = i % 16 + 1
+        alliance = 'red' if (i // 16) % 2 == 0 else 'blue'
+        t = time.perf_counter()
+        post(f'{base}/score/{match_id}/{alliance}', {'alliance_charge': i % 9, 'docked': 1})
+        return (time.perf_counter() - t) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(n_requests)))
+    elapsed = time.perf_counter() - t0
+    return {
+        'concurrency': concurrency,
+        'requests': n_requests,
+        'throughput_rps': round(n_requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', default='1,8,32')
+    parser.add_argument('--modes', default='direct,group')
+    parser.add_argument('--out', help='write results JSON here')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes.split(','):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            proc, base = start_server(tmpdir, mode)
+            try:
+                upload_schedule(base, 16)
+                for c in (int(x) for x in args.concurrency.split(',')):
+                    row = {'mode': mode, **run_submitters(base, c, args.requests)}
+                    results.append(row)
+                    print(f"{mode:>6}  c={row['concurrency']:<3} {row['throughput_rps']:>8} req/s  "
+                          f"p50={row['p50_ms']:>7} ms  p99={row['p99_ms']:>7} ms")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'benchmark': 'score_submit_latency', 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
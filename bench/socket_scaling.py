@@ -0,0 +1,221 @@
+"""
+Connected-viewer capacity vs number of server worker processes.
+
+For each --workers count, starts app.py with NRL_WORKERS=<n> sharing one
+port (workers > 1 fan out through NRL_MESSAGE_QUEUE; the default is the
+SQLite stand-in broker in the temp dir, pass --queue redis://... to use
+Redis), then for each --steps viewer count:
+  1. --client-procs processes connect the viewers over WebSocket, spread
+     across --live-matches match rooms
+  2. one referee client per match alliance emits live_score_update at
+     --rate Hz for --duration seconds, each draft stamped with its send time
+  3. viewers report every score_update they received and its fan-out
+     latency (emit -> receipt)
+
+A step passes when every viewer connected, at least --min-delivery of the
+expected updates arrived and p95 fan-out stayed under --slo-ms. The
+capacity of a worker count is its largest passing step; later steps are
+skipped once one fails.
+
+Requires the Socket.IO client: pip install "python-socketio[client]"
+
+    python bench/socket_scaling.py --workers 1,2,4 --steps 100,200,400,800 --out scaling.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import tempfile
+import threading
+import time
+
+import socketio
+
+from common import latency_stats, start_server, upload_schedule
+
+BENCH_TS = '_bench_sent_ms'   # extra breakdown key the server passes through untouched
+
+
+def wall_ms() -> float:
+    return time.time() * 1000
+
+
+def viewer_proc(base, match_ids, first, count, ready, stop, results):
+    """Connect viewers first..first+count-1 (viewer i watches match_ids[i % len]); report once stopped."""
+    lock = threading.Lock()
+    lags, received = [], {}
+    clients = []
+
+    def make_handler(match_id):
+        def on_score(data):
+            sent = (data.get('score_breakdown') or {}).get(BENCH_TS)
+            if sent is None or data.get('match_id') != match_id:
+                return
+            with lock:
+                lags.append(wall_ms() - sent)
+                received[match_id] = received.get(match_id, 0) + 1
+        return on_score
+
+    for i in range(first, first + count):
+        match_id = match_ids[i % len(match_ids)]
+        client = socketio.Client(reconnection=False)
+        client.on('score_update', make_handler(match_id))
+        try:
+            client.connect(base, transports=['websocket'], wait_timeout=10)
+            client.emit('join_match', {'match_id': match_id})
+            clients.append(client)
+        except Exception:
+            pass
+    ready.put(len(clients))
+    stop.wait()
+    time.sleep(1.0)  # let the last updates land
+    results.put({'lags': lags, 'received': received, 'connected': len(clients)})
+    for client in clients:
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+
+
+def run_referees(base, match_ids, rate, duration):
+    """One referee per (match, alliance); returns drafts emitted per match."""
+    referees = []
+    for match_id in match_ids:
+        for alliance in ('red', 'blue'):
+            client = socketio.Client(reconnection=False)
+            client.connect(base, transports=['websocket'])
+            referees.append((client, match_id, alliance))
+    emitted = {m: 0 for m in match_ids}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def loop(client, match_id, alliance):
+        charge = 0
+        while time.perf_counter() < stop_at:
+            charge += 1
+            client.emit('live_score_update', {'match_id': match_id, 'alliance': alliance,
+                                              'score_breakdown': {'alliance_charge': charge, BENCH_TS: wall_ms()}})
+            with lock:
+                emitted[match_id] += 1
+            time.sleep(1.0 / rate)
+
+    threads = [threading.Thread(target=loop, args=r) for r in referees]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for client, _, _ in referees:
+        client.disconnect()
+    return emitted
+
+
+def run_step(base, viewers, args):
+    match_ids = list(range(1, args.live_matches + 1))
+    ctx = multiprocessing.get_context('spawn')
+    ready, results, stop = ctx.Queue(), ctx.Queue(), ctx.Event()
+    per_proc = -(-viewers // args.client_procs)
+    procs = []
+    for first in range(0, viewers, per_proc):
+        proc = ctx.Process(target=viewer_proc,
+                           args=(base, match_ids, first, min(per_proc, viewers - first), ready, stop, results))
+        proc.start()
+        procs.append(proc)
+    connected = sum(ready.get(timeout=300) for _ in procs)
+    time.sleep(0.5)  # let joins land
+
+    t0 = time.perf_counter()
+    emitted = run_referees(base, match_ids, args.rate, args.duration)
+    stop.set()
+    reports = [results.get(timeout=120) for _ in procs]
+    elapsed = time.perf_counter() - t0
+    for proc in procs:
+        proc.join()
+
+    lags = [lag for r in reports for lag in r['lags']]
+    received = sum(n for r in reports for n in r['received'].values())
+    watching = {m: sum(1 for i in range(viewers) if match_ids[i % len(match_ids)] == m) for m in match_ids}
+    expected = sum(emitted[m] * watching[m] for m in match_ids)
+    delivery = received / expected if expected else 0.0
+    fanout = latency_stats(lags)
+    passed = (connected == viewers and delivery >= args.min_delivery
+              and fanout['p95_ms'] is not None and fanout['p95_ms'] <= args.slo_ms)
+    return {
+        'viewers': viewers,
+        'connected': connected,
+        'updates_expected': expected,
+        'updates_received': received,
+        'delivery_ratio': round(delivery, 4),
+        'received_per_s': round(received / elapsed, 1),
+        'fanout': fanout,
+        'passed': passed,
+    }
+
+
+def run_workers(workers, args):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {'NRL_WORKERS': str(workers)}
+        if workers > 1 or args.queue:
+            env['NRL_MESSAGE_QUEUE'] = args.queue or f"sqlite:///{os.path.join(tmpdir, 'socketio_broker.db')}"
+        proc, base = start_server(tmpdir, extra_env=env)
+        try:
+            time.sleep(1.0 + 0.25 * workers)  # every worker bound to the port
+            upload_schedule(base, max(args.live_matches, 10))
+            steps = []
+            for viewers in args.steps:
+                step = run_step(base, viewers, args)
+                steps.append(step)
+                print(f"workers={workers} viewers={viewers}: p95 {step['fanout']['p95_ms']} ms, "
+                      f"delivery {step['delivery_ratio']:.3f}, {'ok' if step['passed'] else 'FAIL'}", flush=True)
+                if not step['passed']:
+                    break
+        finally:
+            proc.terminate()
+            proc.wait()
+    passing = [s['viewers'] for s in steps if s['passed']]
+    return {
+        'workers': workers,
+        'message_queue': env.get('NRL_MESSAGE_QUEUE', '').split(':', 1)[0] or None,
+        'capacity_viewers': max(passing) if passing else 0,
+        'steps': steps,
+    }
+
+
+def int_list(text):
+    return [int(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int_list, default=[1, 2, 4])
+    parser.add_argument('--steps', type=int_list, default=[100, 200, 400, 800])
+    parser.add_argument('--live-matches', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=2.0, help='live_score_update per referee per second')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--client-procs', type=int, default=4, help='processes hosting the viewer clients')
+    parser.add_argument('--slo-ms', type=float, default=250.0, help='p95 fan-out latency a step must stay under')
+    parser.add_argument('--min-delivery', type=float, default=0.99)
+    parser.add_argument('--queue', default='', help='message queue URL for every run (default: SQLite broker '
+                                                    'when workers > 1)')
+    parser.add_argument('--out', help='write results JSON here')
+    args = parser.parse_args()
+
+    runs = [run_workers(w, args) for w in args.workers]
+    result = {
+        'benchmark': 'socket_scaling',
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'params': vars(args),
+        'capacity': {str(r['workers']): r['capacity_viewers'] for r in runs},
+        'runs': runs,
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -94,6 +94,16 @@ class _ScoringPageState extends State<ScoringPage> {
   int matchTimerDuration = 150;  // seconds
   int timeOffsetMs = 0;          // server_now_ms - client_now_ms
 
+  // NTP-style clock sync over the socket (server: 'clock_sync' / 'clock_sync_reply')
+  static const int kClockSyncBurst = 5;          // pings per round
+  static const int kClockSyncWindow = 8;         // samples kept; offset from the lowest RTT
+  static const Duration kClockSyncEvery = Duration(seconds: 45);
+  final List<List<double>> _clockSamples = [];   // [offsetMs, rttMs]
+  double? _lastOffsetMs;
+  double? _lastRttMs;
+  Timer? _clockSyncTimer;
+  bool get _clockSynced => _clockSamples.isNotEmpty;
+
   // ===== Golden constants & helpers =====
   static const int kGoldenBase = 10;      // 10 per block
   static const int kGoldenStackBonus = 5; // +5 per level above bottom
@@ -131,6 +141,52 @@ class _ScoringPageState extends State<ScoringPage> {
     return pts;
   }
 
+  // ===== Clock sync =====
+  void _sendClockSync() {
+    if (_socket?.connected != true) return;
+    _socket!.emit('clock_sync', {
+      't0': DateTime.now().millisecondsSinceEpoch,
+      'last_offset_ms': _lastOffsetMs,
+      'last_rtt_ms': _lastRttMs,
+      'label': 'scoring ${widget.alliance} m${widget.matchId}',
+    });
+  }
+
+  void _clockSyncRound() {
+    for (int i = 0; i < kClockSyncBurst; i++) {
+      Timer(Duration(milliseconds: 200 * i), _sendClockSync);
+    }
+  }
+
+  void _startClockSync() {
+    _clockSyncTimer?.cancel();
+    _clockSyncRound();
+    _clockSyncTimer = Timer.periodic(kClockSyncEvery, (_) => _clockSyncRound());
+  }
+
+  void _onClockSyncReply(dynamic data) {
+    final t3 = DateTime.now().millisecondsSinceEpoch.toDouble();
+    if (!mounted || data == null || data['t0'] == null) return;
+    final t0 = (data['t0'] as num).toDouble();
+    final t1 = (data['t1'] as num).toDouble();
+    final t2 = (data['t2'] as num).toDouble();
+    final rtt = (t3 - t0) - (t2 - t1);
+    final offset = ((t1 - t0) + (t2 - t3)) / 2;
+    if (rtt < 0) return;
+
+    _lastOffsetMs = offset;
+    _lastRttMs = rtt;
+    _clockSamples.add([offset, rtt]);
+    if (_clockSamples.length > kClockSyncWindow) _clockSamples.removeAt(0);
+    final best = _clockSamples.reduce((a, b) => b[1] < a[1] ? b : a);
+    timeOffsetMs = best[0].round();
+    if (gameRunning) {
+      setState(() {
+        gameSecondsLeft = _computeRemainingSec();
+      });
+    }
+  }
+
   // ===== Match Timer helpers =====
   int _computeRemainingSec() {
     if (matchStartMs == null) return matchTimerDuration;
@@ -175,9 +231,11 @@ class _ScoringPageState extends State<ScoringPage> {
       final res = await http.get(Uri.parse('$baseUrl/match/${widget.matchId}/timer/state'));
       if (res.statusCode == 200) {
         final data = jsonDecode(res.body) as Map<String, dynamic>;
-        final serverNow = (data['server_now_ms'] ?? 0) as int;
-        final clientNow = DateTime.now().millisecondsSinceEpoch;
-        timeOffsetMs = serverNow - clientNow;
+        if (!_clockSynced) {
+          // One-way estimate until the socket clock sync has a sample
+          final serverNow = (data['server_now_ms'] ?? 0) as int;
+          timeOffsetMs = serverNow - DateTime.now().millisecondsSinceEpoch;
+        }
 
         final running = data['running'] == true;
         final start = data['start_ms'] as int?;
@@ -244,6 +302,7 @@ class _ScoringPageState extends State<ScoringPage> {
       _socket?.emit('leave_match', {'match_id': widget.matchId}); // harmless if server ignores
     } catch (_) {}
     _liveDebounce?.cancel();
+    _clockSyncTimer?.cancel();
     gameTimer?.cancel();
     _socket?.dispose();
     super.dispose();
@@ -263,9 +322,15 @@ class _ScoringPageState extends State<ScoringPage> {
       debugPrint('Socket connected');
       // Join this match room so we only receive events for the same match (harmless if server ignores)
       _socket!.emit('join_match', {'match_id': widget.matchId});
+      _startClockSync();
+    });
+
+    _socket!.onDisconnect((_) {
+      debugPrint('Socket disconnected');
+      _clockSyncTimer?.cancel();
     });
 
-    _socket!.onDisconnect((_) => debugPrint('Socket disconnected'));
+    _socket!.on('clock_sync_reply', _onClockSyncReply);
 
     // Someone submitted or updated a score
     _socket!.on('score_update', (data) {
@@ -307,9 +372,10 @@ class _ScoringPageState extends State<ScoringPage> {
         if (data == null) return;
         if (data['match_id'] != widget.matchId) return;
 
-        final serverNow = (data['server_now_ms'] ?? 0) as int;
-        final clientNow = DateTime.now().millisecondsSinceEpoch;
-        timeOffsetMs = serverNow - clientNow;
+        if (!_clockSynced) {
+          final serverNow = (data['server_now_ms'] ?? 0) as int;
+          timeOffsetMs = serverNow - DateTime.now().millisecondsSinceEpoch;
+        }
 
         matchStartMs = (data['start_ms'] ?? 0) as int;
         matchTimerDuration = (data['duration'] ?? 150) as int;
@@ -0,0 +1,75 @@
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_TMP = tempfile.mkdtemp(prefix='nrl-tests-')
+os.environ.setdefault('NRL_DATABASE_URI', f"sqlite:///{os.path.join(_TMP, 'nrl_scoring.db')}")
+os.environ.setdefault('NRL_EVENT_DB_DIR', os.path.join(_TMP, 'events'))
+os.environ.setdefault('NRL_TIMER_BACKEND', 'memory')
+
+import app as nrl  # noqa: E402
+
+
+def reset_state():
+    """Forget the in-process state one test could leak into the next."""
+    nrl.RESOURCE_VERSIONS.clear()
+    nrl.RESPONSE_CACHE.clear()
+    nrl.RANKINGS_CACHE['payload'] = None
+    nrl.MATCH_TIMERS.clear()
+    nrl.TIMER_STORE.clear()
+    for table in (nrl.LIVE_CHANNELS, nrl.LIVE_PATCH_SIDS, nrl.LIVE_MATCHES, nrl.LIVE_CLOSED, nrl.LIVE_OPEN,
+                  nrl.LIVE_SYNC_PENDING, nrl.SOCKET_BACKLOG, nrl.INBOUND_BUCKETS, nrl.SNAPSHOT_DIGESTS,
+                  nrl.CLOCK_SYNC_STATS):
+        table.clear()
+    nrl.SNAPSHOT_DIRTY['all'] = nrl.SNAPSHOT_DIRTY['schedule'] = False
+    nrl.SNAPSHOT_DIRTY['matches'].clear()
+    nrl.SNAPSHOT_DIRTY['live'].clear()
+    for engine in nrl.EVENT_ENGINES.values():
+        engine.dispose()
+    nrl.EVENT_ENGINES.clear()
+    nrl.EVENTS['by_code'].clear()
+    nrl.EVENTS['active'] = None
+
+
+@pytest.fixture
+def app(tmp_path):
+    nrl.app.config['EVENT_DB_DIR'] = str(tmp_path / 'events')
+    with nrl.app.app_context():
+        nrl.db.session.remove()
+        nrl.db.drop_all()
+        reset_state()
+        nrl.init_db()
+        yield nrl.app
+        nrl.db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def schedule_csv(rows) -> bytes:
+    """rows: (match_no, r1, r2, b1, b2[, arena]) tuples."""
+    lines = ['Match No.,Red Team 1,Red Team 2,Blue Team 1,Blue Team 2,Arena']
+    lines += [','.join(str(cell) for cell in row) for row in rows]
+    return '\n'.join(lines).encode()
+
+
+def upload(client, rows):
+    return client.post('/upload_schedule', data={'file': (io.BytesIO(schedule_csv(rows)), 'schedule.csv')})
+
+
+def simple_schedule(count):
+    return [(n, 100 + n, 200 + n, 300 + n, 400 + n) for n in range(1, count + 1)]
+
+
+def finalise(client, match_id, red=1, blue=0):
+    client.post(f'/score/{match_id}/red', json={'alliance_charge': red, 'submitted_by': 1})
+    client.post(f'/score/{match_id}/blue', json={'alliance_charge': blue, 'submitted_by': 1})
+    return client.post('/finalise_score', json={'match_id': match_id, 'confirmed_by': 1})
@@ -0,0 +1,83 @@
+import pytest
+
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+@pytest.fixture
+def depths(monkeypatch):
+    """Fake Engine.IO queue depths per eio_sid; the sweep runs only when a test calls it."""
+    queued = {}
+    monkeypatch.setattr(nrl, 'client_queue_depth', lambda eio_sid: queued.get(eio_sid, 0))
+    monkeypatch.setitem(nrl._socket_drainer, 'running', True)
+    return queued
+
+
+def viewer_of(app, match_id):
+    viewer = nrl.socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    viewer.get_received()
+    return viewer
+
+
+def test_parked_updates_arrive_before_match_finalised(app, client, depths):
+    upload(client, simple_schedule(1))
+    viewer = viewer_of(app, 1)
+    depths[viewer.eio_sid] = 40
+    nrl.sweep_sockets()
+
+    client.post('/score/1/red', json={'alliance_charge': 1, 'submitted_by': 1})
+    client.post('/score/1/red', json={'alliance_charge': 2, 'submitted_by': 1})
+    assert viewer.get_received() == []
+    lag = client.get('/admin/socket_clients').get_json()['clients'][0]
+    assert lag['queue_depth'] == 40 and lag['parked'] == 1 and lag['dropped'] == 1
+
+    finalise(client, 1)
+    names = [m['name'] for m in viewer.get_received()]
+    assert 'match_finalised' in names
+    assert 'score_update' not in names[names.index('match_finalised'):]
+
+    depths[viewer.eio_sid] = 0
+    nrl.sweep_sockets()
+    assert nrl.SOCKET_BACKLOG == {}
+    viewer.disconnect()
+
+
+def test_drained_client_gets_the_newest_parked_state(app, client, depths):
+    upload(client, simple_schedule(1))
+    viewer = viewer_of(app, 1)
+    depths[viewer.eio_sid] = 40
+    nrl.sweep_sockets()
+    for charge in (1, 2, 3):
+        client.post('/score/1/blue', json={'alliance_charge': charge, 'submitted_by': 1})
+    assert viewer.get_received() == []
+
+    depths[viewer.eio_sid] = 0
+    nrl.sweep_sockets()
+    updates = [m['args'][0] for m in viewer.get_received() if m['name'] == 'score_update']
+    assert [u['score_breakdown']['alliance_charge'] for u in updates] == [3]
+    viewer.disconnect()
+
+
+def test_hard_limit_disconnects_clients_without_coalesced_traffic(app, client, depths):
+    upload(client, simple_schedule(1))
+    viewer = viewer_of(app, 1)
+    client.post('/match/1/timer/start', json={'duration': 90})
+    depths[viewer.eio_sid] = nrl.app.config['SOCKET_QUEUE_HARD_LIMIT']
+    nrl.sweep_sockets()
+    assert not viewer.is_connected()
+
+
+def test_slow_client_is_disconnected(app, client, depths):
+    upload(client, simple_schedule(1))
+    viewer, healthy = viewer_of(app, 1), viewer_of(app, 1)
+    depths[viewer.eio_sid] = 40
+    nrl.sweep_sockets()
+    assert viewer.is_connected()
+
+    sid = next(iter(nrl.SOCKET_BACKLOG))
+    nrl.SOCKET_BACKLOG[sid]['since'] -= nrl.app.config['SOCKET_SLOW_DISCONNECT_SECONDS']
+    nrl.sweep_sockets()
+    assert not viewer.is_connected() and healthy.is_connected()
+    assert nrl.SOCKET_BACKLOG == {}
+    healthy.disconnect()
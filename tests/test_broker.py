@@ -0,0 +1,37 @@
+import app as nrl
+
+
+def test_sqlite_broker_round_trip(tmp_path):
+    broker = nrl.SqliteBrokerManager(f"sqlite:///{tmp_path / 'broker.db'}", channel='test')
+    assert broker._io(broker._last_id) == 0
+    broker._publish({'method': 'app_sync', 'kind': 'bump'})
+    broker._publish({'method': 'emit', 'event': 'x'})
+    rows = broker._io(broker._fetch, 0)
+    assert [broker.json.loads(body)['method'] for _, body in rows] == ['app_sync', 'emit']
+    assert broker._io(broker._fetch, rows[-1][0]) == []
+
+
+def test_live_drafts_are_synced_in_batches(app, monkeypatch):
+    published = []
+    monkeypatch.setattr(nrl, 'publish_app_sync', lambda kind, **payload: published.append((kind, payload)))
+
+    for total in (1, 2, 3):
+        nrl.record_live_alliance(7, 'red', {'alliance_charge': total}, total, 'draft', total)
+    nrl.record_live_alliance(7, 'blue', {}, 0, 'draft', 1)
+    assert published == []
+
+    nrl.publish_live_sync()
+    (kind, payload), = published
+    assert kind == 'live_set'
+    assert [(m, a, e['total_score']) for m, a, e in payload['entries']] == [(7, 'red', 3), (7, 'blue', 0)]
+
+    # Committed submissions go out at once and supersede a pending draft
+    nrl.record_live_alliance(7, 'red', {'alliance_charge': 4}, 4, 'draft', 4)
+    nrl.record_live_alliance(7, 'red', {'alliance_charge': 5}, 5, 'submit')
+    assert published[-1][1]['entries'][0][2]['source'] == 'submit'
+    assert nrl.LIVE_SYNC_PENDING == {}
+
+    # Another worker applies the batch, but not for a match it knows is finalised
+    nrl.close_live_match(7)
+    nrl._sync_live_set(payload['entries'])
+    assert 7 not in nrl.LIVE_MATCHES
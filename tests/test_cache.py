@@ -0,0 +1,48 @@
+import pytest
+
+from conftest import finalise, simple_schedule, upload
+
+
+def revalidate(client, path, etag):
+    return client.get(path, headers={'If-None-Match': etag})
+
+
+@pytest.mark.parametrize('path', ['/matches', '/rankings', '/match/1/details'])
+def test_unchanged_resources_answer_304(client, path):
+    upload(client, simple_schedule(2))
+    first = client.get(path)
+    assert first.status_code == 200 and first.headers['ETag']
+
+    again = revalidate(client, path, first.headers['ETag'])
+    assert again.status_code == 304 and again.get_data() == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+    # Unrelated writes leave the version alone
+    client.post('/match/2/timer/start', json={'duration': 90})
+    assert revalidate(client, path, first.headers['ETag']).status_code == 304
+
+
+def test_writes_invalidate_the_views_they_change(client):
+    upload(client, simple_schedule(2))
+    tags = {path: client.get(path).headers['ETag'] for path in ('/matches', '/rankings', '/match/1/details',
+                                                                '/match/2/details')}
+
+    client.post('/score/1/red', json={'alliance_charge': 2, 'submitted_by': 1})
+    assert revalidate(client, '/match/1/details', tags['/match/1/details']).status_code == 200
+    assert client.get('/match/1/details').get_json()['red_score']['alliance_charge'] == 2
+    assert revalidate(client, '/match/2/details', tags['/match/2/details']).status_code == 304
+
+    finalise(client, 1, red=3)
+    listed = revalidate(client, '/matches', tags['/matches'])
+    assert listed.status_code == 200 and [m['match_id'] for m in listed.get_json()['matches']] == [2]
+    ranked = revalidate(client, '/rankings', tags['/rankings'])
+    assert ranked.status_code == 200 and ranked.headers['ETag'] != tags['/rankings']
+    assert revalidate(client, '/rankings', ranked.headers['ETag']).status_code == 304
+
+
+def test_schedule_upload_bumps_the_match_list(client):
+    upload(client, simple_schedule(1))
+    etag = client.get('/matches').headers['ETag']
+    upload(client, simple_schedule(2))
+    fresh = revalidate(client, '/matches', etag)
+    assert fresh.status_code == 200 and len(fresh.get_json()['matches']) == 2
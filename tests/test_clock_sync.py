@@ -0,0 +1,34 @@
+import time
+
+import app as nrl
+
+
+def sync(tablet, **data):
+    tablet.emit('clock_sync', data)
+    [reply] = [m['args'][0] for m in tablet.get_received() if m['name'] == 'clock_sync_reply']
+    return reply
+
+
+def test_reply_carries_server_receive_and_send_times(app):
+    tablet = nrl.socketio.test_client(app)
+    before = time.time() * 1000
+    reply = sync(tablet, t0=123.5)
+    assert reply['t0'] == 123.5
+    assert before <= reply['t1'] <= reply['t2'] <= time.time() * 1000
+    tablet.disconnect()
+
+
+def test_reported_samples_feed_the_admin_view(app, client):
+    tablet = nrl.socketio.test_client(app)
+    sync(tablet, t0=1, label='tablet-red')
+    sync(tablet, t0=2, last_offset_ms=40, last_rtt_ms=120)
+    sync(tablet, t0=3, last_offset_ms=-5, last_rtt_ms=10)
+    sync(tablet, t0=4, last_offset_ms='junk', last_rtt_ms=15)   # ignored, still answered
+
+    [stats] = client.get('/admin/clock_sync').get_json()['clients']
+    assert stats['label'] == 'tablet-red' and stats['pings'] == 4 and stats['samples'] == 2
+    assert stats['offset_ms'] == -5 and stats['rtt_ms'] == 10   # the lowest-RTT sample wins
+    assert stats['rtt_max_ms'] == 120 and stats['offset_spread_ms'] == 45
+
+    tablet.disconnect()
+    assert client.get('/admin/clock_sync').get_json()['clients'] == []
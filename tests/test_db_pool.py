@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Engine
+
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+@pytest.fixture
+def hub_queries():
+    """SQL statements a request ran outside DB_POOL work."""
+    seen = []
+
+    def record(conn, cursor, statement, *_args):
+        if not getattr(nrl.DB_POOL.local, 'worker', False):
+            seen.append(statement)
+
+    sa_event.listen(Engine, 'before_cursor_execute', record)
+    yield seen
+    sa_event.remove(Engine, 'before_cursor_execute', record)
+
+
+def test_request_handlers_leave_sqlite_to_the_pool(client, hub_queries):
+    client.post('/register', json={'username': 'ref', 'email': 'r@x', 'password': 'pw', 'role': 'referee'})
+    assert client.post('/login', json={'username': 'ref', 'password': 'pw'}).status_code == 200
+    upload(client, simple_schedule(3))
+    client.post('/match/1/timer/start', json={'duration': 90})
+    client.post('/match/1/timer/reset')
+    finalise(client, 1)
+    client.post('/inspection/team_number/101', json={'inspection_status': 'passed'})
+    client.post('/rules', json={'points': {'alliance_charge': 6}})
+    client.post('/events', json={'code': 'spring', 'activate': True})
+    client.post('/events', json={'code': 'autumn', 'activate': True})
+    client.post('/events/spring/archive')
+    for path in ('/matches?status=all', '/matches/summary', '/match/1/summary', '/match/1/details',
+                 '/match/1/state?events=1', '/teams', '/team/profile/101', '/rules', '/rankings',
+                 '/export/results', '/export/teams?format=ndjson&gzip=1'):
+        response = client.get(path, headers={'X-NRL-Event': nrl.app.config['DEFAULT_EVENT_CODE']})
+        assert response.status_code == 200, path
+        response.get_data()
+    assert hub_queries == []
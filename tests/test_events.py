@@ -0,0 +1,78 @@
+import eventlet
+
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+def make_event(client, code, activate=True):
+    return client.post('/events', json={'code': code, 'activate': activate})
+
+
+def test_event_activated_goes_to_the_event_room(app, client):
+    make_event(client, 'spring')
+    feed, referee = nrl.socketio.test_client(app), nrl.socketio.test_client(app)
+    feed.emit('join_event')
+    referee.emit('join_match', {'match_id': 1})
+    feed.get_received(), referee.get_received()
+
+    make_event(client, 'autumn')
+    assert [m['args'][0]['code'] for m in feed.get_received() if m['name'] == 'event_activated'] == ['autumn']
+    assert [m for m in referee.get_received() if m['name'] == 'event_activated'] == []
+    feed.disconnect(), referee.disconnect()
+
+
+def test_activation_keeps_timers_and_patch_subscriptions(app, client):
+    make_event(client, 'spring')
+    upload(client, simple_schedule(1))
+    started = client.post('/match/1/timer/start', json={'duration': 90}).get_json()
+    viewer = nrl.socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': 1, 'patches': True})
+
+    make_event(client, 'autumn')
+    upload(client, simple_schedule(1))
+    assert client.get('/match/1/timer/state').get_json()['running'] is False
+    assert len(nrl.LIVE_PATCH_SIDS[1]) == 1
+
+    client.post('/events/spring/activate')
+    timer = client.get('/match/1/timer/state').get_json()
+    assert timer['running'] is True and timer['start_ms'] == started['start_ms']
+    viewer.disconnect()
+
+
+def test_queued_score_writes_keep_their_event(app, client, monkeypatch):
+    make_event(client, 'spring')
+    upload(client, simple_schedule(1))
+    make_event(client, 'autumn', activate=False)
+    client.post('/events/autumn/activate')
+    upload(client, simple_schedule(1))
+    client.post('/events/spring/activate')
+
+    # The writer waits for stragglers; autumn becomes active while spring's write is queued
+    monkeypatch.setitem(nrl.app.config, 'SCORE_GROUP_COMMIT_MS', 50)
+    pending = eventlet.spawn(lambda: app.test_client().post(
+        '/score/1/red', json={'alliance_charge': 3, 'submitted_by': 1}).status_code)
+    eventlet.sleep(0.01)
+    client.post('/events/autumn/activate')
+    assert pending.wait() == 200
+
+    spring = client.get('/match/1/summary', headers={'X-NRL-Event': 'spring'}).get_json()
+    autumn = client.get('/match/1/summary').get_json()
+    assert spring['score']['red']['total_score'] == 15
+    assert autumn['score']['red']['total_score'] == 0
+
+
+def test_events_are_rescored_under_rules_activated_elsewhere(app, client):
+    make_event(client, 'spring')
+    upload(client, simple_schedule(1))
+    client.post('/score/1/red', json={'alliance_charge': 3, 'submitted_by': 1})
+    make_event(client, 'autumn')
+    upload(client, simple_schedule(1))
+    client.post('/score/1/red', json={'alliance_charge': 3, 'submitted_by': 1})
+
+    client.post('/rules', json={'points': {'alliance_charge': 6}, 'activate': True})
+    assert client.get('/match/1/summary').get_json()['score']['red']['total_score'] == 18
+    spring = client.get('/match/1/summary', headers={'X-NRL-Event': 'spring'}).get_json()
+    assert spring['score']['red']['total_score'] == 15   # not rescored until it is active again
+
+    client.post('/events/spring/activate')
+    assert client.get('/match/1/summary').get_json()['score']['red']['total_score'] == 18
@@ -0,0 +1,52 @@
+import csv
+import gzip
+import io
+import json
+
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_results_resume_after_the_last_key(client, monkeypatch):
+    monkeypatch.setattr(nrl, 'EXPORT_CHUNK', 2)   # several pages per export
+    upload(client, simple_schedule(5))
+    finalise(client, 2, red=3)
+
+    rows = ndjson(client.get('/export/results?format=ndjson'))
+    assert [r['match_number'] for r in rows] == [1, 2, 3, 4, 5]
+    assert rows[1]['red_total'] == 15 and rows[1]['winner'] == 'red' and rows[1]['red_finalised'] is True
+
+    resumed = ndjson(client.get('/export/results?format=ndjson&after=2'))
+    assert resumed == rows[2:]
+    assert ndjson(client.get('/export/results?format=ndjson&after=5')) == []
+    assert client.get('/export/results?after=two').status_code == 400
+    assert client.get('/export/results?format=xml').status_code == 400
+
+
+def test_teams_csv_resumes_by_team_number(client):
+    upload(client, simple_schedule(2))
+    body = client.get('/export/teams').get_data(as_text=True)
+    teams = list(csv.DictReader(io.StringIO(body)))
+    assert tuple(teams[0]) == nrl.EXPORT_TEAM_FIELDS
+    numbers = [t['team_number'] for t in teams]
+    assert numbers == sorted(numbers) and len(numbers) == 8
+
+    rest = list(csv.DictReader(io.StringIO(client.get(f'/export/teams?after={numbers[3]}').get_data(as_text=True))))
+    assert [t['team_number'] for t in rest] == numbers[4:]
+
+
+def test_gzip_export_decompresses_to_the_plain_body(client):
+    upload(client, simple_schedule(3))
+    plain = client.get('/export/results').get_data()
+
+    zipped = client.get('/export/results?gzip=1')
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.get_data()) == plain
+
+    negotiated = client.get('/export/results', headers={'Accept-Encoding': 'gzip'})
+    assert negotiated.headers['Content-Encoding'] == 'gzip' and gzip.decompress(negotiated.get_data()) == plain
+    assert 'Content-Encoding' not in client.get('/export/results').headers
@@ -0,0 +1,77 @@
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+def submit_both(client, match_id=1):
+    client.post(f'/score/{match_id}/red', json={'alliance_charge': 2, 'submitted_by': 1})
+    client.post(f'/score/{match_id}/blue', json={'alliance_charge': 1, 'submitted_by': 1})
+
+
+def test_submit_racing_a_finalise_is_a_conflict(client, monkeypatch):
+    upload(client, simple_schedule(1))
+    submit_both(client)
+    journal_event = nrl.journal_event
+
+    def racing_submit(*args, **kwargs):
+        # Another writer bumps red's version after finalise_match has read it
+        with nrl.db.engine.begin() as conn:
+            conn.execute(nrl.db.update(nrl.ScoreEntry).where(nrl.ScoreEntry.alliance == 'red')
+                         .values(alliance_charge=9, version=nrl.ScoreEntry.version + 1))
+        monkeypatch.setattr(nrl, 'journal_event', journal_event)
+        return journal_event(*args, **kwargs)
+
+    monkeypatch.setattr(nrl, 'journal_event', racing_submit)
+    resp = client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2})
+
+    assert resp.status_code == 409
+    body = resp.get_json()
+    assert body['current']['red']['version'] == 2
+    assert body['current']['red']['score_breakdown']['alliance_charge'] == 9
+    assert body['current']['red']['finalised'] is False
+    assert client.get('/match/1/summary').get_json()['score']['blue']['finalised'] is False
+
+    # Nothing was half-applied; a retry goes through
+    assert client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2}).status_code == 200
+
+
+def test_finalise_checks_expected_versions(client):
+    upload(client, simple_schedule(1))
+    submit_both(client)
+    client.post('/score/1/red', json={'alliance_charge': 3, 'submitted_by': 1})
+
+    stale = client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2, 'versions': {'red': 1, 'blue': 1}})
+    assert stale.status_code == 409
+    assert stale.get_json()['current']['red']['version'] == 2
+    assert client.get('/match/1/summary').get_json()['score']['red']['finalised'] is False
+
+    bad = client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2, 'versions': {'red': 'x'}})
+    assert bad.status_code == 400
+
+    resp = client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2},
+                       headers={'If-Match': '"2", "1"'})
+    assert resp.status_code == 200
+    assert client.get('/match/1/summary').get_json()['score']['red']['finalised'] is True
+
+
+def test_if_match_must_name_both_alliances(client):
+    upload(client, simple_schedule(1))
+    submit_both(client)
+    resp = client.post('/finalise_score', json={'match_id': 1, 'confirmed_by': 2}, headers={'If-Match': '"1"'})
+    assert resp.status_code == 400
+
+
+def test_finalise_replay_with_the_same_key(client):
+    upload(client, simple_schedule(1))
+    submit_both(client)
+    body = {'match_id': 1, 'confirmed_by': 2, 'idempotency_key': 'fin-1'}
+    viewer = nrl.socketio.test_client(client.application)
+    viewer.emit('join_match', {'match_id': 1})
+
+    assert client.post('/finalise_score', json=body).status_code == 200
+    replay = client.post('/finalise_score', json=body)
+    assert replay.status_code == 200 and replay.get_json()['unchanged'] is True
+    assert [m['name'] for m in viewer.get_received()].count('match_finalised') == 1
+
+    other = client.post('/finalise_score', json={**body, 'idempotency_key': 'fin-2'})
+    assert other.status_code == 400
+    viewer.disconnect()
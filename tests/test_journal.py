@@ -0,0 +1,38 @@
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+def test_finalise_checkpoints_only_that_match(client):
+    upload(client, simple_schedule(2))
+    finalise(client, 1, red=4, blue=2)
+    client.post('/score/2/red', json={'alliance_charge': 7, 'submitted_by': 1})
+
+    checkpoints = nrl.ScoreCheckpoint.query.all()
+    assert [cp.match_id for cp in checkpoints] == [1]
+
+    # Events after the checkpoint are folded on top of it
+    client.post('/score/1/red', json={'alliance_charge': 5, 'submitted_by': 1})
+    body = client.get('/match/1/state').get_json()
+    assert body['red']['alliance_charge'] == 5 and body['red']['finalised'] is True
+    assert client.get('/match/2/state').get_json()['red']['alliance_charge'] == 7
+
+
+def test_state_as_of_a_seq_before_the_checkpoint(client):
+    upload(client, simple_schedule(1))
+    client.post('/score/1/red', json={'alliance_charge': 1, 'submitted_by': 1})
+    first = nrl.db.session.scalar(nrl.db.select(nrl.db.func.max(nrl.ScoreEvent.id)))
+    finalise(client, 1, red=3, blue=0)
+
+    body = client.get(f'/match/1/state?seq={first}').get_json()
+    assert body['as_of_seq'] == first
+    assert body['red']['alliance_charge'] == 1 and body['red']['finalised'] is False
+
+
+def test_checkpoint_every_n_submissions(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOURNAL_CHECKPOINT_EVERY', 3)
+    upload(client, simple_schedule(1))
+    for charge in range(1, 8):
+        client.post('/score/1/blue', json={'alliance_charge': charge, 'submitted_by': 1})
+    assert nrl.ScoreCheckpoint.query.filter_by(match_id=1).count() == 2
+    state, last_seq = nrl.journal_state()
+    assert state[1]['blue']['alliance_charge'] == 7
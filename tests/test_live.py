@@ -0,0 +1,141 @@
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+def snapshot_for(app, match_id):
+    viewer = nrl.socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    received = [m['args'][0] for m in viewer.get_received() if m['name'] == 'live_snapshot']
+    viewer.disconnect()
+    return received[-1]
+
+
+def test_editing_a_finalised_score_leaves_no_live_state(app, client):
+    upload(client, simple_schedule(1))
+    finalise(client, 1)
+    assert 1 not in nrl.LIVE_MATCHES
+
+    assert client.post('/score/1/red', json={'alliance_charge': 6, 'submitted_by': 1}).status_code == 200
+    assert 1 not in nrl.LIVE_MATCHES
+
+    # A tablet still sending drafts after finalisation doesn't reopen the match either
+    referee = nrl.socketio.test_client(app)
+    referee.emit('live_score_update', {'match_id': 1, 'alliance': 'red', 'score_breakdown': {'alliance_charge': 1}})
+    assert (1, 'red') not in nrl.LIVE_CHANNELS
+    referee.disconnect()
+
+
+def test_live_snapshot_reads_the_timer_store(app, client):
+    upload(client, simple_schedule(1))
+    assert snapshot_for(app, 1)['timer'] is None
+
+    started = client.post('/match/1/timer/start', json={'duration': 90}).get_json()
+    timer = snapshot_for(app, 1)['timer']
+    assert timer == {'start_ms': started['start_ms'], 'duration': 90, 'running': True}
+
+    client.post('/match/1/timer/reset')
+    assert not (snapshot_for(app, 1)['timer'] or {}).get('running')
+
+    client.post('/score/1/blue', json={'alliance_charge': 2, 'submitted_by': 1})
+    snap = snapshot_for(app, 1)
+    assert snap['blue']['total_score'] == nrl.db.session.get(nrl.Match, 1).blue_total
+
+
+def test_patches_go_out_once_to_the_patch_room(app, client):
+    upload(client, simple_schedule(1))
+    patched = [nrl.socketio.test_client(app) for _ in range(3)]
+    for viewer in patched:
+        viewer.emit('join_match', {'match_id': 1, 'patches': True})
+    legacy = nrl.socketio.test_client(app)
+    legacy.emit('join_match', {'match_id': 1})
+    for viewer in patched + [legacy]:
+        viewer.get_received()
+    emits = nrl.SOCKET_EMITS.series.get(('live_score_patch',), 0)
+
+    nrl.queue_live_update(1, 'red', {'alliance_charge': 2})
+    nrl._flush_live_channel(1, 'red', nrl.LIVE_CHANNELS[(1, 'red')])
+
+    assert nrl.SOCKET_EMITS.series[('live_score_patch',)] == emits + 1
+    for viewer in patched:
+        assert [m['name'] for m in viewer.get_received()] == ['live_score_patch']
+    assert [m['name'] for m in legacy.get_received()] == ['score_update']
+
+    patched[0].emit('leave_match', {'match_id': 1})
+    nrl.queue_live_update(1, 'red', {'alliance_charge': 3})
+    nrl._flush_live_channel(1, 'red', nrl.LIVE_CHANNELS[(1, 'red')])
+    assert patched[0].get_received() == []
+    for viewer in patched + [legacy]:
+        viewer.disconnect()
+
+
+def flush(match_id, alliance):
+    nrl._flush_live_channel(match_id, alliance, nrl.LIVE_CHANNELS[(match_id, alliance)])
+
+
+def test_drafts_are_coalesced_into_one_update_per_tick(app, client, monkeypatch):
+    monkeypatch.setitem(nrl._live_ticker, 'running', True)   # the test plays the ticker
+    upload(client, simple_schedule(1))
+    referee, viewer = nrl.socketio.test_client(app), nrl.socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': 1})
+    viewer.get_received()
+
+    for charge in (1, 2, 3):
+        referee.emit('live_score_update', {'match_id': 1, 'alliance': 'red',
+                                           'score_breakdown': {'alliance_charge': charge}})
+    assert viewer.get_received() == []
+
+    flush(1, 'red')
+    updates = [m['args'][0] for m in viewer.get_received() if m['name'] == 'score_update']
+    assert len(updates) == 1
+    assert updates[0]['score_breakdown'] == {'alliance_charge': 3}
+    assert updates[0]['total_score'] == 15 and updates[0]['seq'] == 1 and updates[0]['live'] is True
+
+    # A draft identical to the last one sent is not broadcast again
+    referee.emit('live_score_update', {'match_id': 1, 'alliance': 'red', 'score_breakdown': {'alliance_charge': 3}})
+    flush(1, 'red')
+    assert viewer.get_received() == []
+    referee.disconnect(), viewer.disconnect()
+
+
+def test_patch_payloads_carry_changes_between_keyframes(app, client, monkeypatch):
+    monkeypatch.setitem(nrl._live_ticker, 'running', True)
+    monkeypatch.setitem(nrl.app.config, 'LIVE_KEYFRAME_INTERVAL', 3)
+    upload(client, simple_schedule(1))
+    viewer = nrl.socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': 1, 'patches': True})
+    viewer.get_received()
+
+    def patch(breakdown):
+        nrl.queue_live_update(1, 'blue', breakdown)
+        flush(1, 'blue')
+        return [m['args'][0] for m in viewer.get_received() if m['name'] == 'live_score_patch']
+
+    [first] = patch({'alliance_charge': 1, 'docked': 1})
+    assert first['keyframe'] is True and first['seq'] == 1
+    assert first['score_breakdown'] == {'alliance_charge': 1, 'docked': 1}
+
+    [delta] = patch({'alliance_charge': 2})
+    assert delta['keyframe'] is False and delta['seq'] == 2
+    assert delta['changes'] == {'alliance_charge': 2} and delta['removed'] == ['docked']
+    assert delta['total_score'] == nrl.calculate_total_from_payload({'alliance_charge': 2})
+
+    patch({'alliance_charge': 3})
+    [keyframe] = patch({'alliance_charge': 4})
+    assert keyframe['keyframe'] is True and keyframe['seq'] == 4
+    assert keyframe['score_breakdown'] == {'alliance_charge': 4}
+    viewer.disconnect()
+
+
+def test_drafts_after_a_restart_do_not_reopen_completed_matches(app, client):
+    upload(client, simple_schedule(2))
+    finalise(client, 1)
+    nrl.reset_event_state()   # as after a restart: LIVE_CLOSED is gone, the match is still completed
+
+    nrl.queue_live_update(1, 'red', {'alliance_charge': 1})
+    assert (1, 'red') not in nrl.LIVE_CHANNELS and 1 in nrl.LIVE_CLOSED
+
+    nrl.queue_live_update(99, 'red', {'alliance_charge': 1})   # not in the schedule
+    assert (99, 'red') not in nrl.LIVE_CHANNELS
+
+    nrl.queue_live_update(2, 'blue', {'alliance_charge': 1})
+    assert (2, 'blue') in nrl.LIVE_CHANNELS
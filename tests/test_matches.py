@@ -0,0 +1,113 @@
+import threading
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Engine
+
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+def test_matches_without_paging_params_returns_everything(client):
+    upload(client, simple_schedule(150))
+    body = client.get('/matches').get_json()
+    assert len(body['matches']) == 150 and body['next_cursor'] is None
+
+
+def test_matches_pages_when_asked(client):
+    upload(client, simple_schedule(150))
+    first = client.get('/matches?limit=100').get_json()
+    assert len(first['matches']) == 100 and first['next_cursor'] == 100
+    rest = client.get(f"/matches?after={first['next_cursor']}").get_json()
+    assert [m['match_number'] for m in rest['matches']] == list(range(101, 151))
+    assert rest['next_cursor'] is None
+    assert client.get('/matches?limit=0').status_code == 400
+
+
+def test_updated_since_returns_only_later_changes(client):
+    upload(client, simple_schedule(3))
+    version = client.get('/matches').get_json()['version']
+    finalise(client, 2)
+
+    body = client.get(f'/matches?status=all&fields=match_number,winner&updated_since={version}').get_json()
+    assert body['matches'] == [{'match_number': 2, 'winner': 'red'}]
+    assert body['version'] > version
+    assert client.get(f"/matches?status=all&updated_since={body['version']}").get_json()['matches'] == []
+
+
+def test_updated_since_reports_matches_that_completed(client):
+    upload(client, simple_schedule(3))
+    version = client.get('/matches').get_json()['version']
+    finalise(client, 1)
+
+    # No status given: the default live-only filter must not hide the match that just completed
+    changed = client.get(f'/matches?updated_since={version}').get_json()['matches']
+    assert [(m['match_number'], m['status']) for m in changed] == [(1, 'completed')]
+    assert [m['match_number'] for m in client.get('/matches').get_json()['matches']] == [2, 3]
+
+
+def test_change_seq_is_a_counter_in_the_callers_transaction(app):
+    first = nrl.next_change_seq()
+    nrl.db.session.rollback()
+    assert nrl.next_change_seq() == first   # a rolled-back stamp is never seen
+    nrl.db.session.commit()
+    assert nrl.next_change_seq() == first + 1
+    nrl.db.session.commit()
+
+
+def test_change_seq_follows_commit_order(app):
+    """A second writer can't draw a stamp until the first one's transaction has committed."""
+    first = nrl.next_change_seq()
+    drawn = []
+
+    def writer():
+        with app.app_context():
+            drawn.append(nrl.next_change_seq())
+            nrl.db.session.commit()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    thread.join(0.3)
+    assert drawn == []          # blocked on our write lock
+    nrl.db.session.commit()
+    thread.join(5)
+    assert drawn == [first + 1]
+
+
+def summary_numbers(client, query=''):
+    body = client.get(f'/matches/summary{query}').get_json()
+    assert body['count'] == len(body['matches'])
+    return [m['match_number'] for m in body['matches']]
+
+
+def test_matches_summary_filters(client):
+    upload(client, [(n, 100 + n, 200 + n, 300 + n, 400 + n, 'Alpha' if n % 2 else 'Bravo') for n in range(1, 7)])
+    finalise(client, 2, red=3)
+
+    assert summary_numbers(client) == [1, 2, 3, 4, 5, 6]
+    assert summary_numbers(client, '?ids=5,2,9') == [2, 5]
+    assert summary_numbers(client, '?range=2-4') == [2, 3, 4]
+    assert summary_numbers(client, '?range=5-') == [5, 6]
+    assert summary_numbers(client, '?arena=bravo') == [2, 4, 6]
+    assert summary_numbers(client, '?arena=Bravo&range=3-6') == [4, 6]
+    assert summary_numbers(client, '?team=104') == [4]
+    assert client.get('/matches/summary?range=a-b').status_code == 400
+
+    [two] = client.get('/matches/summary?ids=2').get_json()['matches']
+    assert two == client.get('/match/2/summary').get_json()
+    assert two['score']['red']['total_score'] == 15 and two['score']['red']['finalised'] is True
+
+
+def test_matches_summary_reads_in_chunks_not_per_match(client, monkeypatch):
+    monkeypatch.setattr(nrl, 'SUMMARY_YIELD_PER', 4)
+    upload(client, simple_schedule(10))
+    statements = []
+
+    def record(conn, cursor, statement, *_args):
+        statements.append(statement)
+
+    sa_event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        assert summary_numbers(client) == list(range(1, 11))
+    finally:
+        sa_event.remove(Engine, 'before_cursor_execute', record)
+    assert len(statements) == 3   # one keyset page per SUMMARY_YIELD_PER matches, scores joined in
@@ -0,0 +1,59 @@
+import threading
+
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+def counter_value(counter, labels):
+    return counter.series.get(labels, 0)
+
+
+def test_emit_counts_recipients_from_room_sizes(app, client):
+    upload(client, simple_schedule(1))
+    viewers = [nrl.socketio.test_client(app) for _ in range(3)]
+    for viewer in viewers[:2]:
+        viewer.emit('join_match', {'match_id': 1})
+    before = counter_value(nrl.SOCKET_RECIPIENTS, ('score_update',))
+    emits = counter_value(nrl.SOCKET_EMITS, ('score_update',))
+
+    client.post('/score/1/red', json={'alliance_charge': 2, 'submitted_by': 1})
+
+    assert counter_value(nrl.SOCKET_EMITS, ('score_update',)) == emits + 1
+    assert counter_value(nrl.SOCKET_RECIPIENTS, ('score_update',)) == before + 2
+    assert nrl.SOCKET_BYTES.series[('score_update',)] > 0
+    for viewer in viewers:
+        viewer.disconnect()
+
+
+def test_emit_size_is_sampled():
+    nrl.EMIT_SIZES.pop('probe', None)
+    assert nrl.estimate_emit_size('probe', {'a': 1}) == len('{"a":1}')
+    # Until the next sample the last measured size stands in
+    assert nrl.estimate_emit_size('probe', {'a': 'much longer payload'}) == len('{"a":1}')
+
+
+def test_metrics_are_safe_across_threads():
+    counter = nrl.Counter('t_total', 'test')
+    histogram = nrl.Histogram('t_seconds', 'test', (), nrl.LATENCY_BUCKETS)
+
+    def work():
+        for _ in range(20000):
+            counter.inc()
+            histogram.observe((), 0.002)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.series[()] == 80000
+    assert histogram.series[()][-1] == 80000
+    assert 't_seconds_count 80000' in '\n'.join(histogram.render())
+
+
+def test_offloaded_queries_count_toward_the_request(client):
+    before = list(nrl.DB_QUERIES_PER_REQUEST.series.get(('/upload_schedule',), [0, 0]))
+    upload(client, simple_schedule(3))
+    after = nrl.DB_QUERIES_PER_REQUEST.series[('/upload_schedule',)]
+    assert after[-1] == before[-1] + 1
+    assert after[-2] - before[-2] >= 3   # the schedule rows are written on a DB_POOL worker
@@ -0,0 +1,48 @@
+import app as nrl
+from conftest import finalise, upload
+
+
+def rankings(client):
+    return {t['team_number']: t for t in client.get('/rankings').get_json()['rankings']}
+
+
+def test_rankings_follow_finalise_and_later_edits(client):
+    upload(client, [(1, 11, 12, 21, 22), (2, 11, 21, 12, 22)])
+    finalise(client, 1, red=3, blue=1)
+    finalise(client, 2, red=2, blue=2)
+
+    table = rankings(client)
+    assert (table['11']['wins'], table['11']['ties'], table['11']['matches_played']) == (1, 1, 2)
+    assert table['22']['losses'] == 1 and table['22']['ranking_points'] == 1
+
+    # Editing a finalised score flips match 1 and is reflected once, not double counted
+    assert client.post('/score/1/blue', json={'alliance_charge': 9, 'submitted_by': 1}).status_code == 200
+    table = rankings(client)
+    assert table['11']['matches_played'] == 2
+    assert (table['11']['wins'], table['11']['losses']) == (0, 1)
+    assert (table['21']['wins'], table['21']['ties']) == (1, 1)
+
+
+def test_incremental_tables_match_a_full_rebuild(app, client):
+    upload(client, [(1, 11, 12, 21, 22), (2, 11, 21, 12, 22), (3, 11, 22, 12, 21)])
+    finalise(client, 1, red=6, blue=1)
+    finalise(client, 2, red=2, blue=2)
+    finalise(client, 3, red=1, blue=4)
+    # Lower team 11's best match after the fact, and add penalties and endgame on another
+    client.post('/score/1/red', json={'alliance_charge': 0, 'submitted_by': 1})
+    client.post('/score/2/blue', json={'minor_penalties': 2, 'docked': 1, 'submitted_by': 1})
+
+    incremental = nrl.read_team_tables()
+    assert incremental[0]['11']['max_contribution'] == 10
+    assert incremental == nrl.compute_team_tables()
+
+    runner = app.test_cli_runner()
+    assert runner.invoke(args=['rebuild-rankings']).exit_code == 0
+
+    # A drifted row is reported, rewritten and fails the audit
+    nrl.db.session.execute(nrl.db.update(nrl.TeamStanding).where(nrl.TeamStanding.team_number == '12')
+                           .values(wins=nrl.TeamStanding.wins + 1))
+    nrl.db.session.commit()
+    result = runner.invoke(args=['rebuild-rankings'])
+    assert result.exit_code == 1 and 'team_standing 12' in result.output
+    assert nrl.read_team_tables() == nrl.compute_team_tables()
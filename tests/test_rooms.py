@@ -0,0 +1,57 @@
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+def joined(app, event, data=None):
+    client = nrl.socketio.test_client(app)
+    client.emit(event, data)
+    client.get_received()
+    return client
+
+
+def names(client):
+    return [m['name'] for m in client.get_received()]
+
+
+def test_score_updates_stay_in_their_match_room(app, client):
+    upload(client, simple_schedule(2))
+    arena = client.get('/match/1/summary').get_json()['arena']
+    match_1, match_2 = joined(app, 'join_match', {'match_id': 1}), joined(app, 'join_match', {'match_id': 2})
+    arena_feed, event_feed = joined(app, 'join_arena', {'arena': arena}), joined(app, 'join_event')
+    bystander = nrl.socketio.test_client(app)
+
+    client.post('/score/1/red', json={'alliance_charge': 2, 'submitted_by': 1})
+
+    assert names(match_1) == ['score_update']
+    assert names(match_2) == []
+    assert names(arena_feed) == ['scoreboard_update']
+    assert names(event_feed) == ['scoreboard_update']
+    assert names(bystander) == []
+    for c in (match_1, match_2, arena_feed, event_feed, bystander):
+        c.disconnect()
+
+
+def test_timers_and_results_reach_only_their_rooms(app, client):
+    upload(client, simple_schedule(2))
+    arena = client.get('/match/1/summary').get_json()['arena']
+    match_1, match_2 = joined(app, 'join_match', {'match_id': 1}), joined(app, 'join_match', {'match_id': 2})
+    arena_feed, event_feed = joined(app, 'join_arena', {'arena': arena.upper()}), joined(app, 'join_event')
+
+    client.post('/match/1/timer/start', json={'duration': 90})
+    assert names(match_1) == names(arena_feed) == ['match_timer_started']
+    assert names(match_2) == names(event_feed) == []
+
+    finalise(client, 1)
+    assert 'match_finalised' in names(event_feed)
+    assert 'match_finalised' not in names(match_2)
+    for c in (match_1, match_2, arena_feed, event_feed):
+        c.disconnect()
+
+
+def test_leaving_a_match_stops_its_updates(app, client):
+    upload(client, simple_schedule(1))
+    viewer = joined(app, 'join_match', {'match_id': 1})
+    viewer.emit('leave_match', {'match_id': 1})
+    client.post('/score/1/red', json={'alliance_charge': 2, 'submitted_by': 1})
+    assert names(viewer) == []
+    viewer.disconnect()
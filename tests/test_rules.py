@@ -0,0 +1,28 @@
+import app as nrl
+from conftest import finalise, upload
+
+
+def test_activating_rules_rebuilds_every_derived_view(client):
+    upload(client, [(1, 11, 12, 21, 22)])
+    finalise(client, 1, red=3, blue=1)
+    # Warm every cache the activation has to invalidate
+    assert client.get('/match/1/summary').get_json()['score']['red']['total_score'] == 15
+    teams = {t['team_number']: t for t in client.get('/teams').get_json()['teams']}
+    assert teams['11']['stats']['total_contribution'] == 15
+    client.get('/rankings')
+    client.get('/team/profile/11')
+
+    resp = client.post('/rules', json={'points': {'alliance_charge': 100}, 'activate': True})
+    assert resp.status_code == 201 and resp.get_json()['active_version'] == 2
+
+    assert client.get('/match/1/summary').get_json()['score']['red']['total_score'] == 300
+    teams = {t['team_number']: t for t in client.get('/teams').get_json()['teams']}
+    assert teams['11']['stats']['total_contribution'] == 300
+    assert teams['21']['stats']['max_contribution'] == 100
+    ranked = {t['team_number']: t for t in client.get('/rankings').get_json()['rankings']}
+    assert ranked['12']['total_score'] == 300 and ranked['22']['total_score'] == 100
+    assert nrl.db.session.get(nrl.Match, 1).red_total == 300
+
+
+def test_activating_an_unknown_version(client):
+    assert client.post('/rules/9/activate').status_code == 404
@@ -0,0 +1,23 @@
+from conftest import finalise, simple_schedule, upload
+
+
+def test_upload_reports_one_error_shape(client):
+    upload(client, simple_schedule(2))
+    assert finalise(client, 1).status_code == 200
+
+    resp = upload(client, [(1, 901, 902, 903, 904), (2, 'x'), ('nope', 1, 2, 3, 4)])
+    errors = resp.get_json()['errors']
+    assert len(errors) == 3
+    assert all(set(e) == {'line', 'error'} for e in errors)
+    assert {e['line'] for e in errors} == {2, 3, 4}
+    assert 'completed' in next(e['error'] for e in errors if e['line'] == 2)
+
+
+def test_finalised_match_is_completed_and_hidden_by_default(client):
+    upload(client, simple_schedule(3))
+    finalise(client, 2)
+
+    listed = [m['match_number'] for m in client.get('/matches').get_json()['matches']]
+    assert listed == [1, 3]
+    statuses = {m['match_number']: m['status'] for m in client.get('/matches?status=all').get_json()['matches']}
+    assert statuses == {1: 'pending', 2: 'completed', 3: 'pending'}
@@ -0,0 +1,57 @@
+import eventlet
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+@pytest.fixture
+def grouped(monkeypatch):
+    """Group-commit mode with a window wide enough for a test's greenlets to share one batch."""
+    monkeypatch.setitem(nrl.app.config, 'SCORE_WRITE_MODE', 'group')
+    monkeypatch.setitem(nrl.app.config, 'SCORE_GROUP_COMMIT_MS', 50)
+    return nrl.SCORE_WRITER
+
+
+def submit_in_context(app, fn):
+    with app.app_context():
+        return nrl.SCORE_WRITER.submit(fn)
+
+
+def test_concurrent_submissions_share_one_commit(app, client, grouped):
+    upload(client, simple_schedule(4))
+    batches, jobs = grouped.batches, grouped.jobs
+
+    posts = [eventlet.spawn(lambda n=n: app.test_client().post(
+        f'/score/{n}/red', json={'alliance_charge': n, 'submitted_by': 1}).status_code) for n in range(1, 5)]
+    assert [p.wait() for p in posts] == [200] * 4
+
+    assert grouped.batches == batches + 1 and grouped.jobs == jobs + 4
+    totals = [client.get(f'/match/{n}/summary').get_json()['score']['red']['total_score'] for n in range(1, 5)]
+    assert totals == [5, 10, 15, 20]
+
+
+def test_a_failing_job_does_not_fail_its_batch(app, client, grouped, monkeypatch):
+    upload(client, simple_schedule(1))
+    batches = grouped.batches
+    attempts = []
+    commit = grouped._commit
+    monkeypatch.setattr(grouped, '_commit', lambda batch: attempts.append(len(batch)) or commit(batch))
+
+    def bad():
+        nrl.db.session.add(nrl.ScoreEntry(match_id=None, alliance='red'))   # NOT NULL: fails at commit
+
+    good = eventlet.spawn(submit_in_context, app, lambda: nrl.apply_score_payload(1, 'blue', {'alliance_charge': 2}))
+    broken = eventlet.spawn(submit_in_context, app, bad)
+
+    snapshot, changed = good.wait()
+    assert changed and snapshot['total_score'] == 10
+    with pytest.raises(IntegrityError):
+        broken.wait()
+
+    # The batch was rolled back and its jobs retried one by one: only the good one committed
+    assert attempts == [2, 1, 1]
+    assert grouped.batches == batches + 1
+    assert client.get('/match/1/summary').get_json()['score']['blue']['total_score'] == 10
+    assert client.post('/score/1/red', json={'alliance_charge': 1, 'submitted_by': 1}).status_code == 200
@@ -0,0 +1,63 @@
+import json
+
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+def test_summary_returns_the_submitted_golden_grid(client):
+    upload(client, simple_schedule(1))
+    # Column 0 has a floating cell above a gap; it still scores only its bottom run
+    grid = [[1, 0], [0, 0], [1, 1]]
+    resp = client.post('/score/1/red', json={'golden_charge_stack': grid, 'submitted_by': 1})
+    assert resp.status_code == 200
+
+    red = client.get('/match/1/summary').get_json()['score']['red']
+    assert json.loads(red['score_breakdown']['golden_charge_stack']) == grid
+    assert red['score_breakdown']['golden_points'] == 20
+
+
+def test_golden_text_is_kept_verbatim(client):
+    upload(client, simple_schedule(1))
+    text = '[[false,true],[true,true]]'
+    client.post('/score/1/blue', json={'golden_charge_stack': text, 'submitted_by': 1})
+    blue = client.get('/match/1/summary').get_json()['score']['blue']
+    assert blue['score_breakdown']['golden_charge_stack'] == text
+    assert blue['score_breakdown']['golden_points'] == 10 + 10 + 15
+
+
+def test_golden_points_batch_returns_a_list(app):
+    stacks = [nrl.encode_golden_heights([[1, 0], [1, 1]]), '', None]
+    points = nrl.golden_points_batch(stacks)
+    assert type(points) is list and points == [35, 0, 0]
+    assert nrl.golden_points_batch([]) == []
+
+
+def test_malformed_or_oversized_golden_grids_are_rejected(client):
+    upload(client, simple_schedule(1))
+    for stack in ('not json', {'a': 1}, '{"a": 1}', [1, 0], [[1, 0], [1]], [[2, 0]], [['x']],
+                  [[1] * 100] * 100, [[1]] * (nrl.GOLDEN_MAX_ROWS + 1), [[1] * (nrl.GOLDEN_MAX_COLS + 1)]):
+        resp = client.post('/score/1/red', json={'golden_charge_stack': stack, 'submitted_by': 1})
+        assert resp.status_code == 400, stack
+    assert client.get('/match/1/summary').get_json()['score']['red']['total_score'] == 0
+
+    # The largest grid the encoding holds still scores
+    full = [[1] * nrl.GOLDEN_MAX_COLS] * nrl.GOLDEN_MAX_ROWS
+    assert client.post('/score/1/red', json={'golden_charge_stack': full, 'submitted_by': 1}).status_code == 200
+
+
+def test_backfill_golden_rewrites_stale_encodings(app, client):
+    upload(client, simple_schedule(1))
+    client.post('/score/1/red', json={'golden_charge_stack': [[0, 1], [1, 1]], 'submitted_by': 1})
+    table = nrl.ScoreEntry.__table__
+    nrl.db.session.execute(table.update().values(golden_heights='2:00', golden_points=0, total_score=0))
+    nrl.db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['backfill-golden'])
+    assert result.exception is None, result.output
+    assert result.output.startswith('1 score entries re-encoded')
+    score = nrl.ScoreEntry.query.filter_by(match_id=1, alliance='red').one()
+    assert score.golden_heights == '2:12' and score.total_score == 35
+    assert nrl.db.session.get(nrl.Match, 1).red_total == 35
+
+    again = app.test_cli_runner().invoke(args=['backfill-golden'])
+    assert again.output.startswith('0 score entries re-encoded')
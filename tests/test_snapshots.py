@@ -0,0 +1,121 @@
+import fcntl
+import json
+import os
+
+import pytest
+
+import app as nrl
+from conftest import finalise, simple_schedule, upload
+
+
+@pytest.fixture
+def snapshots(app, tmp_path, monkeypatch):
+    """Snapshot dir for one test; publishes run when the test flushes them, not on a background task."""
+    root = tmp_path / 'snapshots'
+    monkeypatch.setitem(app.config, 'SNAPSHOT_DIR', str(root))
+    monkeypatch.setitem(nrl._snapshot_task, 'running', True)
+    monkeypatch.setitem(nrl._snapshot_task, 'retry_at', 0.0)
+    yield root / nrl.current_event().code
+    held = nrl._snapshot_task['lock']
+    if held is not None:
+        held[2].close()
+        nrl._snapshot_task['lock'] = None
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_manifest_is_only_rewritten_when_something_changed(client, snapshots):
+    upload(client, simple_schedule(2))
+    nrl.flush_snapshots()
+    generated = read(snapshots / 'manifest.json')['generated_ms']
+
+    nrl.schedule_snapshot(everything=True)
+    assert nrl.flush_snapshots()['written'] == 0
+    assert read(snapshots / 'manifest.json')['generated_ms'] == generated
+
+    finalise(client, 1)
+    nrl.flush_snapshots()
+    assert read(snapshots / 'manifest.json')['version'] > 0
+    assert read(snapshots / 'match/1/summary.json')['score']['red']['finalised'] is True
+
+
+def test_failed_publish_keeps_its_work(client, snapshots, monkeypatch):
+    upload(client, simple_schedule(1))
+    nrl.flush_snapshots()
+    monkeypatch.setitem(nrl.app.config, 'SNAPSHOT_DEBOUNCE_SECONDS', 0)
+    monkeypatch.setitem(nrl.app.config, 'SNAPSHOT_RETRY_SECONDS', 0)
+    calls = []
+    publish = nrl.publish_snapshots
+
+    def flaky(match_ids=None, live_ids=(), schedule=True):
+        calls.append(match_ids)
+        if len(calls) == 1:
+            raise OSError('disk full')
+        return publish(match_ids, live_ids, schedule)
+
+    monkeypatch.setattr(nrl, 'publish_snapshots', flaky)
+    nrl.schedule_snapshot(1)
+    nrl._snapshot_loop()
+    assert calls == [[1], [1]]
+    assert nrl.SNAPSHOT_DIRTY == {'all': False, 'schedule': False, 'matches': set(), 'live': set()}
+
+
+def test_only_the_lock_holder_publishes(client, snapshots, monkeypatch):
+    os.makedirs(snapshots.parent, exist_ok=True)
+    other = open(snapshots.parent / '.publisher.lock', 'a')
+    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)   # another worker is the publisher
+    forwarded = []
+    monkeypatch.setattr(nrl, 'publish_app_sync', lambda kind, **payload: forwarded.append((kind, payload)))
+
+    upload(client, simple_schedule(1))
+    assert ('snapshot', {'match_ids': [], 'everything': True}) in forwarded
+    assert nrl.flush_snapshots() is None
+    assert not os.path.exists(snapshots / 'matches.json')
+
+    other.close()
+    monkeypatch.setitem(nrl._snapshot_task, 'retry_at', 0.0)
+    nrl._sync_snapshot([], False)   # next trigger after the publisher went away: this process takes over
+    nrl.flush_snapshots()
+    assert len(read(snapshots / 'matches.json')['matches']) == 1
+
+
+def test_live_drafts_publish_live_json(client, snapshots):
+    upload(client, simple_schedule(1))
+    nrl.queue_live_update(1, 'red', {'alliance_charge': 2})
+    nrl._flush_live_channel(1, 'red', nrl.LIVE_CHANNELS[(1, 'red')])
+    nrl.flush_snapshots()
+    live = read(snapshots / 'match/1/live.json')
+    assert live['red']['total_score'] == 10 and live['blue'] is None
+
+    finalise(client, 1)
+    nrl.flush_snapshots()
+    assert read(snapshots / 'match/1/live.json')['red'] is None
+
+
+def test_rebuild_scores_publishes(app, client, snapshots):
+    upload(client, simple_schedule(1))
+    finalise(client, 1, red=2)
+    nrl.flush_snapshots()
+    os.remove(snapshots / 'results.json')
+    nrl.SNAPSHOT_DIGESTS.clear()
+
+    result = app.test_cli_runner().invoke(args=['rebuild-scores', '--write'])
+    assert result.exception is None, result.output
+    assert read(snapshots / 'results.json')['matches'][0]['red_total'] == 10
+
+
+def test_live_drafts_only_rewrite_live_files(client, snapshots, monkeypatch):
+    upload(client, simple_schedule(1))
+    nrl.flush_snapshots()
+    monkeypatch.setattr(nrl, 'rankings_payload', lambda: pytest.fail('live publish rebuilt rankings'))
+    touched = []
+    write = nrl.write_snapshot_file
+    monkeypatch.setattr(nrl, 'write_snapshot_file', lambda path, payload: touched.append(path) or write(path, payload))
+
+    nrl.queue_live_update(1, 'red', {'alliance_charge': 2})
+    nrl._flush_live_channel(1, 'red', nrl.LIVE_CHANNELS[(1, 'red')])
+    assert nrl.flush_snapshots() == {'written': 1, 'unchanged': 0}
+    assert touched == [str(snapshots / 'match/1/live.json')]
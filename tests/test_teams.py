@@ -0,0 +1,16 @@
+from conftest import simple_schedule, upload
+
+
+def test_inspection_update_invalidates_the_team_list(client):
+    upload(client, simple_schedule(1))
+    listed = client.get('/teams')
+    assert {t['team_number']: t['inspection_status'] for t in listed.get_json()['teams']}['101'] == 'pending'
+
+    resp = client.post('/inspection/team_number/101', json={'inspection_status': 'passed'})
+    assert resp.status_code == 200
+
+    # The old ETag no longer matches and the body is rebuilt
+    assert client.get('/teams', headers={'If-None-Match': listed.headers['ETag']}).status_code == 200
+    teams = {t['team_number']: t['inspection_status'] for t in client.get('/teams').get_json()['teams']}
+    assert teams['101'] == 'passed'
+    assert client.get('/team/profile/101').get_json()['inspection_status'] == 'passed'
@@ -0,0 +1,48 @@
+import sqlite3
+
+import app as nrl
+from conftest import simple_schedule, upload
+
+
+def test_sqlite_timers_are_shared_between_stores(app, tmp_path):
+    path = str(tmp_path / 'timers.db')
+    one, two = nrl.SqliteTimerStore(path), nrl.SqliteTimerStore(path)   # as in two worker processes
+
+    state, started = one.start_if_idle(1, 1000, 90)
+    assert started and state == {'start_ms': 1000, 'duration': 90, 'running': True}
+    assert two.get(1) == state
+
+    # Already running elsewhere: the second worker reports the existing clock
+    state, started = two.start_if_idle(1, 5000, 150)
+    assert not started and state['start_ms'] == 1000
+
+    two.reset(1)
+    assert one.get(1) is None
+    assert one.start_if_idle(1, 6000, 150)[1] is True
+
+
+def test_sqlite_store_replaces_the_pre_event_table(app, tmp_path):
+    path = str(tmp_path / 'timers.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE match_timer (match_id INTEGER PRIMARY KEY, start_ms INTEGER, '
+                 'duration INTEGER, running INTEGER)')
+    conn.execute('INSERT INTO match_timer VALUES (1, 1000, 90, 1)')
+    conn.commit()
+    conn.close()
+
+    store = nrl.SqliteTimerStore(path)
+    assert store.get(1) is None
+    assert store.start_if_idle(1, 2000, 90)[1] is True
+
+
+def test_timer_routes_use_the_configured_store(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(nrl, 'TIMER_STORE', nrl.SqliteTimerStore(str(tmp_path / 'timers.db')))
+    other = nrl.SqliteTimerStore(str(tmp_path / 'timers.db'))
+    upload(client, simple_schedule(1))
+
+    started = client.post('/match/1/timer/start', json={'duration': 90}).get_json()
+    assert other.get(1) == {'start_ms': started['start_ms'], 'duration': 90, 'running': True}
+    assert client.post('/match/1/timer/start', json={'duration': 90}).get_json()['message'] == 'Timer already running'
+
+    other.reset(1)
+    assert client.get('/match/1/timer/state').get_json()['running'] is False